@@ -1,19 +1,39 @@
-from model import Model, Room
+from model import Model, Room, RoomIndex
+from bitboard import BitState
+from deadlock import DeadlockDetector
+from instrument import SearchProfile
 from constants import *
+from array import array
 from collections import deque
-from typing import Optional
+import heapq
+import threading
+import time
+from typing import Callable, Optional
+
+MOVES = [info['delta'] for info in MOVE_DIRECTIONS.values()]
+OPPOSITE = [MOVES.index((-delta[0], -delta[1])) for delta in MOVES]
 
 
 class GameState:
     """Immutable representation of game state for AI search algorithms."""
     
-    def __init__(self, cat_pos: tuple[int, int], glass_positions: frozenset[tuple[int, int]], room: Room):
+    def __init__(self, cat_pos: tuple[int, int], glass_positions: frozenset[tuple[int, int]], room: Room,
+                 glass_hash: Optional[int] = None):
         self.cat_pos = cat_pos
         self.glass_positions = glass_positions
         self.room = room
+        self.index = room.get_index()
+        glass_keys, cat_keys = self.index.get_zobrist_keys()
+        if glass_hash is None:
+            glass_hash = 0
+            for pos in glass_positions:
+                glass_hash ^= glass_keys[self.index.to_cell(pos)]
+        # Zobrist hash of the glasses alone, updated incrementally by try_move
+        self.glass_hash = glass_hash
+        self.zobrist = glass_hash ^ cat_keys[self.index.to_cell(cat_pos)]
     
     def __hash__(self) -> int:
-        return hash((self.cat_pos, self.glass_positions))
+        return self.zobrist
     
     def __eq__(self, other) -> bool:
         if not isinstance(other, GameState):
@@ -22,52 +42,39 @@ class GameState:
     
     def is_solved(self) -> bool:
         """Check if all glasses are on destination tiles."""
-        dest_positions = set()
-        tiles = self.room.get_tiles()
-        for i, row in enumerate(tiles):
-            for j, tile in enumerate(row):
-                if tile.get_text() == DEST:
-                    dest_positions.add((i, j))
-        
-        return dest_positions == self.glass_positions
+        return self.index.get_dests() == self.glass_positions
     
     def try_move(self, delta: tuple[int, int]) -> Optional['GameState']:
         """Try to move cat in given direction. Returns new GameState if valid, None if invalid."""
-        cur_row, cur_col = self.cat_pos
-        target_row, target_col = cur_row + delta[0], cur_col + delta[1]
-        
-        # Check boundary
-        if not self._within_boundary(target_row, target_col):
-            return None
-            
-        # Check if target tile is passable
-        target_tile = self.room.get_tile(target_row, target_col)
-        if not target_tile.is_passable():
+        # Boundary and wall checks are folded into the room index step table
+        target = self.index.step(self.cat_pos, delta)
+        if target is None:
             return None
         
         # Check if there's a glass at target position
-        if (target_row, target_col) in self.glass_positions:
+        if target in self.glass_positions:
             # Try to push the glass
-            glass_target_row = target_row + delta[0]
-            glass_target_col = target_col + delta[1]
-            
-            # Check if glass can be pushed
-            if (not self._within_boundary(glass_target_row, glass_target_col) or
-                not self.room.get_tile(glass_target_row, glass_target_col).is_passable() or
-                (glass_target_row, glass_target_col) in self.glass_positions):
+            glass_target = self.index.step(target, delta)
+            if glass_target is None or glass_target in self.glass_positions:
                 return None
             
             # Create new state with pushed glass
-            new_glass_positions = (self.glass_positions - {(target_row, target_col)}) | {(glass_target_row, glass_target_col)}
-            return GameState((target_row, target_col), new_glass_positions, self.room)
+            new_glass_positions = (self.glass_positions - {target}) | {glass_target}
+            glass_keys = self.index.get_zobrist_keys()[0]
+            glass_hash = (self.glass_hash ^ glass_keys[self.index.to_cell(target)]
+                          ^ glass_keys[self.index.to_cell(glass_target)])
+            return GameState(target, new_glass_positions, self.room, glass_hash)
         else:
             # Just move cat
-            return GameState((target_row, target_col), self.glass_positions, self.room)
+            return GameState(target, self.glass_positions, self.room, self.glass_hash)
     
     def _within_boundary(self, row: int, col: int) -> bool:
         """Check if position is within room boundaries."""
-        max_row, max_col = self.room.get_dimension()
-        return 0 <= row < max_row and 0 <= col < max_col
+        return self.index.within_boundary(row, col)
+    
+    def to_bit_state(self) -> BitState:
+        """The same state on the bitboard backend."""
+        return BitState.from_positions(self.cat_pos, self.glass_positions, self.room)
     
     @classmethod
     def from_model(cls, model: Model) -> 'GameState':
@@ -78,66 +85,1084 @@ class GameState:
         return cls(cat_pos, glass_positions, room)
 
 
+class StateCodec:
+    """Packs a (cat cell, glass cells) state into a single int key.
+
+    The cat cell occupies the lowest field, followed by the glass cells in
+    ascending order, each field wide enough for any cell of the room.
+    """
+    
+    def __init__(self, index: RoomIndex, num_glasses: int):
+        num_rows, num_cols = index.get_dimension()
+        self.bits = max(1, (num_rows * num_cols).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.num_glasses = num_glasses
+        self.glass_keys, self.cat_keys = index.get_zobrist_keys()
+    
+    def pack(self, cat_cell: int, glass_cells) -> int:
+        key = 0
+        for cell in sorted(glass_cells, reverse=True):
+            key = (key << self.bits) | cell
+        return (key << self.bits) | cat_cell
+    
+    def glass_hash(self, glass_cells) -> int:
+        """Zobrist hash of the glass cells; XOR in cat_keys[cell] for a full state."""
+        glass_hash = 0
+        for cell in glass_cells:
+            glass_hash ^= self.glass_keys[cell]
+        return glass_hash
+    
+    def unpack(self, key: int) -> tuple[int, list[int]]:
+        bits, mask = self.bits, self.mask
+        cat_cell = key & mask
+        key >>= bits
+        glass_cells = []
+        for _ in range(self.num_glasses):
+            glass_cells.append(key & mask)
+            key >>= bits
+        return cat_cell, glass_cells
+
+
+def count_pushes(state: GameState, moves: list[tuple[int, int]]) -> int:
+    """Number of moves in a solution that push a glass, starting from state."""
+    pushes = 0
+    for move in moves:
+        next_state = state.try_move(move)
+        if next_state.glass_positions != state.glass_positions:
+            pushes += 1
+        state = next_state
+    return pushes
+
+
+def moves_to_text(moves: list[tuple[int, int]]) -> str:
+    """Spell a move list with the keyboard characters of MOVE_DIRECTIONS, e.g. 'ddsw'."""
+    chars = {info['delta']: info['char'] for info in MOVE_DIRECTIONS.values()}
+    return ''.join(chars[move] for move in moves)
+
+
+def text_to_moves(text: str) -> list[tuple[int, int]]:
+    """Inverse of moves_to_text."""
+    deltas = {info['char']: info['delta'] for info in MOVE_DIRECTIONS.values()}
+    return [deltas[char] for char in text]
+
+
+_MISSING = object()
+
+
+class TranspositionTable:
+    """Map from search states to values, keyed by 64-bit Zobrist hashes.
+    
+    Every entry keeps an exact key for its state (a StateCodec int or a
+    GameState) so two states sharing a hash are never confused: the later
+    one is stored in an overflow dict keyed exactly, and counted.
+    """
+    
+    def __init__(self):
+        self._entries = {}
+        self._overflow = {}
+        self.collisions = 0
+    
+    def get(self, zobrist: int, exact, default=None):
+        entry = self._entries.get(zobrist)
+        if entry is not None and entry[0] == exact:
+            return entry[1]
+        if self._overflow:
+            return self._overflow.get(exact, default)
+        return default
+    
+    def contains(self, zobrist: int, exact) -> bool:
+        return self.get(zobrist, exact, _MISSING) is not _MISSING
+    
+    def put(self, zobrist: int, exact, value=True) -> None:
+        entry = self._entries.get(zobrist)
+        if entry is not None and entry[0] == exact:
+            self._entries[zobrist] = (exact, value)
+        elif exact in self._overflow:
+            self._overflow[exact] = value
+        elif entry is None:
+            self._entries[zobrist] = (exact, value)
+        else:
+            self.collisions += 1
+            self._overflow[exact] = value
+    
+    def discard(self, zobrist: int, exact) -> None:
+        entry = self._entries.get(zobrist)
+        if entry is not None and entry[0] == exact:
+            del self._entries[zobrist]
+        else:
+            self._overflow.pop(exact, None)
+    
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._overflow)
+
+
+def reachable_cells(start: int, glass_cells, steps: tuple[tuple[int, ...], ...]) -> set[int]:
+    """Flood fill the cells the cat can walk to from start without pushing."""
+    reached = {start}
+    stack = [start]
+    while stack:
+        cell = stack.pop()
+        for step in steps:
+            target = step[cell]
+            if target >= 0 and target not in reached and target not in glass_cells:
+                reached.add(target)
+                stack.append(target)
+    return reached
+
+
+def walk_path(start: int, goal: int, glass_cells, steps: tuple[tuple[int, ...], ...]) -> Optional[list[int]]:
+    """Shortest list of move codes walking the cat from start to goal without pushing."""
+    if start == goal:
+        return []
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        for code, step in enumerate(steps):
+            target = step[cell]
+            if target < 0 or target in parents or target in glass_cells:
+                continue
+            parents[target] = (cell, code)
+            if target == goal:
+                path = []
+                while parents[target] is not None:
+                    target, code = parents[target]
+                    path.append(code)
+                path.reverse()
+                return path
+            queue.append(target)
+    return None
+
+
+def min_cost_matching(costs: list[list[float]]) -> float:
+    """Cost of the cheapest perfect matching of rows to columns (Hungarian method).
+    
+    costs is a square matrix; entries may be float('inf') for forbidden pairs,
+    in which case the result is inf if every perfect matching uses one.
+    """
+    size = len(costs)
+    if size == 0:
+        return 0
+    # forbidden pairs get a cost larger than any real matching
+    big = 1 + sum(max((c for c in row if c != float('inf')), default=0) for row in costs)
+    matrix = [[big if c == float('inf') else c for c in row] for row in costs]
+    
+    # potentials u (rows) and v (columns), 1-based with column 0 as a sentinel
+    u, v = [0] * (size + 1), [0] * (size + 1)
+    match, way = [0] * (size + 1), [0] * (size + 1)
+    for row in range(1, size + 1):
+        match[0] = row
+        col0 = 0
+        min_v = [float('inf')] * (size + 1)
+        used = [False] * (size + 1)
+        while True:
+            used[col0] = True
+            row0, delta, col1 = match[col0], float('inf'), 0
+            for col in range(1, size + 1):
+                if used[col]:
+                    continue
+                cur = matrix[row0 - 1][col - 1] - u[row0] - v[col]
+                if cur < min_v[col]:
+                    min_v[col], way[col] = cur, col0
+                if min_v[col] < delta:
+                    delta, col1 = min_v[col], col
+            for col in range(size + 1):
+                if used[col]:
+                    u[match[col]] += delta
+                    v[col] -= delta
+                else:
+                    min_v[col] -= delta
+            col0 = col1
+            if match[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            match[col0] = match[col1]
+            col0 = col1
+    
+    total = sum(matrix[match[col] - 1][col - 1] for col in range(1, size + 1))
+    return float('inf') if total >= big else total
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search when SokobanSolver.cancel() was called."""
+
+
+class SearchStats:
+    """Counters describing the last search run by a SokobanSolver."""
+    
+    def __init__(self, method: str):
+        self.method = method
+        self.nodes_expanded = 0
+        self.peak_frontier = 0
+        self.pruned = 0
+    
+    def as_dict(self) -> dict[str, object]:
+        return dict(vars(self))
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={value}' for name, value in vars(self).items())
+        return f'SearchStats({fields})'
+
+
+class BackgroundSearch:
+    """Runs one SokobanSolver method on a daemon thread so a UI can keep polling it.
+    
+    The solver snapshots the model when the search starts; the caller must
+    not move the cat or change rooms until the search is done or cancelled.
+    """
+    
+    def __init__(self, model: Model, method: str = 'solve_bfs', **kwargs):
+        self.solver = SokobanSolver(model)
+        self.result = None
+        self.cancelled = False
+        self._started = time.perf_counter()
+        self._finished = None
+        self._thread = threading.Thread(target=self._run, args=(method, kwargs), daemon=True)
+        self._thread.start()
+    
+    def _run(self, method: str, kwargs: dict) -> None:
+        try:
+            self.result = getattr(self.solver, method)(**kwargs)
+        except SearchCancelled:
+            self.cancelled = True
+        finally:
+            self._finished = time.perf_counter()
+    
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+    
+    def join(self, timeout: Optional[float] = None) -> None:
+        self._thread.join(timeout)
+    
+    def cancel(self) -> None:
+        self.solver.cancel()
+    
+    def progress(self) -> tuple[int, int, float]:
+        """States explored, peak frontier size and seconds elapsed so far."""
+        stats = self.solver.stats
+        elapsed = (self._finished or time.perf_counter()) - self._started
+        if stats is None:
+            return 0, 0, elapsed
+        return stats.nodes_expanded, stats.peak_frontier, elapsed
+
+
 class SokobanSolver:
     """AI solver for Sokoban puzzles using search algorithms."""
     
-    def __init__(self, model: Model):
+    def __init__(self, model: Model, prune_deadlocks: bool = True, state_class: type = GameState,
+                 profile: Optional[SearchProfile] = None):
         self.model = model
+        # GameState or bitboard.BitState; used by solve_bfs and solve_dfs
+        self.state_class = state_class
+        self.prune_deadlocks = prune_deadlocks
+        self.stats = None
+        # opt-in instrument.SearchProfile, filled in by every search method
+        self.profile = profile
+        self._detector = None
+        self._cancelled = False
+    
+    def cancel(self) -> None:
+        """Ask a search running on another thread to stop with SearchCancelled.
+        
+        The request is sticky: create a new solver for the next search.
+        """
+        self._cancelled = True
+    
+    def get_index(self) -> RoomIndex:
+        """Static index of the room currently loaded in the model."""
+        return self.model.get_room().get_index()
+    
+    def get_detector(self) -> Optional[DeadlockDetector]:
+        """Deadlock detector for the current room, or None when pruning is off."""
+        if not self.prune_deadlocks:
+            return None
+        index = self.get_index()
+        if self._detector is None or self._detector.get_index() is not index:
+            self._detector = DeadlockDetector(index)
+        return self._detector
+    
+    def _state_deadlocked(self, detector: Optional[DeadlockDetector], state: GameState,
+                          move: tuple[int, int]) -> bool:
+        """Check the glass that move pushed (if any) to reach state."""
+        if detector is None:
+            return False
+        glass_pos = (state.cat_pos[0] + move[0], state.cat_pos[1] + move[1])
+        if glass_pos not in state.glass_positions:
+            return False
+        index = state.index
+        return detector.is_deadlock(index.to_cell(glass_pos),
+                                    {index.to_cell(pos) for pos in state.glass_positions})
+    
+    def _counts_match(self, state: GameState) -> bool:
+        """A state can only be solved when there is one glass per destination."""
+        return len(state.glass_positions) == len(self.get_index().get_dests())
     
     def solve_bfs(self) -> Optional[list[tuple[int, int]]]:
         """Solve using Breadth-First Search. Returns list of moves or None if no solution."""
-        initial_state = GameState.from_model(self.model)
+        self.stats = SearchStats('bfs')
+        initial_state = self.state_class.from_model(self.model)
         
         if initial_state.is_solved():
             return []
+        if not self._counts_match(initial_state):
+            return None
         
         queue = deque([(initial_state, [])])
-        visited = {initial_state}
-        
-        moves = [info['delta'] for info in MOVE_DIRECTIONS.values()]
+        visited = TranspositionTable()
+        visited.put(initial_state.zobrist, initial_state)
+        stats = self.stats
+        profile = self.profile
+        detector = self.get_detector()
         
         while queue:
+            stats.peak_frontier = max(stats.peak_frontier, len(queue))
             current_state, path = queue.popleft()
+            stats.nodes_expanded += 1
+            if self._cancelled:
+                raise SearchCancelled()
+            if profile is not None:
+                profile.expanded()
+                profile.visited(len(visited))
             
-            for move in moves:
+            for move in MOVES:
                 next_state = current_state.try_move(move)
                 
-                if next_state is None or next_state in visited:
+                if next_state is None:
+                    continue
+                if visited.contains(next_state.zobrist, next_state):
+                    if profile is not None:
+                        profile.count('duplicates')
+                    continue
+                if self._state_deadlocked(detector, next_state, move):
+                    visited.put(next_state.zobrist, next_state)
+                    stats.pruned += 1
                     continue
                 
                 new_path = path + [move]
+                if profile is not None:
+                    profile.frontier(len(new_path))
+                    profile.count('goal_checks')
+                    if next_state.glass_positions != current_state.glass_positions:
+                        profile.count('pushes')
                 
                 if next_state.is_solved():
                     return new_path
                 
                 queue.append((next_state, new_path))
-                visited.add(next_state)
+                visited.put(next_state.zobrist, next_state)
+        
+        return None  # No solution found
+    
+    def solve_bfs_seeded(self, known: Callable[[GameState], Optional[list[tuple[int, int]]]]
+                         ) -> Optional[list[tuple[int, int]]]:
+        """Breadth-First Search that can finish early through states of known distance.
+        
+        known(state) returns an optimal move list from state to the goal, or
+        None if the state's distance is unknown. The search runs layer by
+        layer and stops as soon as no deeper layer can beat the best known
+        route, so the result has the fewest moves, like solve_bfs.
+        """
+        self.stats = SearchStats('bfs_seeded')
+        initial_state = GameState.from_model(self.model)
+        
+        if initial_state.is_solved():
+            return []
+        suffix = known(initial_state)
+        if suffix is not None:
+            return list(suffix)
+        if not self._counts_match(initial_state):
+            return None
+        
+        parents = TranspositionTable()
+        parents.put(initial_state.zobrist, initial_state, (None, None))
+        stats = self.stats
+        profile = self.profile
+        if profile is not None:
+            lookup = known
+            
+            def known(state: GameState) -> Optional[list[tuple[int, int]]]:
+                with profile.timer('known'):
+                    return lookup(state)
+        detector = self.get_detector()
+        frontier = [initial_state]
+        depth = 0
+        best, best_total = None, float('inf')  # (state, suffix) of the best route so far
+        
+        while frontier and depth + 1 < best_total:
+            stats.peak_frontier = max(stats.peak_frontier, len(frontier))
+            next_frontier = []
+            for current_state in frontier:
+                stats.nodes_expanded += 1
+                if self._cancelled:
+                    raise SearchCancelled()
+                if profile is not None:
+                    profile.expanded()
+                    profile.visited(len(parents))
+                
+                for move in MOVES:
+                    next_state = current_state.try_move(move)
+                    if next_state is None:
+                        continue
+                    if parents.contains(next_state.zobrist, next_state):
+                        if profile is not None:
+                            profile.count('duplicates')
+                        continue
+                    if self._state_deadlocked(detector, next_state, move):
+                        stats.pruned += 1
+                        continue
+                    parents.put(next_state.zobrist, next_state, (current_state, move))
+                    if profile is not None:
+                        profile.frontier(depth + 1)
+                        profile.count('goal_checks')
+                        if next_state.glass_positions != current_state.glass_positions:
+                            profile.count('pushes')
+                    
+                    if next_state.is_solved():
+                        return self._trace_states(parents, next_state)
+                    suffix = known(next_state)
+                    if suffix is not None and depth + 1 + len(suffix) < best_total:
+                        best, best_total = (next_state, suffix), depth + 1 + len(suffix)
+                    next_frontier.append(next_state)
+            frontier = next_frontier
+            depth += 1
+        
+        if best is None:
+            return None  # No solution found
+        return self._trace_states(parents, best[0]) + list(best[1])
+    
+    @staticmethod
+    def _trace_states(parents: TranspositionTable, state: GameState) -> list[tuple[int, int]]:
+        """Rebuild the moves leading to state from (parent state, move) entries."""
+        path = []
+        while True:
+            parent, move = parents.get(state.zobrist, state)
+            if parent is None:
+                break
+            path.append(move)
+            state = parent
+        path.reverse()
+        return path
+    
+    def solve_bfs_compact(self) -> Optional[list[tuple[int, int]]]:
+        """Breadth-First Search over packed int states with parent pointers.
+        
+        Every discovered state is stored once as an int key, together with
+        the index of its parent and the move that reached it; the path is
+        only rebuilt when the goal is found. Returns the same moves as solve_bfs.
+        """
+        self.stats = SearchStats('bfs_compact')
+        initial_state = GameState.from_model(self.model)
+        
+        if initial_state.is_solved():
+            return []
+        if not self._counts_match(initial_state):
+            return None
+        
+        index = self.get_index()
+        codec = StateCodec(index, len(initial_state.glass_positions))
+        steps = index.get_cell_steps()
+        dest_cells = index.get_dest_cells()
+        
+        # keys doubles as the FIFO queue: states are expanded in discovery order
+        keys = [codec.pack(index.to_cell(initial_state.cat_pos),
+                           [index.to_cell(pos) for pos in initial_state.glass_positions])]
+        parents = array('l', [-1])
+        move_codes = bytearray([0])
+        glass_keys, cat_keys = codec.glass_keys, codec.cat_keys
+        visited = TranspositionTable()
+        visited.put(initial_state.zobrist, keys[0])
+        detector = self.get_detector()
+        
+        stats = self.stats
+        profile = self.profile
+        depth, depth_end = 0, 1  # depth of the node at head; nodes before depth_end are no deeper
+        head = 0
+        while head < len(keys):
+            stats.peak_frontier = max(stats.peak_frontier, len(keys) - head)
+            stats.nodes_expanded += 1
+            if self._cancelled:
+                raise SearchCancelled()
+            if profile is not None:
+                if head == depth_end:
+                    depth, depth_end = depth + 1, len(keys)
+                profile.expanded()
+                profile.visited(len(visited))
+            cat_cell, glass_cells = codec.unpack(keys[head])
+            glass_set = set(glass_cells)
+            glass_hash = codec.glass_hash(glass_cells)
+            
+            for code, step in enumerate(steps):
+                target = step[cat_cell]
+                if target < 0:
+                    continue
+                
+                pushed = target in glass_set
+                if pushed:
+                    glass_target = step[target]
+                    if glass_target < 0 or glass_target in glass_set:
+                        continue
+                    next_glasses = (glass_set - {target}) | {glass_target}
+                    zobrist = glass_hash ^ glass_keys[target] ^ glass_keys[glass_target] ^ cat_keys[target]
+                else:
+                    next_glasses = glass_set
+                    zobrist = glass_hash ^ cat_keys[target]
+                
+                key = codec.pack(target, next_glasses)
+                if visited.contains(zobrist, key):
+                    if profile is not None:
+                        profile.count('duplicates')
+                    continue
+                if pushed and detector is not None and detector.is_deadlock(glass_target, next_glasses):
+                    visited.put(zobrist, key)
+                    stats.pruned += 1
+                    continue
+                
+                keys.append(key)
+                parents.append(head)
+                move_codes.append(code)
+                if profile is not None:
+                    profile.frontier(depth + 1)
+                    if pushed:
+                        # only pushes can complete the room, so only they are goal checked
+                        profile.count('pushes')
+                        profile.count('goal_checks')
+                
+                if pushed and next_glasses == dest_cells:
+                    return self._backtrack(parents, move_codes, len(keys) - 1)
+                
+                visited.put(zobrist, key)
+            head += 1
+        
+        return None  # No solution found
+    
+    @staticmethod
+    def _backtrack(parents: array, move_codes: bytearray, node: int) -> list[tuple[int, int]]:
+        """Rebuild the move list leading to node by following parent pointers."""
+        path = []
+        while parents[node] >= 0:
+            path.append(MOVES[move_codes[node]])
+            node = parents[node]
+        path.reverse()
+        return path
+    
+    def solve_pushes(self) -> Optional[list[tuple[int, int]]]:
+        """Breadth-First Search over glass pushes only.
+        
+        A node is a glass configuration plus the region the cat can walk to,
+        identified by its lowest (top-left) reachable cell, so states that
+        differ only in where the cat stands within one region are merged.
+        Finds a solution with the fewest pushes (not necessarily the fewest
+        moves); the walks between pushes are filled in afterwards.
+        """
+        self.stats = SearchStats('pushes')
+        initial_state = GameState.from_model(self.model)
+        
+        if initial_state.is_solved():
+            return []
+        if not self._counts_match(initial_state):
+            return None
+        
+        index = self.get_index()
+        codec = StateCodec(index, len(initial_state.glass_positions))
+        steps = index.get_cell_steps()
+        dest_cells = index.get_dest_cells()
+        
+        cat_cell = index.to_cell(initial_state.cat_pos)
+        glass_cells = {index.to_cell(pos) for pos in initial_state.glass_positions}
+        region = min(reachable_cells(cat_cell, glass_cells, steps))
+        keys = [codec.pack(region, glass_cells)]
+        # cat cell pushed from (after the walk), and direction, for each node
+        parents = array('l', [-1])
+        push_cells = array('l', [cat_cell])
+        push_codes = bytearray([0])
+        glass_keys, cat_keys = codec.glass_keys, codec.cat_keys
+        visited = TranspositionTable()
+        visited.put(codec.glass_hash(glass_cells) ^ cat_keys[region], keys[0])
+        detector = self.get_detector()
+        
+        stats = self.stats
+        profile = self.profile
+        depth, depth_end = 0, 1  # pushes made to reach the node at head, as in solve_bfs_compact
+        head = 0
+        while head < len(keys):
+            stats.peak_frontier = max(stats.peak_frontier, len(keys) - head)
+            stats.nodes_expanded += 1
+            if self._cancelled:
+                raise SearchCancelled()
+            if profile is not None:
+                if head == depth_end:
+                    depth, depth_end = depth + 1, len(keys)
+                profile.expanded()
+                profile.visited(len(visited))
+            cat_cell, glass_list = codec.unpack(keys[head])
+            glass_set = set(glass_list)
+            glass_hash = codec.glass_hash(glass_list)
+            reachable = reachable_cells(cat_cell, glass_set, steps)
+            
+            for glass in glass_list:
+                for code, step in enumerate(steps):
+                    glass_target = step[glass]
+                    if glass_target < 0 or glass_target in glass_set:
+                        continue
+                    # the cat must stand on the opposite side of the glass
+                    behind = steps[OPPOSITE[code]][glass]
+                    if behind not in reachable:
+                        continue
+                    
+                    next_glasses = (glass_set - {glass}) | {glass_target}
+                    if detector is not None and detector.is_deadlock(glass_target, next_glasses):
+                        stats.pruned += 1
+                        continue
+                    next_region = min(reachable_cells(glass, next_glasses, steps))
+                    key = codec.pack(next_region, next_glasses)
+                    zobrist = glass_hash ^ glass_keys[glass] ^ glass_keys[glass_target] ^ cat_keys[next_region]
+                    if visited.contains(zobrist, key):
+                        if profile is not None:
+                            profile.count('duplicates')
+                        continue
+                    
+                    keys.append(key)
+                    parents.append(head)
+                    push_cells.append(behind)
+                    push_codes.append(code)
+                    if profile is not None:
+                        profile.frontier(depth + 1)
+                        profile.count('pushes')
+                        profile.count('goal_checks')
+                    
+                    if next_glasses == dest_cells:
+                        return self._expand_pushes(parents, push_cells, push_codes, len(keys) - 1,
+                                                   index.to_cell(initial_state.cat_pos),
+                                                   {index.to_cell(pos) for pos in initial_state.glass_positions})
+                    visited.put(zobrist, key)
+            head += 1
+        
+        return None  # No solution found
+    
+    def _expand_pushes(self, parents: array, push_cells: array, push_codes: bytearray, node: int,
+                       cat_cell: int, glass_cells: set[int]) -> list[tuple[int, int]]:
+        """Turn the chain of pushes ending at node into a full list of cat moves."""
+        steps = self.get_index().get_cell_steps()
+        pushes = []
+        while parents[node] >= 0:
+            pushes.append((push_cells[node], push_codes[node]))
+            node = parents[node]
+        pushes.reverse()
+        
+        path = []
+        for behind, code in pushes:
+            path.extend(MOVES[walk] for walk in walk_path(cat_cell, behind, glass_cells, steps))
+            path.append(MOVES[code])
+            cat_cell = steps[code][behind]
+            glass_cells = (glass_cells - {cat_cell}) | {steps[code][cat_cell]}
+        return path
+    
+    def _heuristic(self, glass_cells) -> float:
+        """Admissible lower bound on the moves left: the cheapest assignment of
+        glasses to dests, each costing its lone-glass push distance."""
+        distances = self.get_index().get_push_distances()
+        inf = float('inf')
+        costs = []
+        for glass in glass_cells:
+            row = [inf if distances[dest][glass] is None else distances[dest][glass] for dest in distances]
+            if min(row, default=inf) == inf:
+                return inf
+            costs.append(row)
+        return min_cost_matching(costs)
+    
+    @staticmethod
+    def _cell_children(codec: StateCodec, cat_cell: int, glass_set: set[int], glass_hash: int, steps):
+        """Yield (move code, next cat cell, next glass set, next glass hash, pushed) per legal move."""
+        glass_keys = codec.glass_keys
+        for code, step in enumerate(steps):
+            target = step[cat_cell]
+            if target < 0:
+                continue
+            if target in glass_set:
+                glass_target = step[target]
+                if glass_target < 0 or glass_target in glass_set:
+                    continue
+                yield (code, target, (glass_set - {target}) | {glass_target},
+                       glass_hash ^ glass_keys[target] ^ glass_keys[glass_target], True)
+            else:
+                yield code, target, glass_set, glass_hash, False
+    
+    def solve_astar(self) -> Optional[list[tuple[int, int]]]:
+        """Solve using A* over cat moves with the glass/dest matching heuristic.
+        
+        Returns a solution with the fewest moves, like solve_bfs, while
+        expanding far fewer states on rooms with several glasses.
+        """
+        self.stats = SearchStats('astar')
+        initial_state = GameState.from_model(self.model)
+        
+        if initial_state.is_solved():
+            return []
+        if not self._counts_match(initial_state):
+            return None
+        
+        index = self.get_index()
+        codec = StateCodec(index, len(initial_state.glass_positions))
+        steps = index.get_cell_steps()
+        dest_cells = index.get_dest_cells()
+        cat_keys = codec.cat_keys
+        heuristics = TranspositionTable()
+        profile = self.profile
+        
+        def h(glass_set, glass_hash: int) -> float:
+            glass_key = codec.pack(0, glass_set)
+            value = heuristics.get(glass_hash, glass_key)
+            if value is None:
+                if profile is None:
+                    value = self._heuristic(glass_set)
+                else:
+                    with profile.timer('heuristic'):
+                        value = self._heuristic(glass_set)
+                heuristics.put(glass_hash, glass_key, value)
+            return value
+        
+        glass_cells = {index.to_cell(pos) for pos in initial_state.glass_positions}
+        start_h = h(glass_cells, initial_state.glass_hash)
+        if start_h == float('inf'):
+            return None
+        
+        keys = [codec.pack(index.to_cell(initial_state.cat_pos), glass_cells)]
+        zobrists = [initial_state.zobrist]
+        glass_hashes = [initial_state.glass_hash]
+        parents = array('l', [-1])
+        move_codes = bytearray([0])
+        best_g = TranspositionTable()
+        best_g.put(initial_state.zobrist, keys[0], 0)
+        # (f, -g, node): ties on f prefer the deeper node
+        frontier = [(start_h, 0, 0)]
+        stats = self.stats
+        detector = self.get_detector()
+        
+        while frontier:
+            stats.peak_frontier = max(stats.peak_frontier, len(frontier))
+            _, neg_g, node = heapq.heappop(frontier)
+            g = -neg_g
+            key = keys[node]
+            if best_g.get(zobrists[node], key) < g:
+                continue  # stale entry
+            cat_cell, glass_list = codec.unpack(key)
+            glass_set = set(glass_list)
+            if profile is not None:
+                profile.count('goal_checks')
+            if glass_set == dest_cells:
+                return self._backtrack(parents, move_codes, node)
+            stats.nodes_expanded += 1
+            if self._cancelled:
+                raise SearchCancelled()
+            if profile is not None:
+                profile.expanded()
+                profile.visited(len(best_g))
+            
+            children = self._cell_children(codec, cat_cell, glass_set, glass_hashes[node], steps)
+            for code, target, next_glasses, next_hash, pushed in children:
+                next_key = codec.pack(target, next_glasses)
+                zobrist = next_hash ^ cat_keys[target]
+                if best_g.get(zobrist, next_key, g + 2) <= g + 1:
+                    if profile is not None:
+                        profile.count('duplicates')
+                    continue
+                if pushed and detector is not None and detector.is_deadlock(steps[code][target], next_glasses):
+                    stats.pruned += 1
+                    continue
+                next_h = h(next_glasses, next_hash)
+                if next_h == float('inf'):
+                    stats.pruned += 1
+                    continue
+                best_g.put(zobrist, next_key, g + 1)
+                if profile is not None:
+                    profile.frontier(g + 1)
+                    if pushed:
+                        profile.count('pushes')
+                keys.append(next_key)
+                zobrists.append(zobrist)
+                glass_hashes.append(next_hash)
+                parents.append(node)
+                move_codes.append(code)
+                heapq.heappush(frontier, (g + 1 + next_h, -(g + 1), len(keys) - 1))
+        
+        return None  # No solution found
+    
+    def solve_idastar(self, table_size: int = 1 << 20) -> Optional[list[tuple[int, int]]]:
+        """Solve using Iterative Deepening A* with the same heuristic as solve_astar.
+        
+        Memory grows with the solution length only, plus a transposition table
+        capped at table_size entries that skips states already reached at an
+        equal or lower cost during the current iteration. Returns a solution
+        with the fewest moves.
+        """
+        self.stats = SearchStats('idastar')
+        initial_state = GameState.from_model(self.model)
+        
+        if initial_state.is_solved():
+            return []
+        if not self._counts_match(initial_state):
+            return None
+        
+        index = self.get_index()
+        codec = StateCodec(index, len(initial_state.glass_positions))
+        steps = index.get_cell_steps()
+        dest_cells = index.get_dest_cells()
+        stats = self.stats
+        detector = self.get_detector()
+        cat_keys = codec.cat_keys
+        heuristics = TranspositionTable()
+        profile = self.profile
+        
+        def h(glass_set, glass_hash: int) -> float:
+            glass_key = codec.pack(0, glass_set)
+            value = heuristics.get(glass_hash, glass_key)
+            if value is None:
+                if profile is None:
+                    value = self._heuristic(glass_set)
+                else:
+                    with profile.timer('heuristic'):
+                        value = self._heuristic(glass_set)
+                if len(heuristics) < table_size:
+                    heuristics.put(glass_hash, glass_key, value)
+            return value
+        
+        start_cat = index.to_cell(initial_state.cat_pos)
+        start_glasses = {index.to_cell(pos) for pos in initial_state.glass_positions}
+        start_hash = initial_state.glass_hash
+        bound = h(start_glasses, start_hash)
+        
+        while bound != float('inf'):
+            table = TranspositionTable()
+            table.put(initial_state.zobrist, codec.pack(start_cat, start_glasses), 0)
+            next_bound = float('inf')
+            path = []
+            # each frame: (g, pending children)
+            stack = [(0, self._cell_children(codec, start_cat, start_glasses, start_hash, steps))]
+            while stack:
+                stats.peak_frontier = max(stats.peak_frontier, len(stack))
+                g, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    if path:
+                        path.pop()
+                    continue
+                code, target, next_glasses, next_hash, pushed = child
+                if pushed and profile is not None:
+                    profile.count('goal_checks')
+                if pushed and next_glasses == dest_cells:
+                    return [MOVES[move] for move in path + [code]]
+                if pushed and detector is not None and detector.is_deadlock(steps[code][target], next_glasses):
+                    stats.pruned += 1
+                    continue
+                f = g + 1 + h(next_glasses, next_hash)
+                if f > bound:
+                    next_bound = min(next_bound, f)
+                    continue
+                next_key = codec.pack(target, next_glasses)
+                zobrist = next_hash ^ cat_keys[target]
+                if table.get(zobrist, next_key, g + 2) <= g + 1:
+                    if profile is not None:
+                        profile.count('duplicates')
+                    continue
+                if len(table) < table_size:
+                    table.put(zobrist, next_key, g + 1)
+                stats.nodes_expanded += 1
+                if self._cancelled:
+                    raise SearchCancelled()
+                if profile is not None:
+                    profile.expanded()
+                    profile.visited(len(table))
+                    profile.frontier(g + 1)
+                    if pushed:
+                        profile.count('pushes')
+                path.append(code)
+                stack.append((g + 1, self._cell_children(codec, target, next_glasses, next_hash, steps)))
+            bound = next_bound
         
         return None  # No solution found
     
+    @staticmethod
+    def _pull_children(codec: StateCodec, cat_cell: int, glass_set: set[int], glass_hash: int, steps):
+        """Yield (move code, previous cat cell, previous glass set, previous glass hash, pulled)
+        for every state from which the forward move `code` leads to the given one."""
+        glass_keys = codec.glass_keys
+        for code, step in enumerate(steps):
+            previous = steps[OPPOSITE[code]][cat_cell]
+            if previous < 0 or previous in glass_set:
+                continue
+            yield code, previous, glass_set, glass_hash, False
+            # the same move may have pushed the glass now in front of the cat
+            front = step[cat_cell]
+            if front >= 0 and front in glass_set:
+                yield (code, previous, (glass_set - {front}) | {cat_cell},
+                       glass_hash ^ glass_keys[front] ^ glass_keys[cat_cell], True)
+    
+    def solve_bidirectional(self) -> Optional[list[tuple[int, int]]]:
+        """Solve using bidirectional Breadth-First Search.
+        
+        One search moves forward from the start; the other pulls glasses
+        backwards from every solved state (all glasses on the dests, cat on
+        any free cell). The smaller frontier is expanded one full layer at a
+        time until the two meet on a packed state key, so the solution has
+        the fewest moves, like solve_bfs.
+        """
+        self.stats = SearchStats('bidirectional')
+        initial_state = GameState.from_model(self.model)
+        
+        if initial_state.is_solved():
+            return []
+        if not self._counts_match(initial_state):
+            return None
+        
+        index = self.get_index()
+        codec = StateCodec(index, len(initial_state.glass_positions))
+        steps = index.get_cell_steps()
+        dest_cells = index.get_dest_cells()
+        cat_keys = codec.cat_keys
+        detector = self.get_detector()
+        stats = self.stats
+        profile = self.profile
+        
+        # table values: (neighbour key, neighbour zobrist, move code, depth), where the
+        # neighbour is the parent on the forward side and the next state towards a goal
+        # on the backward side; the move always runs forward
+        start_glasses = {index.to_cell(pos) for pos in initial_state.glass_positions}
+        start = (codec.pack(index.to_cell(initial_state.cat_pos), start_glasses),
+                 initial_state.zobrist, start_glasses, initial_state.glass_hash)
+        forward = TranspositionTable()
+        forward.put(start[1], start[0], (None, None, 0, 0))
+        forward_frontier = [start]
+        
+        backward = TranspositionTable()
+        backward_frontier = []
+        goal_hash = codec.glass_hash(dest_cells)
+        for cell, passable in enumerate(index.get_passable()):
+            if passable and cell not in dest_cells:
+                key, zobrist = codec.pack(cell, dest_cells), goal_hash ^ cat_keys[cell]
+                backward.put(zobrist, key, (None, None, 0, 0))
+                backward_frontier.append((key, zobrist, dest_cells, goal_hash))
+        
+        while forward_frontier and backward_frontier:
+            stats.peak_frontier = max(stats.peak_frontier, len(forward_frontier) + len(backward_frontier))
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            frontier = forward_frontier if expand_forward else backward_frontier
+            table, other = (forward, backward) if expand_forward else (backward, forward)
+            
+            next_frontier = []
+            meeting, best = None, float('inf')
+            for key, zobrist, glass_set, glass_hash in frontier:
+                stats.nodes_expanded += 1
+                if self._cancelled:
+                    raise SearchCancelled()
+                if profile is not None:
+                    profile.expanded()
+                    profile.visited(len(forward) + len(backward))
+                cat_cell = codec.unpack(key)[0]
+                depth = table.get(zobrist, key)[3]
+                expand = self._cell_children if expand_forward else self._pull_children
+                for code, next_cat, next_glasses, next_hash, moved in expand(codec, cat_cell, glass_set,
+                                                                             glass_hash, steps):
+                    # dead cells and freezes only make sense for forward pushes
+                    if expand_forward and moved and detector is not None and \
+                            detector.is_deadlock(steps[code][next_cat], next_glasses):
+                        stats.pruned += 1
+                        continue
+                    next_key = codec.pack(next_cat, next_glasses)
+                    next_zobrist = next_hash ^ cat_keys[next_cat]
+                    if table.contains(next_zobrist, next_key):
+                        if profile is not None:
+                            profile.count('duplicates')
+                        continue
+                    table.put(next_zobrist, next_key, (key, zobrist, code, depth + 1))
+                    next_frontier.append((next_key, next_zobrist, next_glasses, next_hash))
+                    if profile is not None:
+                        # meeting the other side is this search's goal test
+                        profile.frontier(depth + 1 if expand_forward else -(depth + 1))
+                        profile.count('goal_checks')
+                        if moved:
+                            profile.count('pushes')
+                    reached = other.get(next_zobrist, next_key)
+                    if reached is not None and depth + 1 + reached[3] < best:
+                        meeting, best = (next_key, next_zobrist), depth + 1 + reached[3]
+            
+            if meeting is not None:
+                return self._join_bidirectional(forward, backward, *meeting)
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+        
+        return None  # No solution found
+    
+    @staticmethod
+    def _join_bidirectional(forward: TranspositionTable, backward: TranspositionTable,
+                            key: int, zobrist: int) -> list[tuple[int, int]]:
+        """Concatenate the forward path to the meeting state with the backward path from it."""
+        path = []
+        node = (key, zobrist)
+        while True:
+            parent, parent_zobrist, code, _ = forward.get(node[1], node[0])
+            if parent is None:
+                break
+            path.append(MOVES[code])
+            node = (parent, parent_zobrist)
+        path.reverse()
+        
+        node = (key, zobrist)
+        while True:
+            after, after_zobrist, code, _ = backward.get(node[1], node[0])
+            if after is None:
+                break
+            path.append(MOVES[code])
+            node = (after, after_zobrist)
+        return path
+    
     def solve_dfs(self, max_depth: int = 100) -> Optional[list[tuple[int, int]]]:
         """Solve using Depth-First Search with depth limit. Returns list of moves or None if no solution."""
-        initial_state = GameState.from_model(self.model)
-        visited = set()
+        self.stats = SearchStats('dfs')
+        initial_state = self.state_class.from_model(self.model)
+        visited = TranspositionTable()
+        stats = self.stats
+        profile = self.profile
+        detector = self.get_detector()
         
         def dfs_recursive(state: GameState, path: list[tuple[int, int]], depth: int) -> Optional[list[tuple[int, int]]]:
-            if depth > max_depth or state in visited:
+            if depth > max_depth:
+                return None
+            if visited.contains(state.zobrist, state):
+                if profile is not None:
+                    profile.count('duplicates')
                 return None
             
+            if profile is not None:
+                if depth:
+                    profile.frontier(depth)
+                profile.count('goal_checks')
             if state.is_solved():
                 return path
             
-            visited.add(state)
-            moves = [info['delta'] for info in MOVE_DIRECTIONS.values()]
-            
-            for move in moves:
+            visited.put(state.zobrist, state)
+            stats.nodes_expanded += 1
+            if self._cancelled:
+                raise SearchCancelled()
+            if profile is not None:
+                profile.expanded()
+                profile.visited(len(visited))
+            stats.peak_frontier = max(stats.peak_frontier, depth + 1)
+            for move in MOVES:
                 next_state = state.try_move(move)
-                if next_state is not None:
+                if next_state is not None and self._state_deadlocked(detector, next_state, move):
+                    stats.pruned += 1
+                elif next_state is not None:
+                    if profile is not None and next_state.glass_positions != state.glass_positions:
+                        profile.count('pushes')
                     result = dfs_recursive(next_state, path + [move], depth + 1)
                     if result is not None:
                         return result
             
-            visited.remove(state)  # Backtrack
+            visited.discard(state.zobrist, state)  # Backtrack
             return None
         
         return dfs_recursive(initial_state, [], 0)
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""Solve every room of a game directory or collection file in parallel and write a JSON report.
+
+    python batch_solve.py games/default --workers 4 --time-limit 60 --output report.json
+"""
+import argparse
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import resource
+import sys
+import time
+from typing import Optional
+
+import ai_solver
+import model
+import solution_db
+from levels import cache_path, open_levels
+from parallel_solver import ParallelSolver
+from constants import *
+
+STATUS_SOLVED = 'solved'
+STATUS_UNSOLVABLE = 'unsolvable'
+STATUS_TIMEOUT = 'timeout'
+STATUS_MEMORY = 'memory'
+STATUS_ERROR = 'error'
+
+
+def solve_room(game_dir: str, room_name: str, method: str, memory_limit_mb: int,
+               db_path: Optional[str] = None) -> dict:
+    """Solve one room in the current process and describe the outcome.
+
+    With db_path, a solution stored in that SolutionDB is reported without
+    searching, and new move-optimal solutions are stored there.
+    """
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    result = {'room': room_name, 'method': method}
+    start = time.perf_counter()
+    solutions = solution_db.SolutionDB(db_path) if db_path else None
+    solver = None
+    try:
+        game = model.Model(game_dir, [room_name], solutions)
+        known = game.get_known_solution()
+        if known is None:
+            solver = ParallelSolver(game) if method == 'solve_parallel' else ai_solver.SokobanSolver(game)
+            solution = getattr(solver, method)()
+        else:
+            solution = known.moves
+    except MemoryError:
+        result['status'] = STATUS_MEMORY
+    except Exception as e:
+        result.update(status=STATUS_ERROR, error=f'{type(e).__name__}: {e}')
+    else:
+        if solution is None:
+            result['status'] = STATUS_UNSOLVABLE
+        elif known is not None:
+            result.update(status=STATUS_SOLVED, cached=True, solved_by=known.method,
+                          solution=ai_solver.moves_to_text(solution),
+                          solution_length=len(solution), pushes=known.pushes)
+        else:
+            result.update(status=STATUS_SOLVED, cached=False, solved_by=method,
+                          solution=ai_solver.moves_to_text(solution),
+                          solution_length=len(solution),
+                          pushes=ai_solver.count_pushes(ai_solver.GameState.from_model(game), solution))
+        # a cached solution is reported with the counts of a search that expanded nothing
+        stats = (solver.stats if solver is not None else ai_solver.SearchStats(method)).as_dict()
+        del stats['method']
+        result.update(stats)
+        if solver is not None and solution is not None and method in solution_db.MOVE_OPTIMAL_METHODS:
+            game.record_solution(solution, result['pushes'], method,
+                                 time.perf_counter() - start, stats['nodes_expanded'])
+    finally:
+        if solutions is not None:
+            solutions.close()
+    result['wall_time'] = time.perf_counter() - start
+    result['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def _run_worker(connection, game_dir: str, room_name: str, method: str, memory_limit_mb: int,
+                db_path: Optional[str]) -> None:
+    connection.send(solve_room(game_dir, room_name, method, memory_limit_mb, db_path))
+    connection.close()
+
+
+def solve_directory(game_dir: str, method: str = 'solve_astar', workers: int = 0,
+                    time_limit: float = 0, memory_limit_mb: int = 0, db_path: Optional[str] = None) -> list[dict]:
+    """Solve all rooms of game_dir, each in its own process, at most `workers` at a time.
+
+    A room that exceeds time_limit seconds is terminated and reported as a
+    timeout; 0 disables a limit. Results come back in room order.
+    """
+    workers = workers or os.cpu_count() or 1
+    levels = open_levels(game_dir)
+    pending = [levels.name(num) for num in range(len(levels))]
+    results = {}
+    running = {}  # process sentinel -> (process, connection, room name, start time)
+
+    while pending or running:
+        while pending and len(running) < workers:
+            room_name = pending.pop(0)
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_run_worker,
+                                              args=(sender, game_dir, room_name, method, memory_limit_mb, db_path))
+            process.start()
+            sender.close()
+            running[process.sentinel] = (process, receiver, room_name, time.perf_counter())
+
+        multiprocessing.connection.wait(list(running), timeout=0.1)
+        now = time.perf_counter()
+        for sentinel, (process, receiver, room_name, start) in list(running.items()):
+            if receiver.poll():
+                results[room_name] = receiver.recv()
+            elif process.is_alive() and time_limit and now - start > time_limit:
+                process.terminate()
+                results[room_name] = {'room': room_name, 'method': method, 'status': STATUS_TIMEOUT,
+                                      'wall_time': now - start}
+            elif process.is_alive():
+                continue
+            else:
+                # died without reporting, e.g. killed by the operating system
+                results[room_name] = {'room': room_name, 'method': method, 'status': STATUS_ERROR,
+                                      'exit_code': process.exitcode, 'wall_time': now - start}
+            process.join()
+            receiver.close()
+            del running[sentinel]
+
+    return [results[name] for name in (levels.name(num) for num in range(len(levels)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('game_dir', nargs='?', default=DEFAULT_GAMES)
+    parser.add_argument('--method', default='solve_astar',
+                        help='SokobanSolver method to use, e.g. solve_bfs or solve_pushes')
+    parser.add_argument('--workers', type=int, default=0, help='parallel rooms, default: one per core')
+    parser.add_argument('--time-limit', type=float, default=0, help='seconds per room, 0 for none')
+    parser.add_argument('--memory-limit', type=int, default=0, help='MB of address space per room, 0 for none')
+    parser.add_argument('--output', help='report file, default: standard output')
+    parser.add_argument('--db', default=cache_path(SOLUTION_DB),
+                        help=f'solution database, default: {SOLUTION_DB} in the user cache directory')
+    parser.add_argument('--no-db', action='store_true', help='always search, without reading or storing solutions')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.game_dir):
+        sys.exit(f'{args.game_dir}: no such directory or collection file')
+    results = solve_directory(args.game_dir, args.method, args.workers, args.time_limit, args.memory_limit,
+                              None if args.no_db else args.db)
+    report = json.dumps({'game_dir': args.game_dir, 'rooms': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            report_file.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
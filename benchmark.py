@@ -0,0 +1,434 @@
+"""Benchmarks for the AI solver.
+
+Run from the repository root, e.g.:
+
+    python benchmark.py solver
+    python benchmark.py solver --game-dir games/default --repeat 20
+    python benchmark.py parallel --workers 1 2 4 8
+    python benchmark.py render --moves 5000
+    python benchmark.py memory --sizes 50 100 200
+    python benchmark.py simulate --sequences 1000 --length 1000
+    python benchmark.py goals --glasses 10 100 1000
+    python benchmark.py suite --save baseline.json
+    python benchmark.py suite --baseline baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Iterator
+
+from ai_solver import GameState, SokobanSolver, moves_to_text
+from bitboard import BitState
+from constants import *
+from generator import pull_glasses, render
+from levels import MemorySource, open_levels
+from model import Model, Room
+from parallel_solver import ParallelSolver
+from renderer import CellRenderer
+from simulate import Simulator
+
+
+def iter_rooms(game_dir: str) -> Iterator[tuple[str, Model]]:
+    """Yield (room name, model) for every room of game_dir, in order."""
+    model = Model(game_dir)
+    for num in range(model.get_num_rooms()):
+        yield model.get_room_name(), model
+        if num + 1 < model.get_num_rooms():
+            model.level_up()
+
+
+def generate_room(num_rows: int, num_cols: int, num_glasses: int, pulls: int, seed: int) -> list[str]:
+    """A solvable open room: glasses start on dests and are pulled away at random, see generator.pull_glasses."""
+    rng = random.Random(seed)
+    floor = {(i, j) for i in range(1, num_rows - 1) for j in range(1, num_cols - 1)}
+    while True:
+        dests = set(rng.sample(sorted(floor), num_glasses))
+        pulled = pull_glasses(rng, floor, dests, pulls)
+        if pulled is not None:
+            cat, glasses = pulled
+            return render(num_rows, num_cols, floor, dests, glasses, cat)
+
+
+def model_from_tiles(tiles: list[str]) -> Model:
+    """Model over a single in-memory room."""
+    return Model(MemorySource([('room1.txt', tiles)]))
+
+
+def time_call(func: Callable[[], object], repeat: int) -> tuple[float, object]:
+    """Return the best wall time of `repeat` calls to func, and its last result."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_solver(args: argparse.Namespace) -> None:
+    print(f'{"room":<16}{"method":<20}{"moves":>8}{"best ms":>12}{"expanded":>10}{"peak":>8}{"pruned":>8}')
+    for name, model in iter_rooms(args.game_dir):
+        state_class = BitState if args.bitboard else GameState
+        solver = SokobanSolver(model, prune_deadlocks=not args.no_prune, state_class=state_class)
+        for method in args.methods:
+            elapsed, solution = time_call(getattr(solver, method), args.repeat)
+            moves = '-' if solution is None else len(solution)
+            stats = solver.stats
+            print(f'{name:<16}{method:<20}{moves:>8}{elapsed * 1000:>12.3f}'
+                  f'{stats.nodes_expanded:>10}{stats.peak_frontier:>8}{stats.pruned:>8}')
+
+
+def bench_parallel(args: argparse.Namespace) -> None:
+    rooms = []
+    for name, tiles in open_levels(args.game_dir):
+        rooms.append((name, model_from_tiles(tiles)))
+    for size in args.generated:
+        tiles = generate_room(size, size, 3, size * size, args.seed)
+        rooms.append((f'gen{size}x{size}', model_from_tiles(tiles)))
+
+    print(f'{"room":<16}{"workers":>8}{"moves":>8}{"best ms":>12}{"speedup":>9}{"expanded":>10}')
+    for name, model in rooms:
+        serial_moves = SokobanSolver(model).solve_bfs()
+        baseline = None
+        for workers in args.workers:
+            solver = ParallelSolver(model, workers)
+            elapsed, solution = time_call(solver.solve_parallel, args.repeat)
+            assert (solution is None) == (serial_moves is None) and \
+                (solution is None or len(solution) == len(serial_moves)), 'parallel BFS is not optimal'
+            baseline = baseline or elapsed
+            moves = '-' if solution is None else len(solution)
+            print(f'{name:<16}{workers:>8}{moves:>8}{elapsed * 1000:>12.3f}{baseline / elapsed:>9.2f}'
+                  f'{solver.stats.nodes_expanded:>10}')
+
+
+class CanvasRecorder:
+    """Stand-in for tk.Canvas without a display: keeps the items and their options."""
+
+    def __init__(self) -> None:
+        self.items = {}
+        self._next_id = 1
+
+    def create_image(self, x: int, y: int, **options) -> int:
+        item, self._next_id = self._next_id, self._next_id + 1
+        self.items[item] = dict(options, coords=(x, y))
+        return item
+
+    def itemconfigure(self, item: int, **options) -> None:
+        self.items[item].update(options)
+
+    def delete(self, tag: str) -> None:
+        assert tag == 'all'
+        self.items.clear()
+
+    def item_count(self) -> int:
+        return len(self.items)
+
+
+def bench_render(args: argparse.Namespace) -> None:
+    model = model_from_tiles(generate_room(args.size, args.size, args.size // 2, args.size ** 2, args.seed))
+    root = None
+    try:
+        import tkinter as tk  # the only benchmark that wants a display
+        root = tk.Tk()
+    except ImportError:
+        pass
+    except tk.TclError:
+        pass
+    if root is not None:
+        canvas = tk.Canvas(root, width=ROOM_CANVAS_WIDTH, height=ROOM_CANVAS_HEIGHT)
+        size = ROOM_CANVAS_WIDTH // args.size
+        images = {symbol: tk.PhotoImage(width=size, height=size)
+                  for symbol in (*TILE_IMAGES, *MOVEABLE_ENTITY_IMAGES)}
+        count_items = lambda: len(canvas.find_all())
+        backend = 'tk.Canvas'
+    else:
+        canvas = CanvasRecorder()
+        images = {symbol: symbol for symbol in (*TILE_IMAGES, *MOVEABLE_ENTITY_IMAGES)}
+        count_items = canvas.item_count
+        backend = 'headless recorder'
+    renderer = CellRenderer(canvas, images.__getitem__)
+    renderer.set_img_size((ROOM_CANVAS_WIDTH // args.size, ROOM_CANVAS_HEIGHT // args.size))
+    renderer.draw(model.get_cat(), model.get_room(), model.pop_changes())
+
+    generator = random.Random(args.seed)
+    deltas = [info['delta'] for info in MOVE_DIRECTIONS.values()]
+    frame_times = []
+    for _ in range(args.moves):
+        model.move_cat(generator.choice(deltas))
+        start = time.perf_counter()
+        changes = model.pop_changes()
+        renderer.draw(model.get_cat(), model.get_room(), None if args.full else changes)
+        if root is not None:
+            canvas.update_idletasks()
+        frame_times.append(time.perf_counter() - start)
+    if root is not None:
+        root.destroy()
+
+    window = max(1, len(frame_times) // 10)
+    first = sum(frame_times[:window]) / window
+    last = sum(frame_times[-window:]) / window
+    print(f'{backend}, {args.size}x{args.size} room, {args.moves} moves, '
+          f'{"full redraw" if args.full else "dirty cells"}')
+    print(f'mean frame first 10%: {first * 1e6:.1f} us, last 10%: {last * 1e6:.1f} us, '
+          f'canvas items: {count_items()}')
+
+
+def room_bytes(tiles: list[str]) -> int:
+    """Bytes allocated to hold a Room built from tiles, as traced by tracemalloc."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    room = Room(len(tiles), len(tiles[0]))
+    room.set_playground(tiles)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del room
+    return size
+
+
+def scatter_room(size: int, num_glasses: int, seed: int) -> list[str]:
+    """A walled square room with glasses, dests and inner walls at random; not necessarily solvable."""
+    generator = random.Random(seed)
+    interior = [(i, j) for i in range(1, size - 1) for j in range(1, size - 1)]
+    cells = generator.sample(interior, 2 * num_glasses + 1 + len(interior) // 10)
+    symbols = {pos: WALL for pos in cells[2 * num_glasses + 1:]}
+    symbols.update({pos: GLASS for pos in cells[:num_glasses]})
+    symbols.update({pos: DEST for pos in cells[num_glasses:2 * num_glasses]})
+    symbols[cells[2 * num_glasses]] = CAT
+    return [''.join(symbols.get((i, j), EMPTY if 0 < i < size - 1 and 0 < j < size - 1 else WALL)
+                    for j in range(size)) for i in range(size)]
+
+
+def bench_memory(args: argparse.Namespace) -> None:
+    print(f'{"room":<12}{"cells":>8}{"glasses":>9}{"bytes":>12}{"per cell":>10}')
+    for size in args.sizes:
+        tiles = scatter_room(size, size // 2, args.seed)
+        num_bytes = room_bytes(tiles)
+        print(f'{f"{size}x{size}":<12}{size * size:>8}{size // 2:>9}{num_bytes:>12}{num_bytes / (size * size):>10.1f}')
+
+
+def bench_goals(args: argparse.Namespace) -> None:
+    print(f'{"glasses":>8}{"incremental ns":>16}{"rescan ns":>12}')
+    for num_glasses in args.glasses:
+        size = int((num_glasses * 8) ** 0.5) + 2
+        room = Room(size, size)
+        room.set_playground(scatter_room(size, num_glasses, args.seed))
+        # a glass with a free passable cell below it, pushed down and back up
+        glass = next(glass for pos, glass in room.get_glasses().items()
+                     if room.tile_passable(pos[0] + 1, pos[1]) and (pos[0] + 1, pos[1]) not in room.get_glasses())
+
+        def push_incremental() -> None:
+            for delta in ((1, 0), (-1, 0)) * args.pushes:
+                room.move_glass(glass, delta)
+                room.all_filled()
+
+        def push_rescan() -> None:
+            for delta in ((1, 0), (-1, 0)) * args.pushes:
+                room.move_glass(glass, delta)
+                room.update_dests()
+                room.all_filled()
+
+        incremental, _ = time_call(push_incremental, 3)
+        rescan, _ = time_call(push_rescan, 3)
+        pushes = 2 * args.pushes
+        print(f'{num_glasses:>8}{incremental / pushes * 1e9:>16.0f}{rescan / pushes * 1e9:>12.0f}')
+
+
+def bench_simulate(args: argparse.Namespace) -> None:
+    tiles = generate_room(args.size, args.size, 3, args.size ** 2, args.seed)
+    simulator = Simulator.from_tiles(tiles)
+    generator = random.Random(args.seed)
+    chars = ''.join(info['char'] for info in MOVE_DIRECTIONS.values())
+    sequences = [''.join(generator.choices(chars, k=args.length)) for _ in range(args.sequences)]
+    elapsed, results = time_call(lambda: simulator.run_many(sequences), 1)
+    total = args.sequences * args.length
+    valid = sum(result.num_valid() for result in results)
+    print(f'{args.sequences} sequences of {args.length} moves on a {args.size}x{args.size} room: '
+          f'{elapsed:.3f}s, {total / elapsed / 1e6:.2f}M moves/s, {valid / total:.0%} valid')
+
+    # the same moves one Model.move_cat call at a time, for comparison
+    model = model_from_tiles(tiles)
+    deltas = {info['char']: info['delta'] for info in MOVE_DIRECTIONS.values()}
+    sample = sequences[:max(1, args.sequences // 10)]
+    start = time.perf_counter()
+    for sequence in sample:
+        model.load_game()
+        for char in sequence:
+            model.move_cat(deltas[char])
+    model_elapsed = time.perf_counter() - start
+    print(f'Model.move_cat on {len(sample)} of them: {len(sample) * args.length / model_elapsed / 1e6:.2f}M moves/s')
+
+
+# (rows, cols, glasses) of the generated suite rooms, in increasing difficulty
+SUITE_ROOMS = [(6, 6, 2), (7, 7, 2), (8, 8, 2), (8, 8, 3), (9, 9, 3)]
+SUITE_METHODS = ['solve_bfs', 'solve_bfs_compact', 'solve_bfs_seeded', 'solve_pushes', 'solve_astar',
+                 'solve_idastar', 'solve_bidirectional', 'solve_dfs', 'solve_parallel']
+# depth-first search is exponential in the room size: it runs depth-limited, and only on small rooms
+SUITE_DFS_MAX_DEPTH = 30
+SUITE_DFS_MAX_CELLS = 49
+
+
+def build_corpus(game_dir: str, seed: int) -> list[tuple[str, list[str]]]:
+    """(name, rows) of every room of game_dir followed by the seeded generated rooms."""
+    corpus = list(open_levels(game_dir))
+    for rows, cols, glasses in SUITE_ROOMS:
+        tiles = generate_room(rows, cols, glasses, rows * cols // 8, seed)
+        corpus.append((f'gen{rows}x{cols}g{glasses}s{seed}', tiles))
+    return corpus
+
+
+def suite_search(model: Model, method: str) -> tuple[SokobanSolver, Callable[[], object]]:
+    """Solver for method and a call running it on model with the suite's arguments."""
+    if method == 'solve_parallel':
+        solver = ParallelSolver(model)
+        return solver, solver.solve_parallel
+    solver = SokobanSolver(model)
+    if method == 'solve_bfs_seeded':
+        # nothing is known, so this measures what the seed lookups add to solve_bfs
+        return solver, lambda: solver.solve_bfs_seeded(lambda state: None)
+    if method == 'solve_dfs':
+        return solver, lambda: solver.solve_dfs(SUITE_DFS_MAX_DEPTH)
+    return solver, getattr(solver, method)
+
+
+def run_suite(corpus: list[tuple[str, list[str]]], methods: list[str], repeat: int) -> list[dict]:
+    """Best wall time, nodes/sec, traced peak memory and solution of every method on every room.
+
+    solve_dfs is skipped on rooms of more than SUITE_DFS_MAX_CELLS cells. The
+    peak memory of solve_parallel is that of the coordinating process only.
+    """
+    results = []
+    for name, tiles in corpus:
+        model = model_from_tiles(tiles)
+        for method in methods:
+            if method == 'solve_dfs' and len(tiles) * max(map(len, tiles)) > SUITE_DFS_MAX_CELLS:
+                continue
+            solver, search = suite_search(model, method)
+            elapsed, solution = time_call(search, repeat)
+            nodes = solver.stats.nodes_expanded
+            tracemalloc.start()
+            search()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results.append({'room': name, 'method': method, 'wall_time': elapsed,
+                            'nodes_expanded': nodes, 'nodes_per_sec': nodes / elapsed if elapsed else 0.0,
+                            'peak_bytes': peak, 'solution_length': None if solution is None else len(solution),
+                            'solution': None if solution is None else moves_to_text(solution)})
+    return results
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float, min_time: float = 0.0) -> list[str]:
+    """Regressions of results against baseline: slower or bigger by more than threshold, or a longer solution.
+
+    Wall times are only compared where the baseline took at least min_time
+    seconds, since shorter runs are mostly timer noise.
+    """
+    previous = {(entry['room'], entry['method']): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        old = previous.get((entry['room'], entry['method']))
+        if old is None:
+            continue
+        label = f'{entry["room"]} {entry["method"]}'
+        for key in ('wall_time', 'peak_bytes'):
+            if key == 'wall_time' and old[key] < min_time:
+                continue
+            if entry[key] > old[key] * (1 + threshold):
+                regressions.append(f'{label}: {key} {old[key]:.6g} -> {entry[key]:.6g}')
+        if entry['solution_length'] != old['solution_length'] and \
+                (entry['solution_length'] is None or old['solution_length'] is None or
+                 entry['solution_length'] > old['solution_length']):
+            regressions.append(f'{label}: solution_length {old["solution_length"]} -> {entry["solution_length"]}')
+    return regressions
+
+
+def bench_suite(args: argparse.Namespace) -> None:
+    results = run_suite(build_corpus(args.game_dir, args.seed), args.methods, args.repeat)
+    print(f'{"room":<18}{"method":<22}{"moves":>6}{"best ms":>10}{"nodes/s":>11}{"peak KB":>9}')
+    for entry in results:
+        moves = '-' if entry['solution_length'] is None else entry['solution_length']
+        print(f'{entry["room"]:<18}{entry["method"]:<22}{moves:>6}{entry["wall_time"] * 1000:>10.2f}'
+              f'{entry["nodes_per_sec"]:>11.0f}{entry["peak_bytes"] / 1024:>9.0f}')
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            json.dump({'seed': args.seed, 'results': results}, baseline_file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.threshold, args.min_ms / 1000)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+        print(f'no regression beyond {args.threshold:.0%} against {args.baseline}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    solver = commands.add_parser('solver', help='time each solver method on every room')
+    solver.add_argument('--game-dir', default=DEFAULT_GAMES)
+    solver.add_argument('--repeat', type=int, default=10)
+    # solve_dfs is exponential on room3 (it forgets states on backtrack), so it is opt-in
+    solver.add_argument('--methods', nargs='+', default=['solve_bfs', 'solve_bfs_compact', 'solve_pushes',
+                                                         'solve_astar', 'solve_idastar', 'solve_bidirectional'])
+    solver.add_argument('--no-prune', action='store_true', help='disable deadlock pruning')
+    solver.add_argument('--bitboard', action='store_true', help='use BitState for solve_bfs/solve_dfs')
+    solver.set_defaults(func=bench_solver)
+
+    parallel = commands.add_parser('parallel', help='scaling of the parallel BFS with the worker count')
+    parallel.add_argument('--game-dir', default=DEFAULT_GAMES)
+    parallel.add_argument('--repeat', type=int, default=3)
+    parallel.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parallel.add_argument('--generated', type=int, nargs='*', default=[8, 10],
+                          help='side lengths of the generated rooms')
+    parallel.add_argument('--seed', type=int, default=1)
+    parallel.set_defaults(func=bench_parallel)
+
+    render = commands.add_parser('render', help='frame time of the room renderer over many moves')
+    render.add_argument('--moves', type=int, default=5000)
+    render.add_argument('--size', type=int, default=20, help='side length of the generated room')
+    render.add_argument('--seed', type=int, default=1)
+    render.add_argument('--full', action='store_true', help='rebuild every cell on every frame')
+    render.set_defaults(func=bench_render)
+
+    memory = commands.add_parser('memory', help='bytes held by a Room for large generated rooms')
+    memory.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200])
+    memory.add_argument('--seed', type=int, default=1)
+    memory.set_defaults(func=bench_memory)
+
+    simulate = commands.add_parser('simulate', help='throughput of the headless batch simulator')
+    simulate.add_argument('--sequences', type=int, default=1000)
+    simulate.add_argument('--length', type=int, default=1000)
+    simulate.add_argument('--size', type=int, default=10, help='side length of the generated room')
+    simulate.add_argument('--seed', type=int, default=1)
+    simulate.set_defaults(func=bench_simulate)
+
+    goals = commands.add_parser('goals', help='per-push cost of goal tracking as the glass count grows')
+    goals.add_argument('--glasses', type=int, nargs='+', default=[10, 100, 1000])
+    goals.add_argument('--pushes', type=int, default=2000)
+    goals.add_argument('--seed', type=int, default=1)
+    goals.set_defaults(func=bench_goals)
+
+    suite = commands.add_parser('suite', help='every solver method on the default and generated rooms, '
+                                              'with a JSON baseline and regression check')
+    suite.add_argument('--game-dir', default=DEFAULT_GAMES)
+    suite.add_argument('--methods', nargs='+', default=SUITE_METHODS)
+    suite.add_argument('--repeat', type=int, default=3)
+    suite.add_argument('--seed', type=int, default=1, help='seed of the generated rooms')
+    suite.add_argument('--save', help='write the results to this JSON baseline')
+    suite.add_argument('--baseline', help='compare against this JSON baseline and exit 1 on a regression')
+    suite.add_argument('--threshold', type=float, default=0.25,
+                       help='allowed relative increase of wall time and peak memory')
+    suite.add_argument('--min-ms', type=float, default=1.0,
+                       help='only compare wall times of runs that took at least this long in the baseline')
+    suite.set_defaults(func=bench_suite)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
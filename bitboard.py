@@ -0,0 +1,145 @@
+from constants import *
+from typing import Iterator, Optional
+
+
+class BitBoard:
+    """Static layout of a room as big-int bitboards.
+
+    Cell (row, col) is bit row * width + col, where width is one more than
+    the number of columns: the spare column is never passable, so shifting
+    a board one column left or right cannot wrap into the neighbouring row.
+    """
+
+    def __init__(self, room: 'Room') -> None:
+        index = room.get_index()
+        self.num_rows, self.num_cols = index.get_dimension()
+        self.width = self.num_cols + 1
+        self.passable = 0
+        for cell, passable in enumerate(index.get_passable()):
+            if passable:
+                self.passable |= 1 << self.to_bit(index.to_pos(cell))
+        self.dests = self.board(index.get_dests())
+        # bit offset of each move, in MOVE_DIRECTIONS order
+        self.shifts = {info['delta']: info['delta'][0] * self.width + info['delta'][1]
+                       for info in MOVE_DIRECTIONS.values()}
+
+    def to_bit(self, pos: tuple[int, int]) -> int:
+        return pos[0] * self.width + pos[1]
+
+    def to_pos(self, bit: int) -> tuple[int, int]:
+        return divmod(bit, self.width)
+
+    def board(self, positions) -> int:
+        """Bitboard with the bits of the given positions set."""
+        board = 0
+        for pos in positions:
+            board |= 1 << self.to_bit(pos)
+        return board
+
+    def positions(self, board: int) -> Iterator[tuple[int, int]]:
+        """Positions of the set bits of board, lowest bit first."""
+        while board:
+            low = board & -board
+            yield self.to_pos(low.bit_length() - 1)
+            board ^= low
+
+    def shift(self, board: int, delta: tuple[int, int]) -> int:
+        """Move every bit of board one step in direction delta, dropping walls."""
+        offset = self.shifts[delta]
+        shifted = board << offset if offset > 0 else board >> -offset
+        return shifted & self.passable
+
+    def is_free(self, bit: int, glasses: int) -> bool:
+        return bit >= 0 and (self.passable & ~glasses) >> bit & 1 == 1
+
+
+class BitState:
+    """Immutable game state over a BitBoard, interchangeable with ai_solver.GameState.
+
+    The cat is a bit index and the glasses a single bitboard, so hashing and
+    equality are two int operations and pushes are a pair of XORs.
+    """
+
+    def __init__(self, cat_bit: int, glasses: int, room: 'Room') -> None:
+        self.cat_bit = cat_bit
+        self.glasses = glasses
+        self.room = room
+        self.index = room.get_index()
+        self.bitboard = room.get_bitboard()
+
+    def __hash__(self) -> int:
+        return hash((self.cat_bit, self.glasses))
+
+    @property
+    def zobrist(self) -> int:
+        # solver tables verify every hit, so the plain hash serves as a key
+        return hash(self)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BitState):
+            return False
+        return self.cat_bit == other.cat_bit and self.glasses == other.glasses
+
+    @property
+    def cat_pos(self) -> tuple[int, int]:
+        return self.bitboard.to_pos(self.cat_bit)
+
+    @property
+    def glass_positions(self) -> frozenset[tuple[int, int]]:
+        return frozenset(self.bitboard.positions(self.glasses))
+
+    def is_solved(self) -> bool:
+        """Check if all glasses are on destination tiles."""
+        return self.glasses == self.bitboard.dests
+
+    def try_move(self, delta: tuple[int, int]) -> Optional['BitState']:
+        """Try to move cat in given direction. Returns new BitState if valid, None if invalid."""
+        bitboard = self.bitboard
+        offset = bitboard.shifts[delta]
+        target = self.cat_bit + offset
+        if target < 0 or not bitboard.passable >> target & 1:
+            return None
+        if not self.glasses >> target & 1:
+            return BitState(target, self.glasses, self.room)
+
+        glass_target = target + offset
+        if not bitboard.is_free(glass_target, self.glasses):
+            return None
+        return BitState(target, self.glasses ^ (1 << target) ^ (1 << glass_target), self.room)
+
+    def reachable(self) -> int:
+        """Bitboard of the cells the cat can walk to without pushing."""
+        bitboard = self.bitboard
+        free = bitboard.passable & ~self.glasses
+        width = bitboard.width
+        reached = 1 << self.cat_bit
+        while True:
+            grown = (reached | reached << 1 | reached >> 1 | reached << width | reached >> width) & free
+            grown |= reached
+            if grown == reached:
+                return reached
+            reached = grown
+
+    def legal_pushes(self) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+        """All (glass position, delta) pushes available from the cat's reachable region."""
+        bitboard = self.bitboard
+        reachable = self.reachable()
+        free = bitboard.passable & ~self.glasses
+        pushes = []
+        for delta in bitboard.shifts:
+            back = (-delta[0], -delta[1])
+            # glass with the cat reachable behind it and a free cell in front
+            pushable = bitboard.shift(reachable, delta) & self.glasses & bitboard.shift(free, back)
+            pushes.extend((pos, delta) for pos in bitboard.positions(pushable))
+        return pushes
+
+    @classmethod
+    def from_positions(cls, cat_pos: tuple[int, int], glass_positions, room: 'Room') -> 'BitState':
+        bitboard = room.get_bitboard()
+        return cls(bitboard.to_bit(cat_pos), bitboard.board(glass_positions), room)
+
+    @classmethod
+    def from_model(cls, model: 'Model') -> 'BitState':
+        """Create BitState from current Model state."""
+        room = model.get_room()
+        return cls.from_positions(model.get_cat().get_pos(), room.get_glasses().keys(), room)
@@ -0,0 +1,128 @@
+"""Canonical form of a room: the same puzzle rotated, mirrored or padded gets the same text and fingerprint.
+
+Rows are read as Room.set_playground reads them: short rows end in walls
+and unknown symbols are empty floor. Cells the cat can never reach (with
+the glasses out of the way) become walls, the room is cut down to the
+reachable area plus one ring of walls, and the smallest text among the 8
+symmetries is the canonical one. Moves and positions map both ways
+between a room and its canonical form.
+"""
+from constants import *
+import hashlib
+from typing import NamedTuple
+
+# (transpose, flip rows, flip columns): the 8 symmetries of a rectangular room
+SYMMETRIES = tuple((transpose, flip_rows, flip_cols)
+                   for transpose in (False, True) for flip_rows in (False, True) for flip_cols in (False, True))
+
+_SYMBOLS = frozenset({WALL, EMPTY, DEST, GLASS, CAT})
+
+
+def transform_tiles(tiles: list[str], symmetry: tuple[bool, bool, bool]) -> list[str]:
+    transpose, flip_rows, flip_cols = symmetry
+    rows = [''.join(column) for column in zip(*tiles)] if transpose else list(tiles)
+    if flip_rows:
+        rows.reverse()
+    if flip_cols:
+        rows = [row[::-1] for row in rows]
+    return rows
+
+
+def transform_move(move: tuple[int, int], symmetry: tuple[bool, bool, bool]) -> tuple[int, int]:
+    """Direction that move becomes once the room is transformed by symmetry."""
+    transpose, flip_rows, flip_cols = symmetry
+    d_row, d_col = (move[1], move[0]) if transpose else move
+    return (-d_row if flip_rows else d_row), (-d_col if flip_cols else d_col)
+
+
+def restore_move(move: tuple[int, int], symmetry: tuple[bool, bool, bool]) -> tuple[int, int]:
+    """Inverse of transform_move."""
+    transpose, flip_rows, flip_cols = symmetry
+    d_row, d_col = (-move[0] if flip_rows else move[0]), (-move[1] if flip_cols else move[1])
+    return (d_col, d_row) if transpose else (d_row, d_col)
+
+
+def trim_tiles(tiles: list[str]) -> tuple[list[str], tuple[int, int]]:
+    """Rows cut down to the area the cat can reach plus a ring of walls, and the original position of their top left.
+
+    The ring may lie outside the original rows, where moves were blocked
+    by the room's edge instead of by walls.
+    """
+    width = max((len(row) for row in tiles), default=0)
+    symbols = {}
+    cat = None
+    for i, row in enumerate(tiles):
+        for j, symbol in enumerate(row.ljust(width, WALL)):
+            symbol = symbol if symbol in _SYMBOLS else EMPTY
+            if symbol != WALL:
+                symbols[(i, j)] = symbol
+            if symbol == CAT and cat is None:
+                cat = (i, j)
+    if cat is None:
+        raise ValueError('room has no cat')
+
+    # glasses are pushed out of the way, so only walls bound what the cat may reach
+    reached, todo = {cat}, [cat]
+    while todo:
+        row, col = todo.pop()
+        for info in MOVE_DIRECTIONS.values():
+            pos = row + info['delta'][0], col + info['delta'][1]
+            if pos in symbols and pos not in reached:
+                reached.add(pos)
+                todo.append(pos)
+    # a glass or dest out of reach still decides whether the room is solvable
+    kept = reached | {pos for pos, symbol in symbols.items() if symbol in (GLASS, DEST)}
+
+    top, left = min(i for i, _ in kept) - 1, min(j for _, j in kept) - 1
+    bottom, right = max(i for i, _ in kept) + 1, max(j for _, j in kept) + 1
+    rows = [''.join(symbols[(i, j)] if (i, j) in kept else WALL for j in range(left, right + 1))
+            for i in range(top, bottom + 1)]
+    return rows, (top, left)
+
+
+class CanonicalLevel(NamedTuple):
+    tiles: list[str]  # canonical rows
+    fingerprint: str  # sha1 of the canonical rows, shared by every variant
+    symmetry: tuple[bool, bool, bool]  # takes the trimmed rows to the canonical ones
+    origin: tuple[int, int]  # original position of the top left of the trimmed rows
+    trimmed_shape: tuple[int, int]  # rows and columns before the symmetry
+
+    def to_canonical_move(self, move: tuple[int, int]) -> tuple[int, int]:
+        return transform_move(move, self.symmetry)
+
+    def to_original_move(self, move: tuple[int, int]) -> tuple[int, int]:
+        return restore_move(move, self.symmetry)
+
+    def to_canonical_moves(self, moves: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        return [transform_move(move, self.symmetry) for move in moves]
+
+    def to_original_moves(self, moves: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """A solution of the canonical room as moves in the original orientation."""
+        return [restore_move(move, self.symmetry) for move in moves]
+
+    def to_canonical_pos(self, pos: tuple[int, int]) -> tuple[int, int]:
+        transpose, flip_rows, flip_cols = self.symmetry
+        num_rows, num_cols = self.trimmed_shape
+        row, col = pos[0] - self.origin[0], pos[1] - self.origin[1]
+        if transpose:
+            row, col, num_rows, num_cols = col, row, num_cols, num_rows
+        return (num_rows - 1 - row if flip_rows else row), (num_cols - 1 - col if flip_cols else col)
+
+    def to_original_pos(self, pos: tuple[int, int]) -> tuple[int, int]:
+        transpose, flip_rows, flip_cols = self.symmetry
+        num_rows, num_cols = self.trimmed_shape
+        if transpose:
+            num_rows, num_cols = num_cols, num_rows
+        row = num_rows - 1 - pos[0] if flip_rows else pos[0]
+        col = num_cols - 1 - pos[1] if flip_cols else pos[1]
+        if transpose:
+            row, col = col, row
+        return row + self.origin[0], col + self.origin[1]
+
+
+def canonicalize(tiles: list[str]) -> CanonicalLevel:
+    """Canonical form of the room with these rows; raises ValueError if it has no cat."""
+    trimmed, origin = trim_tiles(tiles)
+    text, symmetry = min(('\n'.join(transform_tiles(trimmed, symmetry)), symmetry) for symmetry in SYMMETRIES)
+    return CanonicalLevel(text.split('\n'), hashlib.sha1(text.encode()).hexdigest(), symmetry, origin,
+                          (len(trimmed), len(trimmed[0])))
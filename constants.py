@@ -53,8 +53,10 @@ END_GAME = 'end'
 DEFAULT_TIREDNESS = 1000
 
 TITLE = 'SOKOBAN'
-PROMPT_TEXT = 'Enter a move(w,a,s,d) or "end" to quit:'
+PROMPT_TEXT = 'Enter a move(w,a,s,d), u to undo, r to redo, b to restart or "end" to quit:'
 DEFAULT_GAMES = 'games/default'
+CACHE_NAME = 'sokoban'  # directory of runtime files under the user cache, see levels.cache_path
+SOLUTION_DB = 'solutions.sqlite'
 DIR_NOT_EXIST = 'Directory does not exist, play default games.'
 PRESS_ANY = 'This room is messed. Press any key to continue.'
 GAMEFILE_TEXT = 'Enter game directory:'
@@ -63,6 +65,7 @@ WIN = 'Miao! All rooms are messed.'
 WINDOW_WIDTH, WINDOW_HEIGHT = 600, 600
 ROOM_CANVAS_WIDTH, ROOM_CANVAS_HEIGHT = 600, 600
 KEY_EVENT = "<Key>"
+CLICK_EVENT = "<Button-1>"
 
 IMAGE_FOLDER = 'images/'
 TILE_IMAGES = {
@@ -77,6 +80,13 @@ MOVEABLE_ENTITY_IMAGES = {
     BROKEN_GLASS: 'broken_glass.png'
 }
 
+# scaled sprites kept in memory: six images at up to ten tile sizes
+SPRITE_CACHE_SIZE = 60
+DISTANCE_MAP_CACHE_SIZE = 32  # walking distance maps kept per room
+
+# Seed of the Zobrist key tables used to hash solver states
+ZOBRIST_SEED = 0x5EED
+
 # AI Solver Messages
 AI_SOLVER_TITLE = 'AI Solver'
 AI_HINT_TITLE = 'AI Hint'
@@ -87,3 +97,16 @@ AI_SOLUTION_FOUND_MSG = 'Solution found in {} moves! Watch the AI play.'
 AI_SOLUTION_COMPLETE_MSG = 'Solution complete!'
 AI_PUZZLE_SOLVED_MSG = 'Puzzle solved by AI!'
 AI_TRY_MOVING_MSG = 'Try moving {}'
+AI_PROGRESS_MSG = 'Solving... {} states explored, peak frontier {}, {:.1f}s (press C to cancel)'
+AI_CANCELLED_MSG = 'Search cancelled.'
+
+# AI Solver keys (compared with the lower-cased Tk keysym) and polling
+AI_SOLVE_KEY = 'x'
+AI_HINT_KEY = 'h'
+AI_CANCEL_KEY = 'c'
+AI_POLL_MS = 100
+
+# Move history keys, shared by the text commands and the lower-cased Tk keysyms
+UNDO_KEY = 'u'
+REDO_KEY = 'r'
+RESTART_KEY = 'b'
@@ -1,9 +1,14 @@
 from model import Model
 from view import TextView, GraphicalView
 from constants import *
-from ai_solver import SokobanSolver
+from ai_solver import BackgroundSearch, GameState, count_pushes
+from hint_cache import SolutionCache
 import tkinter as tk
 from tkinter import messagebox
+from typing import Optional
+
+# move-optimal search that stops early on rejoining a cached plan
+SEARCH_METHOD = 'solve_bfs_seeded'
 
 
 class Controller:
@@ -21,7 +26,7 @@ class Controller:
         while True:
             command = input(PROMPT_TEXT).lower()
             valid_chars = [info['char'] for info in MOVE_DIRECTIONS.values()]
-            if command in valid_chars or command == END_GAME:
+            if command in valid_chars or command in (UNDO_KEY, REDO_KEY, RESTART_KEY, END_GAME):
                 return command
 
     def play(self) -> None:
@@ -41,6 +46,12 @@ class Controller:
                              if info['char'] == command), None)
             if move_delta:
                 self._model.move_cat(move_delta)
+            elif command == UNDO_KEY:
+                self._model.undo()
+            elif command == REDO_KEY:
+                self._model.redo()
+            elif command == RESTART_KEY:
+                self._model.go_to_move(0)
             elif command == END_GAME:
                 return
 
@@ -49,13 +60,20 @@ class GraphicalController:
     def __init__(self,
                  model: Model,
                  view: GraphicalView,
-                 root: tk.Tk) -> None:
+                 root: tk.Tk,
+                 persist_hints: bool = False) -> None:
         self._model = model
         self._view = view
         self._root = root
-        self._solver = SokobanSolver(model)
         self._solution = None
         self._solving = False
+        self._search = None
+        self._search_start = None
+        self._wanted = set()
+        self._hints = SolutionCache()
+        self._persist_hints = persist_hints
+        self._room_start = None
+        self._enter_room()
 
     def _handle_keyboard(self, e: tk.Event) -> None:
 
@@ -67,12 +85,15 @@ class GraphicalController:
             return
         
         # AI solver commands
-        if e.keysym.lower() == 'x':  # Changed from 's' to 'x' to avoid conflict
+        if e.keysym.lower() == AI_SOLVE_KEY:  # 'x' rather than 's' to avoid conflict
             self._solve_with_ai()
             return
-        elif e.keysym.lower() == 'h':
+        elif e.keysym.lower() == AI_HINT_KEY:
             self._get_hint()
             return
+        elif e.keysym.lower() == AI_CANCEL_KEY:
+            self._cancel_search()
+            return
         
         # general move and redraw the room
         move_delta = None
@@ -80,10 +101,19 @@ class GraphicalController:
             if e.keycode in info['keys']:
                 move_delta = info['delta']
                 break
+        history = {UNDO_KEY: self._model.undo,
+                   REDO_KEY: self._model.redo,
+                   RESTART_KEY: lambda: self._model.go_to_move(0)}.get(e.keysym.lower())
         
         if move_delta:
+            # a search in flight was started from the position the cat is leaving
+            self._cancel_search()
             self._model.move_cat(move_delta)
             self._redraw()
+        elif history and not self._solving:
+            self._cancel_search()
+            history()
+            self._redraw()
         else:
             return
 
@@ -91,6 +121,7 @@ class GraphicalController:
         if self._model.room_messed():
             if self._model.get_cur_room_num()+1 < self._model.get_num_rooms():
                 self._model.level_up()
+                self._enter_room()
                 self._view.set_room_dimension(self._model.get_room().get_dimension())
                 return
             else:
@@ -98,24 +129,93 @@ class GraphicalController:
                 self._root.destroy()
                 return
 
+    def _handle_click(self, pos: tuple[int, int]) -> None:
+        """Walk the cat to the clicked tile, if it can get there without pushing."""
+        if self._model.skip_keyboard() or self._solving:
+            return
+        self._cancel_search()
+        if self._model.walk_to(pos):
+            self._redraw()
+
+    def _enter_room(self) -> None:
+        """Seed the hint cache with what is known about the room just loaded."""
+        self._room_start = GameState.from_model(self._model)
+        if self._persist_hints:
+            self._hints.load_model(self._model)
+        known = self._model.get_known_solution()
+        if known is not None:
+            self._hints.store(self._room_start, known.moves)
+
     def _redraw(self) -> None:
-        self._view.draw(self._model.get_cat(), self._model.get_room())
+        self._view.draw(self._model.get_cat(), self._model.get_room(), self._model.pop_changes())
 
     def play(self) -> None:
         self._view.create_components(self._model.get_cur_dimension())
         self._view.bind_keyboard_callback(self._handle_keyboard)
+        self._view.bind_click_callback(self._handle_click)
         self._redraw()
     
     def _solve_with_ai(self) -> None:
-        """Solve the current puzzle using AI and show solution step by step."""
+        """Solve the current puzzle using AI in the background, then play the solution."""
         if self._solving:
             return
+        self._start_search(AI_SOLVE_KEY)
+    
+    def _get_hint(self) -> None:
+        """Show the next move of a cached plan, or search for one in the background."""
+        plan = self._hints.lookup(GameState.from_model(self._model))
+        if plan is not None:
+            self._show_hint(plan)
+            return
+        self._start_search(AI_HINT_KEY)
+    
+    def _start_search(self, action: str) -> None:
+        """Queue action for the search in flight, starting one if there is none."""
+        self._wanted.add(action)
+        if self._search is not None:
+            return
+        # known plans let the search stop as soon as it rejoins one of them
+        self._search_start = GameState.from_model(self._model)
+        self._search = BackgroundSearch(self._model, SEARCH_METHOD, known=self._hints.known)
+        self._view.show_status(AI_SOLVING_MSG)
+        self._root.after(AI_POLL_MS, self._poll_search, self._search)
+    
+    def _cancel_search(self) -> None:
+        if self._search is None:
+            return
+        self._search.cancel()
+        self._search = None
+        self._wanted.clear()
+        self._view.show_status(AI_CANCELLED_MSG)
+    
+    def _poll_search(self, search: BackgroundSearch) -> None:
+        """Show the progress of search and act on its result once it finishes."""
+        if search is not self._search:
+            return  # cancelled or replaced
+        if not search.done():
+            self._view.show_status(AI_PROGRESS_MSG.format(*search.progress()))
+            self._root.after(AI_POLL_MS, self._poll_search, search)
+            return
         
+        self._search = None
+        wanted, self._wanted = self._wanted, set()
+        self._view.show_status('')
+        if search.result is not None:
+            self._hints.store(self._search_start, search.result)
+            if self._persist_hints:
+                self._hints.save_model(self._model)
+            if self._search_start == self._room_start:
+                explored, _, elapsed = search.progress()
+                self._model.record_solution(search.result, count_pushes(self._search_start, search.result),
+                                            SEARCH_METHOD, elapsed, explored)
+        if AI_HINT_KEY in wanted:
+            self._show_hint(search.result)
+        if AI_SOLVE_KEY in wanted and not self._solving:
+            self._show_solution(search.result)
+    
+    def _show_solution(self, solution: Optional[list[tuple[int, int]]]) -> None:
+        """Report the solution found by the AI and show it step by step."""
         self._solving = True
-        messagebox.showinfo(AI_SOLVER_TITLE, AI_SOLVING_MSG)
-        
-        # Try BFS first (optimal solution)
-        solution = self._solver.solve_bfs()
         
         if solution is None:
             messagebox.showwarning(AI_SOLVER_TITLE, AI_NO_SOLUTION_MSG)
@@ -132,10 +232,8 @@ class GraphicalController:
         messagebox.showinfo(AI_SOLVER_TITLE, AI_SOLUTION_FOUND_MSG.format(len(solution)))
         self._play_solution()
     
-    def _get_hint(self) -> None:
-        """Get the next move hint from AI solver."""
-        solution = self._solver.solve_bfs()
-        
+    def _show_hint(self, solution: Optional[list[tuple[int, int]]]) -> None:
+        """Show the first move of the solution found by the AI as a hint."""
         if solution is None:
             messagebox.showwarning(AI_HINT_TITLE, AI_NO_SOLUTION_MSG)
             return
@@ -0,0 +1,61 @@
+from constants import *
+from model import RoomIndex
+
+
+class DeadlockDetector:
+    """Recognises glass positions from which a room can no longer be solved.
+
+    Two kinds of deadlock are detected:
+    - dead cells: cells from which a lone glass can never be pushed onto any
+      dest, precomputed once per room from the push distance table;
+    - freeze deadlocks: a glass that can move neither horizontally nor
+      vertically (against walls or other frozen glasses, e.g. a 2x2 block)
+      while it, or a glass frozen with it, is not on a dest.
+    """
+
+    def __init__(self, index: RoomIndex) -> None:
+        self._index = index
+        self._dest_cells = index.get_dest_cells()
+        steps = dict(zip(MOVE_DIRECTIONS, index.get_cell_steps()))
+        self._axes = ((steps['UP'], steps['DOWN']), (steps['LEFT'], steps['RIGHT']))
+
+        distances = index.get_push_distances()
+        self._dead_cells = frozenset(
+            cell for cell, passable in enumerate(index.get_passable())
+            if passable and all(table[cell] is None for table in distances.values()))
+
+    def get_index(self) -> RoomIndex:
+        return self._index
+
+    def get_dead_cells(self) -> frozenset[int]:
+        return self._dead_cells
+
+    def is_dead_cell(self, cell: int) -> bool:
+        return cell in self._dead_cells
+
+    def is_deadlock(self, glass_cell: int, glass_cells) -> bool:
+        """Check whether the glass just pushed onto glass_cell causes a deadlock."""
+        if glass_cell in self._dead_cells:
+            return True
+        frozen = []
+        if not self._frozen(glass_cell, glass_cells, set(), frozen):
+            return False
+        return any(cell not in self._dest_cells for cell in frozen)
+
+    def _frozen(self, cell: int, glass_cells, path: set[int], frozen: list[int]) -> bool:
+        # glasses on the current path are treated as walls to break cycles
+        path.add(cell)
+        result = all(self._blocked(cell, axis, glass_cells, path, frozen) for axis in self._axes)
+        path.discard(cell)
+        if result:
+            frozen.append(cell)
+        return result
+
+    def _blocked(self, cell: int, axis, glass_cells, path: set[int], frozen: list[int]) -> bool:
+        before, after = axis[0][cell], axis[1][cell]
+        if before < 0 or after < 0 or before in path or after in path:
+            return True
+        if before in self._dead_cells and after in self._dead_cells:
+            return True
+        return any(neighbour in glass_cells and self._frozen(neighbour, glass_cells, path, frozen)
+                   for neighbour in (before, after))
@@ -0,0 +1,236 @@
+"""Generate solvable rooms by pulling glasses back from their dests, and score them with the solver.
+
+    python generator.py --count 1000 --rows 8 --cols 8 --glasses 2 --file generated.txt
+    python generator.py --count 200 --glasses 3 --min-pushes 8 --dir games/generated
+
+A room starts with every glass on a dest; the cat then makes random pulls,
+the reverse of pushes, so playing them backwards always solves the room.
+Each room is then solved for its optimal move count, that solution's
+pushes and the solver's branching factor. Rooms are generated in
+parallel and written out as they arrive, to a directory (one file per
+room) or a collection file (see levels.py).
+"""
+import argparse
+import multiprocessing
+import os
+import random
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from ai_solver import GameState, SokobanSolver, count_pushes, moves_to_text
+from constants import *
+from instrument import SearchProfile
+from levels import COMMENT, MemorySource
+from model import Model
+
+DELTAS = [info['delta'] for info in MOVE_DIRECTIONS.values()]
+
+
+class LevelSpec(NamedTuple):
+    rows: int = 8
+    cols: int = 8
+    glasses: int = 2
+    pulls: int = 40
+    walls: float = 0.2  # share of the interior turned into walls
+    min_pushes: int = 1  # target difficulty: pushes of the optimal solution
+    max_pushes: int = 0  # 0 for no upper bound
+    attempts: int = 20  # rooms tried per seed before giving up
+    method: str = 'solve_astar'  # SokobanSolver method used to score, should be move optimal
+
+
+class GeneratedLevel(NamedTuple):
+    name: str
+    tiles: list[str]
+    moves: int  # length of the solution found by spec.method
+    pushes: int
+    branching: float  # children generated per expanded state
+    nodes: int
+    solution: str  # moves_to_text of the solution
+    seed: int
+
+
+def _neighbours(pos: tuple[int, int]) -> Iterator[tuple[int, int]]:
+    for delta in DELTAS:
+        yield pos[0] + delta[0], pos[1] + delta[1]
+
+
+def _reachable(start: tuple[int, int], floor: set[tuple[int, int]], blocked=frozenset()) -> set[tuple[int, int]]:
+    """Floor cells the cat can walk to from start without crossing blocked ones."""
+    seen, todo = {start}, [start]
+    while todo:
+        for pos in _neighbours(todo.pop()):
+            if pos in floor and pos not in blocked and pos not in seen:
+                seen.add(pos)
+                todo.append(pos)
+    return seen
+
+
+def carve_floor(rng: random.Random, rows: int, cols: int, walls: float) -> set[tuple[int, int]]:
+    """Interior cells of a walled room, with about `walls` of them turned into walls while staying connected."""
+    floor = {(i, j) for i in range(1, rows - 1) for j in range(1, cols - 1)}
+    candidates = sorted(floor)
+    rng.shuffle(candidates)
+    target = len(floor) - int(len(floor) * walls)
+    for pos in candidates:
+        if len(floor) <= target:
+            break
+        floor.discard(pos)
+        rest = next(iter(floor))
+        if len(_reachable(rest, floor)) != len(floor):
+            floor.add(pos)
+    return floor
+
+
+def pull_glasses(rng: random.Random, floor: set[tuple[int, int]], dests: set[tuple[int, int]],
+                 pulls: int) -> Optional[tuple[tuple[int, int], set[tuple[int, int]]]]:
+    """(cat, glasses) after up to `pulls` random pulls from the solved room, or None if none was possible.
+
+    A pull takes the cat from beside a glass one cell further away and
+    drags the glass onto the cell it left. The cat finally walks to a
+    random free cell of its region, so no glass or the cat is on a dest.
+    """
+    glasses = set(dests)
+    free = sorted(floor - dests)
+    if not free:
+        return None
+    cat = rng.choice(free)
+    made = 0
+    for _ in range(pulls):
+        reachable = _reachable(cat, floor, glasses)
+        options = []
+        for glass in glasses:
+            for delta in DELTAS:
+                stand = glass[0] + delta[0], glass[1] + delta[1]
+                to = stand[0] + delta[0], stand[1] + delta[1]
+                if stand in reachable and to in floor and to not in glasses:
+                    options.append((glass, stand, to))
+        if not options:
+            break
+        glass, stand, cat = rng.choice(sorted(options))
+        glasses.remove(glass)
+        glasses.add(stand)
+        made += 1
+    # the text format cannot show a glass or the cat standing on a dest
+    ends = sorted(_reachable(cat, floor, glasses) - dests)
+    if not made or glasses & dests or not ends:
+        return None
+    return rng.choice(ends), glasses
+
+
+def render(rows: int, cols: int, floor: set[tuple[int, int]], dests: set[tuple[int, int]],
+           glasses: set[tuple[int, int]], cat: tuple[int, int]) -> list[str]:
+    symbols = {**{pos: DEST for pos in dests}, **{pos: GLASS for pos in glasses}, cat: CAT}
+    return [''.join(symbols.get((i, j), EMPTY if (i, j) in floor else WALL) for j in range(cols))
+            for i in range(rows)]
+
+
+def score_level(tiles: list[str], method: str = 'solve_astar') -> Optional[dict]:
+    """Solve a room and describe its difficulty; None if it has no solution."""
+    model = Model(MemorySource([('room', tiles)]))
+    profile = SearchProfile()
+    solver = SokobanSolver(model, profile=profile)
+    solution = getattr(solver, method)()
+    if solution is None:
+        return None
+    counters = profile.counters
+    children = sum(profile.frontier_by_depth.values()) + counters['duplicates'] + solver.stats.pruned
+    return {'moves': len(solution), 'pushes': count_pushes(GameState.from_model(model), solution),
+            'branching': children / counters['expansions'] if counters['expansions'] else 0.0,
+            'nodes': solver.stats.nodes_expanded, 'solution': moves_to_text(solution)}
+
+
+def generate_level(spec: LevelSpec, seed: int) -> Optional[GeneratedLevel]:
+    """The first room from seed whose optimal solution has a push count within the spec; None if none is."""
+    rng = random.Random(seed)
+    for _ in range(spec.attempts):
+        floor = carve_floor(rng, spec.rows, spec.cols, spec.walls)
+        if len(floor) < 2 * spec.glasses + 1:
+            continue
+        dests = set(rng.sample(sorted(floor), spec.glasses))
+        pulled = pull_glasses(rng, floor, dests, spec.pulls)
+        if pulled is None:
+            continue
+        cat, glasses = pulled
+        tiles = render(spec.rows, spec.cols, floor, dests, glasses, cat)
+        score = score_level(tiles, spec.method)
+        if score is None:
+            continue  # pulling never makes an unsolvable room, but a depth limited method may miss it
+        if score['pushes'] < spec.min_pushes or spec.max_pushes and score['pushes'] > spec.max_pushes:
+            continue
+        return GeneratedLevel(f'gen{seed:06d}', tiles, seed=seed, **score)
+    return None
+
+
+def _generate_seed(job: tuple[LevelSpec, int]) -> Optional[GeneratedLevel]:
+    return generate_level(*job)
+
+
+def generate_levels(spec: LevelSpec, count: int, seed: int = 0, workers: int = 0) -> Iterator[GeneratedLevel]:
+    """Rooms for seeds seed .. seed + count - 1, in seed order, generated by `workers` processes.
+
+    Seeds that yield no room within spec.attempts are skipped. workers=1
+    generates in this process; 0 uses one process per core.
+    """
+    jobs = ((spec, num) for num in range(seed, seed + count))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        levels = map(_generate_seed, jobs)
+        yield from (level for level in levels if level is not None)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for level in pool.imap(_generate_seed, jobs, chunksize=16):
+            if level is not None:
+                yield level
+
+
+def write_directory(levels: Iterable[GeneratedLevel], game_dir: str) -> Iterator[GeneratedLevel]:
+    """Write each room to <game_dir>/<name>.txt as it arrives, passing it on."""
+    os.makedirs(game_dir, exist_ok=True)
+    for level in levels:
+        with open(os.path.join(game_dir, level.name + '.txt'), 'w') as room_file:
+            room_file.write('\n'.join(level.tiles) + '\n')
+        yield level
+
+
+def write_collection(levels: Iterable[GeneratedLevel], path: str) -> Iterator[GeneratedLevel]:
+    """Append each room, named by a comment line, to the collection file at path as it arrives."""
+    with open(path, 'a') as collection:
+        for level in levels:
+            collection.write(f'{COMMENT} {level.name}\n' + '\n'.join(level.tiles) + '\n\n')
+            collection.flush()
+            yield level
+
+
+def main() -> None:
+    defaults = LevelSpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100, help='seeds to try, one room at most per seed')
+    parser.add_argument('--seed', type=int, default=0, help='first seed')
+    parser.add_argument('--rows', type=int, default=defaults.rows)
+    parser.add_argument('--cols', type=int, default=defaults.cols)
+    parser.add_argument('--glasses', type=int, default=defaults.glasses)
+    parser.add_argument('--pulls', type=int, default=defaults.pulls)
+    parser.add_argument('--walls', type=float, default=defaults.walls)
+    parser.add_argument('--min-pushes', type=int, default=defaults.min_pushes)
+    parser.add_argument('--max-pushes', type=int, default=defaults.max_pushes, help='0 for no limit')
+    parser.add_argument('--attempts', type=int, default=defaults.attempts)
+    parser.add_argument('--method', default=defaults.method, help='SokobanSolver method used to score')
+    parser.add_argument('--workers', type=int, default=0, help='processes, default: one per core')
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--dir', help='write one file per room to this directory')
+    output.add_argument('--file', help='append the rooms to this collection file')
+    args = parser.parse_args()
+
+    spec = LevelSpec(args.rows, args.cols, args.glasses, args.pulls, args.walls, args.min_pushes,
+                     args.max_pushes, args.attempts, args.method)
+    levels = generate_levels(spec, args.count, args.seed, args.workers)
+    if args.dir:
+        levels = write_directory(levels, args.dir)
+    elif args.file:
+        levels = write_collection(levels, args.file)
+    for level in levels:
+        print(f'{level.name}  moves {level.moves:4d}  pushes {level.pushes:3d}  '
+              f'branching {level.branching:.2f}  nodes {level.nodes}')
+
+
+if __name__ == "__main__":
+    main()
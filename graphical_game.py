@@ -1,12 +1,13 @@
 import model
 import view
 import controller
+import solution_db
 from constants import *
 import tkinter as tk
 
 def main() -> None:
     root = tk.Tk()
-    game_model = model.Model(DEFAULT_GAMES)
+    game_model = model.Model(DEFAULT_GAMES, solutions=solution_db.SolutionDB())
     runner = controller.GraphicalController(game_model, view.GraphicalView(root), root)
     runner.play()
     root.mainloop()
@@ -0,0 +1,152 @@
+from ai_solver import GameState, moves_to_text, text_to_moves
+from model import Model, Room
+from levels import cache_path, source_key
+from collections import OrderedDict
+import json
+import os
+import sys
+from typing import Optional
+
+# rough size of one cached suffix: its dict slot, key tuple and glass frozenset
+_ENTRY_BYTES = sys.getsizeof((None, None, None)) + sys.getsizeof(frozenset()) + 100
+
+
+def hint_path(game_dir: str, room_name: str) -> str:
+    """File that persists the hints of one level, e.g. ~/.cache/sokoban/hints/default-<digest>/room1.txt.json."""
+    return cache_path('hints', source_key(game_dir), room_name + '.json')
+
+
+class SolutionCache:
+    """Optimal solutions of rooms, looked up from any state along them.
+
+    A stored plan registers every state it passes through, so a player who
+    follows a hint finds the next one in O(1). Plans are evicted least
+    recently used first once their estimated size exceeds budget_bytes.
+    States are keyed by the room fingerprint, the cat position and the
+    unordered set of glass positions.
+    """
+
+    def __init__(self, budget_bytes: int = 1 << 22) -> None:
+        self.budget_bytes = budget_bytes
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()  # plan id -> (key of its start, moves, keys it registered)
+        self._entries = {}  # state key -> (plan id, offset into the plan's moves)
+        self._size = 0
+        self._next_id = 0
+
+    @staticmethod
+    def _key(state: GameState) -> tuple:
+        return state.index.get_fingerprint(), state.cat_pos, frozenset(state.glass_positions)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_size(self) -> int:
+        """Estimated bytes held by the cached plans."""
+        return self._size
+
+    def store(self, state: GameState, moves: list[tuple[int, int]]) -> None:
+        """Remember that moves is an optimal solution from state.
+
+        Raises ValueError, leaving the cache unchanged, if a move is not legal.
+        """
+        start = self._key(state)
+        offsets = {}  # key of every state along the plan -> its first offset
+        for offset in range(len(moves) + 1):
+            offsets.setdefault(self._key(state), offset)
+            if offset < len(moves):
+                state = state.try_move(moves[offset])
+                if state is None:
+                    raise ValueError(f'move {offset} of the plan is not legal')
+
+        plan_id = self._next_id
+        self._next_id += 1
+        # a state already on another plan keeps that entry: both are optimal
+        keys = [key for key in offsets if key not in self._entries]
+        for key in keys:
+            self._entries[key] = (plan_id, offsets[key])
+        self._plans[plan_id] = (start, moves, keys)
+        self._size += len(keys) * _ENTRY_BYTES + sys.getsizeof(moves)
+        self._evict()
+
+    def lookup(self, state: GameState) -> Optional[list[tuple[int, int]]]:
+        """Optimal moves from state to the goal, or None if state is not on a cached plan."""
+        entry = self._entries.get(self._key(state))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        plan_id, offset = entry
+        self._plans.move_to_end(plan_id)
+        return list(self._plans[plan_id][1][offset:])
+
+    def hint(self, state: GameState) -> Optional[tuple[int, int]]:
+        """Next move of the cached plan through state, or None if unknown or already solved."""
+        entry = self._entries.get(self._key(state))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        plan_id, offset = entry
+        self._plans.move_to_end(plan_id)
+        moves = self._plans[plan_id][1]
+        return moves[offset] if offset < len(moves) else None
+
+    def known(self, state: GameState) -> Optional[list[tuple[int, int]]]:
+        """Like lookup, without touching the counters; for seeding solve_bfs_seeded."""
+        entry = self._entries.get(self._key(state))
+        if entry is None:
+            return None
+        plan_id, offset = entry
+        return self._plans[plan_id][1][offset:]
+
+    def _evict(self) -> None:
+        while self._size > self.budget_bytes and len(self._plans) > 1:
+            _, (_, moves, keys) = self._plans.popitem(last=False)
+            for key in keys:
+                del self._entries[key]
+            self._size -= len(keys) * _ENTRY_BYTES + sys.getsizeof(moves)
+
+    def save(self, path: str, room: Room) -> None:
+        """Write the plans of room to path as JSON."""
+        fingerprint = room.get_index().get_fingerprint()
+        plans = []
+        for (room_fingerprint, cat_pos, glass_positions), moves, _ in self._plans.values():
+            if room_fingerprint == fingerprint:
+                plans.append({'cat': list(cat_pos), 'glasses': sorted(map(list, glass_positions)),
+                              'moves': moves_to_text(moves)})
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as hint_file:
+            json.dump({'fingerprint': fingerprint, 'plans': plans}, hint_file)
+
+    def load(self, path: str, room: Room) -> int:
+        """Read plans saved for room; returns how many were loaded.
+
+        A missing file or one saved for a different layout loads nothing, and
+        a plan that does not replay from its start is skipped.
+        """
+        try:
+            with open(path) as hint_file:
+                saved = json.load(hint_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+        if saved.get('fingerprint') != room.get_index().get_fingerprint():
+            return 0
+        loaded = 0
+        for plan in saved['plans']:
+            start = GameState(tuple(plan['cat']), frozenset(map(tuple, plan['glasses'])), room)
+            try:
+                self.store(start, text_to_moves(plan['moves']))
+            except (KeyError, ValueError):
+                continue
+            loaded += 1
+        return loaded
+
+    def load_model(self, model: Model) -> int:
+        """Load the persisted hints of the model's current room."""
+        return self.load(hint_path(model.get_game_dir(), model.get_room_name()), model.get_room())
+
+    def save_model(self, model: Model) -> None:
+        """Persist the hints of the model's current room."""
+        self.save(hint_path(model.get_game_dir(), model.get_room_name()), model.get_room())
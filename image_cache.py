@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class ImageCache:
+    """Process-wide cache of scaled sprites keyed by (image name, tile size).
+
+    Each source image is decoded once by load(name) and each size is made
+    once by scale(source, size); the scaled images are evicted least
+    recently used first beyond capacity entries. The cache is independent
+    of the imaging library, which the view passes in.
+    """
+
+    def __init__(self, load: Callable[[str], object], scale: Callable[[object, tuple[int, int]], object],
+                 capacity: int = 64) -> None:
+        self._load = load
+        self._scale = scale
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._sources = {}
+        self._scaled = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._scaled)
+
+    def get(self, name: str, size: tuple[int, int]) -> object:
+        key = (name, size)
+        image = self._scaled.get(key)
+        if image is not None:
+            self.hits += 1
+            self._scaled.move_to_end(key)
+            return image
+        self.misses += 1
+        if name not in self._sources:
+            self._sources[name] = self._load(name)
+        image = self._scaled[key] = self._scale(self._sources[name], size)
+        while len(self._scaled) > self.capacity:
+            self._scaled.popitem(last=False)
+        return image
+
+    def get_all(self, names: dict[Hashable, str], size: tuple[int, int]) -> dict[Hashable, object]:
+        """Scaled images of a {symbol: image name} table."""
+        return {symbol: self.get(name, size) for symbol, name in names.items()}
+
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'sources': len(self._sources), 'scaled': len(self)}
+
+    def clear(self) -> None:
+        self._sources.clear()
+        self._scaled.clear()
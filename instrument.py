@@ -0,0 +1,102 @@
+"""Opt-in instrumentation for SokobanSolver searches and Model moves.
+
+Attach a SearchProfile with SokobanSolver(model, profile=...) or
+Model.set_profile(...). Instrumented code checks `profile is not None`
+before touching it, so leaving profiling off costs one comparison per hook.
+"""
+from collections import Counter
+from contextlib import contextmanager
+import cProfile
+import json
+import time
+from typing import Callable, Optional
+
+
+class SearchProfile:
+    """Counters, timers and a per-depth frontier histogram.
+
+    Counters used by the solver are 'expansions', 'duplicates' (children
+    already visited), 'pushes' (new children that push a glass) and
+    'goal_checks'; the Model counts 'moves', 'pushes', 'blocked' and
+    'goal_checks'. Timers are seconds by name: 'heuristic' in solve_astar
+    and solve_idastar, 'known' (seed lookups) in solve_bfs_seeded, and the
+    method name under profile_solve. frontier_by_depth maps a search depth
+    (moves, or pushes for solve_pushes; the backward side of
+    solve_bidirectional counts down from -1) to the number of new states
+    found at that depth, and peak_visited is the largest visited set.
+    """
+
+    def __init__(self, callback: Optional[Callable[['SearchProfile'], None]] = None, every: int = 10000) -> None:
+        """callback, if given, is called with this profile every `every` expansions."""
+        self.callback = callback
+        self.every = every
+        self.reset()
+
+    def reset(self) -> None:
+        self.counters = Counter()
+        self.timers = Counter()
+        self.frontier_by_depth = Counter()
+        self.peak_visited = 0
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def expanded(self, amount: int = 1) -> None:
+        """Count expansions, reporting to the callback each time another `every` of them are done."""
+        before = self.counters['expansions']
+        self.counters['expansions'] = before + amount
+        if self.callback is not None and (before + amount) // self.every > before // self.every:
+            self.callback(self)
+
+    def frontier(self, depth: int, amount: int = 1) -> None:
+        self.frontier_by_depth[depth] += amount
+
+    def visited(self, size: int) -> None:
+        if size > self.peak_visited:
+            self.peak_visited = size
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.timers[name] += seconds
+
+    @contextmanager
+    def timer(self, name: str):
+        """Add the time spent in the with block to timer name."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timers[name] += time.perf_counter() - start
+
+    def as_dict(self) -> dict[str, object]:
+        return {'counters': dict(self.counters), 'timers': dict(self.timers),
+                'frontier_by_depth': {depth: self.frontier_by_depth[depth] for depth in sorted(self.frontier_by_depth)},
+                'peak_visited': self.peak_visited}
+
+    def dump(self, path: str) -> None:
+        with open(path, 'w') as profile_file:
+            json.dump(self.as_dict(), profile_file, indent=2)
+
+    def __repr__(self) -> str:
+        return f'SearchProfile({self.as_dict()})'
+
+
+def profile_solve(solver, method: str = 'solve_bfs', prefix: Optional[str] = None):
+    """Run solver.<method>() with a SearchProfile and cProfile attached; returns (solution, profile).
+
+    With prefix, the cProfile statistics are written to <prefix>.pstats
+    (for snakeviz, gprof2dot or a flame graph converter) and the profile
+    counters to <prefix>.json, so both describe the same run.
+    """
+    profile = solver.profile or SearchProfile()
+    solver.profile = profile
+    profiler = cProfile.Profile()
+    with profile.timer(method):
+        profiler.enable()
+        try:
+            solution = getattr(solver, method)()
+        finally:
+            profiler.disable()
+    if prefix is not None:
+        profiler.dump_stats(prefix + '.pstats')
+        profile.dump(prefix + '.json')
+    return solution, profile
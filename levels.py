@@ -0,0 +1,186 @@
+"""Sources of room layouts: a directory with one file per room, one file holding many rooms,
+or rooms held in memory.
+
+A collection file lists rooms in the usual text format, separated by blank
+lines. A comment line starting with ';' before a room names it, e.g.
+
+    ; corridor
+    +++
+    C +
+    +G+
+    +0+
+    +++
+"""
+from abc import ABC, abstractmethod
+import hashlib
+import json
+import os
+from typing import Iterator, Optional
+
+from constants import CACHE_NAME
+
+COMMENT = ';'
+
+
+def cache_path(*parts: str) -> str:
+    """Path of a runtime file (index, hints, solutions) in $XDG_CACHE_HOME/sokoban, else ~/.cache/sokoban."""
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, CACHE_NAME, *parts)
+
+
+def source_key(path: str) -> str:
+    """Cache name of a game directory or collection file: its base name and a digest of its absolute path."""
+    path = os.path.abspath(path)
+    return f'{os.path.basename(path)}-{hashlib.sha1(path.encode()).hexdigest()[:12]}'
+
+
+class LevelSource(ABC):
+    """Random access to the rooms of a game, loading each one only when asked for."""
+
+    path = ''
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def name(self, num: int) -> str:
+        ...
+
+    @abstractmethod
+    def load(self, num: int) -> list[str]:
+        """Rows of room num."""
+
+    def __iter__(self) -> Iterator[tuple[str, list[str]]]:
+        """(name, rows) of every room in order, one room in memory at a time."""
+        for num in range(len(self)):
+            yield self.name(num), self.load(num)
+
+
+class DirectorySource(LevelSource):
+    """One room per file; rooms are played in file name order, hidden files are skipped."""
+
+    def __init__(self, game_dir: str, rooms: Optional[list[str]] = None) -> None:
+        self.path = game_dir
+        if rooms is None:
+            with os.scandir(game_dir) as entries:
+                rooms = sorted(entry.name for entry in entries
+                               if entry.is_file() and not entry.name.startswith('.'))
+        self._rooms = list(rooms)
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def name(self, num: int) -> str:
+        return self._rooms[num]
+
+    def load(self, num: int) -> list[str]:
+        with open(os.path.join(self.path, self._rooms[num])) as room_file:
+            return [row.rstrip('\n') for row in room_file]
+
+
+class CollectionSource(LevelSource):
+    """Rooms of a single multi-level file, located through a persistent offset index.
+
+    The first open scans the file once and saves (name, byte offset) of
+    every room in the user cache (see cache_path); later opens read
+    that index, so loading room N is one seek and one parse whatever the
+    size of the collection. The index is rebuilt when the file changes.
+    """
+
+    def __init__(self, path: str, rooms: Optional[list[str]] = None) -> None:
+        self.path = path
+        entries = self._read_index()
+        if rooms is not None:
+            offsets = {}
+            for name, offset in entries:
+                offsets.setdefault(name, offset)
+            entries = [(name, offsets[name]) for name in rooms]
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def name(self, num: int) -> str:
+        return self._entries[num][0]
+
+    def load(self, num: int) -> list[str]:
+        with open(self.path, 'rb') as collection:
+            collection.seek(self._entries[num][1])
+            rows = []
+            for line in collection:
+                row = line.decode().rstrip('\r\n')
+                if not row or row.startswith(COMMENT):
+                    break
+                rows.append(row)
+        return rows
+
+    def index_path(self) -> str:
+        return cache_path('index', source_key(self.path) + '.json')
+
+    def _read_index(self) -> list[tuple[str, int]]:
+        status = os.stat(self.path)
+        signature = [status.st_size, status.st_mtime_ns]
+        try:
+            with open(self.index_path()) as index_file:
+                index = json.load(index_file)
+            if index['signature'] == signature:
+                return [tuple(entry) for entry in index['rooms']]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+        entries = self._scan()
+        try:
+            os.makedirs(os.path.dirname(self.index_path()), exist_ok=True)
+            with open(self.index_path(), 'w') as index_file:
+                json.dump({'signature': signature, 'rooms': entries}, index_file)
+        except OSError:
+            pass  # without a writable cache the collection is simply scanned on every open
+        return entries
+
+    def _scan(self) -> list[tuple[str, int]]:
+        """(name, byte offset of the first row) of every room in the file."""
+        entries = []
+        title, in_room, offset = None, False, 0
+        with open(self.path, 'rb') as collection:
+            for line in collection:
+                row = line.decode().rstrip('\r\n')
+                if row.startswith(COMMENT):
+                    title, in_room = row[1:].strip() or None, False
+                elif not row:
+                    in_room = False
+                elif not in_room:
+                    entries.append((title or f'level{len(entries) + 1}', offset))
+                    title, in_room = None, True
+                offset += len(line)
+        return entries
+
+
+class MemorySource(LevelSource):
+    """Rooms given as (name, rows), e.g. freshly generated ones, without touching the disk."""
+
+    def __init__(self, rooms: list[tuple[str, list[str]]]) -> None:
+        self._rooms = [(name, list(rows)) for name, rows in rooms]
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def name(self, num: int) -> str:
+        return self._rooms[num][0]
+
+    def load(self, num: int) -> list[str]:
+        return list(self._rooms[num][1])
+
+
+def open_levels(path: 'str | LevelSource', rooms: Optional[list[str]] = None) -> LevelSource:
+    """LevelSource for a game directory or a collection file; rooms picks and orders a subset by name.
+
+    A LevelSource is returned as it is, and then rooms must be None.
+    """
+    if isinstance(path, LevelSource):
+        if rooms is not None:
+            raise ValueError('rooms cannot be picked from an open LevelSource')
+        return path
+    if os.path.isdir(path):
+        return DirectorySource(path, rooms)
+    return CollectionSource(path, rooms)
@@ -1,8 +1,23 @@
 from constants import *
-import os
+from bitboard import BitBoard, BitState
+from canonical import CanonicalLevel, canonicalize
+from levels import LevelSource, open_levels
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Optional
+import hashlib
+import random
+
+
+# move journal codes: the low bits index JOURNAL_DELTAS, JOURNAL_PUSH marks a glass push
+JOURNAL_DELTAS = tuple(info['delta'] for info in MOVE_DIRECTIONS.values())
+JOURNAL_DIRECTION = 0b11
+JOURNAL_PUSH = 0b100
 
 
 class BasicTile:
+    __slots__ = ('_passable',)
     _symbol = EMPTY
 
     def __init__(self) -> None:
@@ -16,11 +31,14 @@ class BasicTile:
 
 
 class Empty(BasicTile):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__()
 
 
 class Wall(BasicTile):
+    __slots__ = ()
     _symbol = WALL
 
     def __init__(self) -> None:
@@ -29,6 +47,8 @@ class Wall(BasicTile):
 
 
 class Exit(Wall):
+    __slots__ = ('_text',)
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -38,6 +58,7 @@ class Exit(Wall):
 
 
 class Dest(BasicTile):
+    __slots__ = ('_filled',)
     _symbol = DEST
 
     def __init__(self) -> None:
@@ -46,6 +67,7 @@ class Dest(BasicTile):
 
 
 class MoveableEntity:
+    __slots__ = ('_row', '_col')
     _symbol = MOVEABLE_ENTITY
 
     def __init__(self, pos: tuple[int, int]) -> None:
@@ -63,6 +85,7 @@ class MoveableEntity:
 
 
 class Glass(MoveableEntity):
+    __slots__ = ('_symbol',)
 
     def __init__(self, pos: tuple[int, int]) -> None:
         super().__init__(pos)
@@ -76,6 +99,7 @@ class Glass(MoveableEntity):
 
 
 class Cat(MoveableEntity):
+    __slots__ = ('_max_tiredness', '_tiredness')
     _symbol = CAT
 
     def __init__(self,
@@ -89,25 +113,75 @@ class Cat(MoveableEntity):
         return self._tiredness > self._max_tiredness
 
 
+class GlassView(Mapping):
+    """Read-only mapping from (row, col) to Glass over a room's cell-keyed glasses."""
+    __slots__ = ('_glasses', '_num_cols')
+
+    def __init__(self, glasses: dict[int, Glass], num_cols: int) -> None:
+        self._glasses = glasses
+        self._num_cols = num_cols
+
+    def __getitem__(self, pos: tuple[int, int]) -> Glass:
+        row, col = pos
+        if not 0 <= col < self._num_cols:
+            raise KeyError(pos)
+        return self._glasses[row * self._num_cols + col]
+
+    def __contains__(self, pos) -> bool:
+        row, col = pos
+        return 0 <= col < self._num_cols and row * self._num_cols + col in self._glasses
+
+    def __iter__(self):
+        return (glass.get_pos() for glass in self._glasses.values())
+
+    def __len__(self) -> int:
+        return len(self._glasses)
+
+
 class Room:
+    """Tiles as one byte per cell, row-major, and glasses keyed by cell number.
+
+    Tiles carry no per-cell state, so get_tile returns one shared instance
+    per kind of tile and get_tiles builds the rows on demand. Walking
+    distance maps around the current glasses are cached per origin cell.
+    """
+    __slots__ = ('_dimension', '_grid', '_dest_cells', '_filled', '_glasses', '_glass_view', '_cat_start',
+                 '_index', '_bitboard', '_distance_maps')
     TILES = {WALL: Wall, EMPTY: Empty, DEST: Dest}
+    _TILE_CODES = {ord(symbol): tile() for symbol, tile in TILES.items()}
 
     def __init__(self, row: int, col: int) -> None:
         self._dimension = (row, col)
-        self._tiles = []
-        self._dest_filled = {}
+        self._grid = bytearray()
+        self._dest_cells = ()
+        self._filled = 0  # dests with a glass on them
         self._glasses = {}
+        self._glass_view = GlassView(self._glasses, col)
         self._cat_start = None
+        self._index = None
+        self._bitboard = None
+        self._distance_maps = OrderedDict()  # origin cell -> walking distance of every cell, LRU order
 
     def set_playground(self, tiles: list[str]):
-        self._tiles = [[self.TILES.get(tile, Empty)()
-                        for tile in row] for row in tiles]
-        self._dest_filled = {(i, j): False
-                             for i, row in enumerate(tiles) for j, col in enumerate(row) if col == DEST}
-        self._glasses = {(i, j): Glass((i, j))
-                         for i, row in enumerate(tiles) for j, col in enumerate(row) if col == GLASS}
-        self._cat_start = [(i, j)
-                           for i, row in enumerate(tiles) for j, col in enumerate(row) if col == CAT][0]
+        num_rows, num_cols = self._dimension
+        # cells missing from short rows are walls
+        self._grid = bytearray([ord(WALL)]) * (num_rows * num_cols)
+        self._glasses.clear()
+        cat_start = []
+        for i, row in enumerate(tiles[:num_rows]):
+            for j, symbol in enumerate(row[:num_cols]):
+                cell = i * num_cols + j
+                self._grid[cell] = ord(symbol if symbol in self.TILES else EMPTY)
+                if symbol == GLASS:
+                    self._glasses[cell] = Glass((i, j))
+                elif symbol == CAT:
+                    cat_start.append((i, j))
+        self._dest_cells = tuple(cell for cell, code in enumerate(self._grid) if code == ord(DEST))
+        self.update_dests()
+        self._cat_start = cat_start[0]
+        self._index = None
+        self._bitboard = None
+        self._distance_maps.clear()
 
     def get_dimension(self) -> tuple[int, int]:
         return self._dimension
@@ -115,45 +189,283 @@ class Room:
     def get_cat_start(self) -> tuple[int, int]:
         return self._cat_start
 
-    def get_glasses(self) -> dict[tuple[int, int], Glass]:
-        return self._glasses
+    def get_glasses(self) -> GlassView:
+        return self._glass_view
 
     def get_glass(self, row: int, col: int) -> Glass:
-        return self._glasses[(row, col)]
+        return self._glass_view[(row, col)]
 
-    def get_tile(self, row: int, col: int) -> str:
-        return self._tiles[row][col]
+    def get_tile(self, row: int, col: int) -> BasicTile:
+        return self._TILE_CODES[self._grid[self._to_cell(row, col)]]
 
     def get_tiles(self) -> list[list[BasicTile]]:
-        return self._tiles
+        num_rows, num_cols = self._dimension
+        tile_codes, grid = self._TILE_CODES, self._grid
+        return [[tile_codes[code] for code in grid[i * num_cols:(i + 1) * num_cols]] for i in range(num_rows)]
+
+    def _to_cell(self, row: int, col: int) -> int:
+        num_rows, num_cols = self._dimension
+        if not (0 <= row < num_rows and 0 <= col < num_cols):
+            raise IndexError(f'({row}, {col}) is outside the room')
+        return row * num_cols + col
 
     def move_glass(self, glass: Glass, delta: tuple[int, int]) -> None:
-        del self._glasses[glass.get_pos()]
+        """Move glass by delta, updating its broken state and the filled count from the two cells involved."""
+        source = self._to_cell(*glass.get_pos())
+        del self._glasses[source]
         glass.move(delta)
-        self._glasses[glass.get_pos()] = glass
+        target = self._to_cell(*glass.get_pos())
+        self._glasses[target] = glass
+        on_dest = self._grid[target] == ord(DEST)
+        self._filled += on_dest - (self._grid[source] == ord(DEST))
+        if on_dest:
+            glass.broken()
+        else:
+            glass.unbroken()
+        if self._distance_maps:
+            self._drop_distance_maps(source, target)
 
     def update_dests(self) -> None:
-        for k in self._dest_filled:
-            self._dest_filled[k] = True if k in self._glasses else False
-        for k in self._glasses:
-            if k in self._dest_filled:
-                self._glasses[k].broken()
+        """Recompute the broken state of every glass and the filled count from scratch.
+
+        move_glass keeps both up to date; this is only needed after the
+        glasses were changed some other way.
+        """
+        grid = self._grid
+        self._filled = 0
+        for cell, glass in self._glasses.items():
+            if grid[cell] == ord(DEST):
+                glass.broken()
+                self._filled += 1
             else:
-                self._glasses[k].unbroken()
+                glass.unbroken()
+
+    def get_filled_count(self) -> int:
+        return self._filled
 
     def all_filled(self) -> bool:
-        return all(self._dest_filled.values())
+        return self._filled == len(self._dest_cells)
 
     def tile_passable(self, row: int, col: int) -> bool:
-        return self._tiles[row][col].is_passable()
+        return self.get_tile(row, col).is_passable()
+
+    def get_distance_map(self, pos: tuple[int, int]) -> array:
+        """Fewest steps the cat needs between pos and every cell, by cell number; -1 where it cannot walk.
+
+        Glasses block the way, except one standing on pos itself. Maps are
+        cached until a push frees or fills a cell they could pass through.
+        """
+        origin = self._to_cell(*pos)
+        distances = self._distance_maps.get(origin)
+        if distances is not None:
+            self._distance_maps.move_to_end(origin)
+            return distances
+        steps, glasses = self.get_index().get_cell_steps(), self._glasses
+        distances = array('l', [-1]) * len(self._grid)
+        distances[origin] = 0
+        frontier, distance = [origin], 0
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for cell in frontier:
+                for step in steps:
+                    target = step[cell]
+                    if target >= 0 and distances[target] < 0 and target not in glasses:
+                        distances[target] = distance
+                        next_frontier.append(target)
+            frontier = next_frontier
+        self._distance_maps[origin] = distances
+        while len(self._distance_maps) > DISTANCE_MAP_CACHE_SIZE:
+            self._distance_maps.popitem(last=False)
+        return distances
+
+    def _drop_distance_maps(self, freed: int, filled: int) -> None:
+        """Forget the maps a glass moving from cell freed to cell filled can change."""
+        steps = self.get_index().get_cell_steps()
+        for origin, distances in list(self._distance_maps.items()):
+            if distances[filled] >= 0 or any(step[freed] >= 0 and distances[step[freed]] >= 0 for step in steps):
+                del self._distance_maps[origin]
+
+    def get_walk_distance(self, start: tuple[int, int], goal: tuple[int, int]) -> Optional[int]:
+        """Fewest steps from start to goal without pushing a glass, or None if there is no way."""
+        if not self.tile_passable(*goal) or self._to_cell(*goal) in self._glasses:
+            return None
+        distance = self.get_distance_map(goal)[self._to_cell(*start)]
+        return distance if distance >= 0 else None
+
+    def walk_path(self, start: tuple[int, int], goal: tuple[int, int]) -> Optional[list[tuple[int, int]]]:
+        """Shortest list of deltas from start to goal without pushing a glass, or None if there is no way."""
+        if self.get_walk_distance(start, goal) is None:
+            return None
+        distances = self.get_distance_map(goal)
+        steps = self.get_index().get_cell_steps()
+        cell, path = self._to_cell(*start), []
+        while distances[cell]:
+            # MOVE_DIRECTIONS order, so ties break the same way every time
+            code = next(code for code, step in enumerate(steps)
+                        if step[cell] >= 0 and distances[step[cell]] == distances[cell] - 1)
+            path.append(JOURNAL_DELTAS[code])
+            cell = steps[code][cell]
+        return path
+
+    def get_index(self) -> 'RoomIndex':
+        """Return the static index of this room, building it on first use."""
+        if self._index is None:
+            self._index = RoomIndex(self)
+        return self._index
+
+    def get_bitboard(self) -> BitBoard:
+        """Return the static bitboard layout of this room, building it on first use."""
+        if self._bitboard is None:
+            self._bitboard = BitBoard(self)
+        return self._bitboard
+
+
+class RoomIndex:
+    """Immutable lookup tables for the static layout (walls and dests) of a room.
+
+    Cells are numbered row-major, so cell = row * num_cols + col.
+    """
+    __slots__ = ('_dimension', '_passable', '_dests', '_dest_cells', '_steps', '_cell_steps',
+                 '_push_distances', '_zobrist_keys', '_fingerprint')
+
+    def __init__(self, room: Room) -> None:
+        num_rows, num_cols = room.get_dimension()
+        tiles = room.get_tiles()
+        passable = [False] * (num_rows * num_cols)
+        dests = set()
+        for i, row in enumerate(tiles[:num_rows]):
+            for j, tile in enumerate(row[:num_cols]):
+                passable[i * num_cols + j] = tile.is_passable()
+                if tile.get_text() == DEST:
+                    dests.add((i, j))
+        self._dimension = (num_rows, num_cols)
+        self._passable = tuple(passable)
+        self._dests = frozenset(dests)
+        self._dest_cells = frozenset(i * num_cols + j for i, j in dests)
+
+        # neighbour table: (pos, delta) -> passable neighbour, or None when
+        # the step leaves the room or runs into a wall
+        deltas = [info['delta'] for info in MOVE_DIRECTIONS.values()]
+        self._steps = {}
+        for i in range(num_rows):
+            for j in range(num_cols):
+                for delta in deltas:
+                    target_row, target_col = i + delta[0], j + delta[1]
+                    if 0 <= target_row < num_rows and 0 <= target_col < num_cols and \
+                            passable[target_row * num_cols + target_col]:
+                        self._steps[((i, j), delta)] = (target_row, target_col)
+                    else:
+                        self._steps[((i, j), delta)] = None
+
+        # the same table over cell numbers, one tuple per direction; -1 = blocked
+        self._cell_steps = tuple(
+            tuple(-1 if self._steps[(divmod(cell, num_cols), delta)] is None
+                  else self.to_cell(self._steps[(divmod(cell, num_cols), delta)])
+                  for cell in range(num_rows * num_cols))
+            for delta in deltas)
+        self._push_distances = None
+        self._zobrist_keys = None
+        self._fingerprint = None
 
+    def get_dimension(self) -> tuple[int, int]:
+        return self._dimension
 
-class Model:
-    def __init__(self, game_dir: str):
+    def get_dests(self) -> frozenset[tuple[int, int]]:
+        return self._dests
+
+    def get_dest_cells(self) -> frozenset[int]:
+        return self._dest_cells
+
+    def get_passable(self) -> tuple[bool, ...]:
+        return self._passable
+
+    def get_fingerprint(self) -> str:
+        """Stable hex digest of the static layout: dimension, walls and dests."""
+        if self._fingerprint is None:
+            layout = repr((self._dimension, self._passable, sorted(self._dest_cells)))
+            self._fingerprint = hashlib.sha1(layout.encode()).hexdigest()
+        return self._fingerprint
 
-        self._game_dir = game_dir
-        self._rooms = os.listdir(self._game_dir)
-        self._num_rooms = len(self._rooms)
+    def within_boundary(self, row: int, col: int) -> bool:
+        return 0 <= row < self._dimension[0] and 0 <= col < self._dimension[1]
+
+    def is_passable(self, row: int, col: int) -> bool:
+        return self.within_boundary(row, col) and self._passable[row * self._dimension[1] + col]
+
+    def to_cell(self, pos: tuple[int, int]) -> int:
+        return pos[0] * self._dimension[1] + pos[1]
+
+    def to_pos(self, cell: int) -> tuple[int, int]:
+        return divmod(cell, self._dimension[1])
+
+    def get_cell_steps(self) -> tuple[tuple[int, ...], ...]:
+        """Neighbour cells indexed as [direction][cell], in MOVE_DIRECTIONS order."""
+        return self._cell_steps
+
+    def get_push_distances(self) -> dict[int, tuple[Optional[int], ...]]:
+        """Fewest pushes to move a lone glass from each cell onto each dest cell.
+
+        Returns {dest cell: distances indexed by cell}, None where the dest
+        cannot be reached. Other glasses are ignored, so this is a lower bound.
+        """
+        if self._push_distances is None:
+            self._push_distances = {dest: self._pull_distances(dest) for dest in self._dest_cells}
+        return self._push_distances
+
+    def get_zobrist_keys(self) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        """Random 64-bit keys per cell, (glass keys, cat keys), for Zobrist hashing.
+
+        The generator is seeded so hashes are reproducible between runs.
+        """
+        if self._zobrist_keys is None:
+            generator = random.Random(ZOBRIST_SEED)
+            size = len(self._passable)
+            self._zobrist_keys = (tuple(generator.getrandbits(64) for _ in range(size)),
+                                  tuple(generator.getrandbits(64) for _ in range(size)))
+        return self._zobrist_keys
+
+    def _pull_distances(self, dest: int) -> tuple[Optional[int], ...]:
+        # walk backwards from the dest: a glass on `cell` arrived from `source`,
+        # pushed by a cat standing on `behind`
+        distances = [None] * len(self._passable)
+        distances[dest] = 0
+        queue = [dest]
+        deltas = [info['delta'] for info in MOVE_DIRECTIONS.values()]
+        opposites = [self._cell_steps[deltas.index((-delta[0], -delta[1]))] for delta in deltas]
+        for cell in queue:
+            for back in opposites:
+                source = back[cell]
+                if source < 0 or distances[source] is not None or back[source] < 0:
+                    continue
+                distances[source] = distances[cell] + 1
+                queue.append(source)
+        return tuple(distances)
+
+    def step(self, pos: tuple[int, int], delta: tuple[int, int]) -> Optional[tuple[int, int]]:
+        """Return the passable cell one step from pos, or None if blocked."""
+        return self._steps.get((pos, delta))
+
+
+class Model:
+    def __init__(self, game_dir: 'str | LevelSource', rooms: Optional[list[str]] = None,
+                 solutions: 'Optional[SolutionDB]' = None):
+        """Play the rooms of game_dir, a directory of room files, a collection file or a LevelSource.
+
+        rooms picks and orders a subset of them by name. solutions, if given,
+        is consulted for a stored solution of every room loaded.
+        """
+        self._levels = open_levels(game_dir, rooms)
+        self._game_dir = self._levels.path
+        self._solutions = solutions
+        self._tiles = None
+        self._canonical = None
+        self._known_solution = None
+        self._changes = None
+        self._journal = bytearray()  # one code per move: direction | JOURNAL_PUSH
+        self._journal_pos = 0  # moves before this position are played, the rest can be redone
+        self._profile = None
+        self._num_rooms = len(self._levels)
         self._cur_room_num = 0
         self._cur_room = None
         self._cat = None
@@ -162,15 +474,18 @@ class Model:
 
     def load_game(self) -> None:
         try:
-            with open(os.path.join(os.getcwd(), self._game_dir, self._rooms[self._cur_room_num])) as tiles:
-                cols = []
-                for col in tiles:
-                    cols.append(col.strip('\n'))
-                num_rows, num_cols = len(cols), len(cols[0])
-                room = Room(num_rows, num_cols)
-                room.set_playground(cols)
-                self._cat = Cat(room.get_cat_start())
-                self._cur_room = room
+            cols = self._levels.load(self._cur_room_num)
+            num_rows, num_cols = len(cols), max((len(row) for row in cols), default=0)
+            room = Room(num_rows, num_cols)
+            room.set_playground(cols)
+            self._cat = Cat(room.get_cat_start())
+            self._cur_room = room
+            self._tiles = cols
+            self._canonical = None
+            self._changes = None
+            self._journal = bytearray()
+            self._journal_pos = 0
+            self._known_solution = self._solutions.lookup(cols) if self._solutions is not None else None
         except (FileNotFoundError, IndexError) as e:
             print(f"Error loading game file: {e}")
             raise
@@ -182,7 +497,24 @@ class Model:
         self._skip_keyboard = not self._skip_keyboard
 
     def set_cat(self, cat_pos: tuple[int, int]) -> None:
+        """Put the cat at cat_pos; the move journal is cleared since this is no move."""
+        self._mark_changed(self._cat.get_pos(), cat_pos)
         self._cat = Cat(cat_pos)
+        self._journal.clear()
+        self._journal_pos = 0
+
+    def set_profile(self, profile: 'Optional[SearchProfile]') -> None:
+        """Count moves, pushes, blocked moves and goal checks into an instrument.SearchProfile; None stops."""
+        self._profile = profile
+
+    def pop_changes(self) -> Optional[set[tuple[int, int]]]:
+        """Cells whose cat or glass changed since the last call; None after a room was loaded."""
+        changes, self._changes = self._changes, set()
+        return changes
+
+    def _mark_changed(self, *positions: tuple[int, int]) -> None:
+        if self._changes is not None:
+            self._changes.update(positions)
 
     def get_num_rooms(self) -> int:
         return self._num_rooms
@@ -190,12 +522,48 @@ class Model:
     def get_cur_room_num(self) -> int:
         return self._cur_room_num
 
+    def get_game_dir(self) -> str:
+        return self._game_dir
+
+    def get_room_name(self) -> str:
+        return self._levels.name(self._cur_room_num)
+
+    def get_levels(self) -> LevelSource:
+        """The rooms of this game, loadable one at a time."""
+        return self._levels
+
     def get_cat(self) -> Cat:
         return self._cat
 
     def get_room(self) -> Room:
         return self._cur_room
 
+    def get_room_tiles(self) -> list[str]:
+        """Rows of the current room as read from its file."""
+        return self._tiles
+
+    def get_canonical(self) -> CanonicalLevel:
+        """Canonical form of the current room, shared by its rotated, mirrored and padded copies."""
+        if self._canonical is None:
+            self._canonical = canonicalize(self._tiles)
+        return self._canonical
+
+    def get_known_solution(self) -> 'Optional[SolutionRecord]':
+        """Stored solution of the current room from its start position, if any."""
+        return self._known_solution
+
+    def record_solution(self, moves: list[tuple[int, int]], pushes: int, method: str,
+                        seconds: float = 0.0, nodes_expanded: int = 0) -> None:
+        """Store a solution of the current room from its start position, if a store is attached."""
+        if self._solutions is None:
+            return
+        if self._solutions.record(self._tiles, moves, pushes, method, seconds, nodes_expanded):
+            self._known_solution = self._solutions.lookup(self._tiles)
+
+    def get_bit_state(self) -> BitState:
+        """Snapshot of the cat and glasses of the current room as bitboards."""
+        return BitState.from_model(self)
+
     def get_cur_dimension(self) -> tuple[int, int]:
         return self._cur_room.get_dimension()
 
@@ -205,6 +573,8 @@ class Model:
         self._skip_keyboard = True
 
     def room_messed(self) -> bool:
+        if self._profile is not None:
+            self._profile.count('goal_checks')
         return self._cur_room.all_filled()
 
     def all_room_messed(self) -> bool:
@@ -213,11 +583,11 @@ class Model:
     def attempt_push_glass(self, glass: Glass, delta: tuple[int, int]) -> None:
         row, col = glass.get_pos()
         target_row, target_col = row + delta[0], col + delta[1]
-        if self._cur_room.tile_passable(target_row, target_col) and \
-                (target_row, target_col) not in self._cur_room.get_glasses() and \
-                self.within_boundary(target_row, target_col):
+        if self.within_boundary(target_row, target_col) and \
+                self._cur_room.tile_passable(target_row, target_col) and \
+                (target_row, target_col) not in self._cur_room.get_glasses():
+            self._mark_changed((target_row, target_col))
             self._cur_room.move_glass(glass, delta)
-            self._cur_room.update_dests()
             return True
         return False
 
@@ -226,16 +596,92 @@ class Model:
         return 0 <= row < max_row and 0 <= col < max_col
 
     def move_cat(self, delta: tuple[int, int]) -> None:
+        """Move the cat, pushing a glass if there is one, and log the move; a new move drops the redo moves."""
+        code = self._step(delta)
+        profile = self._profile
+        if profile is not None:
+            profile.count('moves' if code is not None else 'blocked')
+            if code is not None and code & JOURNAL_PUSH:
+                profile.count('pushes')
+        if code is None:
+            return
+        del self._journal[self._journal_pos:]
+        self._journal.append(code)
+        self._journal_pos += 1
+
+    def _step(self, delta: tuple[int, int]) -> Optional[int]:
+        """Carry out one move; returns its journal code, or None if the move is blocked."""
         cur_row, cur_col = self._cat.get_pos()
         target_row, target_col = cur_row + delta[0], cur_col + delta[1]
-        target_tile = self._cur_room.get_tile(target_row, target_col)
-
-        if (not self.within_boundary(target_row, target_col)) or (not target_tile.is_passable()):
-            return
+        if not self.within_boundary(target_row, target_col) or \
+                not self._cur_room.tile_passable(target_row, target_col):
+            return None
 
         # move glass and the cat
+        code = JOURNAL_DELTAS.index(delta)
         if (target_row, target_col) in self._cur_room.get_glasses().keys():
-            if self.attempt_push_glass(self._cur_room.get_glass(target_row, target_col), delta):
-                self._cat.move(delta)
-        else:
-            self._cat.move(delta)
+            if not self.attempt_push_glass(self._cur_room.get_glass(target_row, target_col), delta):
+                return None
+            code |= JOURNAL_PUSH
+        self._cat.move(delta)
+        self._mark_changed((cur_row, cur_col), (target_row, target_col))
+        return code
+
+    def walk_to(self, pos: tuple[int, int]) -> bool:
+        """Walk the cat to pos along a shortest path that pushes nothing, one logged move per step.
+
+        Returns False, without moving, if pos cannot be reached that way.
+        """
+        if not self.within_boundary(*pos):
+            return False
+        path = self._cur_room.walk_path(self._cat.get_pos(), pos)
+        if path is None:
+            return False
+        for delta in path:
+            self.move_cat(delta)
+        return True
+
+    def undo(self) -> bool:
+        """Take back the last move, pulling back the glass it pushed; False if there is none."""
+        if self._journal_pos == 0:
+            return False
+        self._journal_pos -= 1
+        code = self._journal[self._journal_pos]
+        d_row, d_col = JOURNAL_DELTAS[code & JOURNAL_DIRECTION]
+        row, col = self._cat.get_pos()
+        if code & JOURNAL_PUSH:
+            glass_pos = (row + d_row, col + d_col)
+            self._mark_changed(glass_pos)
+            self._cur_room.move_glass(self._cur_room.get_glass(*glass_pos), (-d_row, -d_col))
+        self._cat.move((-d_row, -d_col))
+        self._mark_changed((row, col), (row - d_row, col - d_col))
+        return True
+
+    def redo(self) -> bool:
+        """Make the last undone move again; False if there is none."""
+        if self._journal_pos == len(self._journal):
+            return False
+        self._step(JOURNAL_DELTAS[self._journal[self._journal_pos] & JOURNAL_DIRECTION])
+        self._journal_pos += 1
+        return True
+
+    def go_to_move(self, num: int) -> None:
+        """Undo or redo until num moves of the journal are played; 0 restarts the room."""
+        while self._journal_pos > num and self.undo():
+            pass
+        while self._journal_pos < num and self.redo():
+            pass
+
+    def get_move_count(self) -> int:
+        """Moves played in the current room, not counting undone ones."""
+        return self._journal_pos
+
+    def get_history(self) -> list[tuple[int, int]]:
+        """Moves played in the current room; replaying them from the start reproduces the position."""
+        return [JOURNAL_DELTAS[code & JOURNAL_DIRECTION] for code in self._journal[:self._journal_pos]]
+
+    def replay(self, moves: list[tuple[int, int]]) -> None:
+        """Restart the room and play moves."""
+        self.go_to_move(0)
+        for move in moves:
+            self.move_cat(move)
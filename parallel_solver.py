@@ -0,0 +1,175 @@
+from ai_solver import SokobanSolver, GameState, StateCodec, TranspositionTable, SearchStats, SearchCancelled, MOVES
+from deadlock import DeadlockDetector
+from instrument import SearchProfile
+from model import Model, RoomIndex
+import multiprocessing
+import os
+from typing import Optional
+
+
+def _owner(zobrist: int, num_workers: int) -> int:
+    """Worker that owns a state; states are hash-partitioned by Zobrist key."""
+    return zobrist % num_workers
+
+
+def _worker(connection, index: RoomIndex, num_glasses: int, num_workers: int, prune_deadlocks: bool) -> None:
+    """Serve 'expand' and 'parent' requests for one shard of the visited set.
+
+    An expand request carries candidate states (key, zobrist, parent key,
+    parent zobrist, move code) owned by this worker. New ones are recorded
+    with their parent and expanded; their children are returned grouped by
+    owning worker, together with the goal key if one was reached and the
+    counts a SearchProfile needs (new states, duplicates, pushes, shard size).
+    """
+    codec = StateCodec(index, num_glasses)
+    steps = index.get_cell_steps()
+    glass_keys, cat_keys = codec.glass_keys, codec.cat_keys
+    goal_glasses = codec.pack(0, index.get_dest_cells()) >> codec.bits
+    detector = DeadlockDetector(index) if prune_deadlocks else None
+    parents = TranspositionTable()
+
+    while True:
+        command, payload = connection.recv()
+        if command == 'stop':
+            connection.close()
+            return
+        if command == 'parent':
+            key, zobrist = payload
+            connection.send(parents.get(zobrist, key))
+            continue
+
+        goal, expanded, pruned, added, duplicates, pushes = None, 0, 0, 0, 0, 0
+        outgoing = [[] for _ in range(num_workers)]
+        for key, zobrist, parent, parent_zobrist, code in payload:
+            if parents.contains(zobrist, key):
+                duplicates += 1
+                continue
+            parents.put(zobrist, key, (parent, parent_zobrist, code))
+            added += 1
+            if key >> codec.bits == goal_glasses:
+                goal = (key, zobrist)
+                continue
+
+            expanded += 1
+            cat_cell, glass_cells = codec.unpack(key)
+            glass_set = set(glass_cells)
+            glass_hash = zobrist ^ cat_keys[cat_cell]
+            for move, step in enumerate(steps):
+                target = step[cat_cell]
+                if target < 0:
+                    continue
+                if target in glass_set:
+                    glass_target = step[target]
+                    if glass_target < 0 or glass_target in glass_set:
+                        continue
+                    next_glasses = (glass_set - {target}) | {glass_target}
+                    if detector is not None and detector.is_deadlock(glass_target, next_glasses):
+                        pruned += 1
+                        continue
+                    next_hash = glass_hash ^ glass_keys[target] ^ glass_keys[glass_target]
+                    pushes += 1
+                else:
+                    next_glasses, next_hash = glass_set, glass_hash
+                next_zobrist = next_hash ^ cat_keys[target]
+                outgoing[_owner(next_zobrist, num_workers)].append(
+                    (codec.pack(target, next_glasses), next_zobrist, key, zobrist, move))
+        connection.send((goal, expanded, pruned, outgoing, (added, duplicates, pushes, len(parents))))
+
+
+class ParallelSolver(SokobanSolver):
+    """SokobanSolver with a level-synchronous BFS spread over worker processes."""
+
+    def __init__(self, model: Model, workers: Optional[int] = None, prune_deadlocks: bool = True,
+                 profile: Optional[SearchProfile] = None):
+        super().__init__(model, prune_deadlocks, profile=profile)
+        self.workers = workers or os.cpu_count() or 1
+
+    def solve_parallel(self) -> Optional[list[tuple[int, int]]]:
+        """Solve with a breadth-first search whose visited set is sharded across processes.
+
+        Each worker owns the states whose Zobrist key maps to it and expands
+        them; one round trip per worker per BFS level exchanges the children.
+        Returns a solution with the fewest moves, like solve_bfs.
+        """
+        self.stats = SearchStats('parallel')
+        initial_state = GameState.from_model(self.model)
+
+        if initial_state.is_solved():
+            return []
+        if not self._counts_match(initial_state):
+            return None
+
+        index = self.get_index()
+        num_glasses = len(initial_state.glass_positions)
+        codec = StateCodec(index, num_glasses)
+        start = codec.pack(index.to_cell(initial_state.cat_pos),
+                           [index.to_cell(pos) for pos in initial_state.glass_positions])
+
+        connections, processes = [], []
+        for _ in range(self.workers):
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker, args=(child_end, index, num_glasses, self.workers, self.prune_deadlocks),
+                daemon=True)
+            process.start()
+            connections.append(parent_end)
+            processes.append(process)
+
+        try:
+            routed = [[] for _ in range(self.workers)]
+            routed[_owner(initial_state.zobrist, self.workers)].append(
+                (start, initial_state.zobrist, None, None, 0))
+            stats = self.stats
+            profile = self.profile
+            depth = -1  # depth of the states routed in this round
+
+            while any(routed):
+                if self._cancelled:
+                    raise SearchCancelled()
+                stats.peak_frontier = max(stats.peak_frontier, sum(len(batch) for batch in routed))
+                for connection, batch in zip(connections, routed):
+                    connection.send(('expand', batch))
+                routed = [[] for _ in range(self.workers)]
+                goal = None
+                depth += 1
+                visited = 0
+                for connection in connections:
+                    worker_goal, expanded, pruned, outgoing, counts = connection.recv()
+                    stats.nodes_expanded += expanded
+                    stats.pruned += pruned
+                    if profile is not None:
+                        added, duplicates, pushes, shard_size = counts
+                        profile.expanded(expanded)
+                        profile.count('duplicates', duplicates)
+                        profile.count('pushes', pushes)
+                        profile.count('goal_checks', added)
+                        if depth:
+                            profile.frontier(depth, added)
+                        visited += shard_size
+                    goal = goal or worker_goal
+                    for owner, batch in enumerate(outgoing):
+                        routed[owner].extend(batch)
+                if profile is not None:
+                    profile.visited(visited)
+                if goal is not None:
+                    return self._trace_parallel(connections, *goal)
+
+            return None  # No solution found
+        finally:
+            for connection in connections:
+                connection.send(('stop', None))
+            for process in processes:
+                process.join()
+
+    def _trace_parallel(self, connections, key: int, zobrist: int) -> list[tuple[int, int]]:
+        """Follow parent pointers through the owning workers back to the start."""
+        path = []
+        while True:
+            connection = connections[_owner(zobrist, len(connections))]
+            connection.send(('parent', (key, zobrist)))
+            key, zobrist, code = connection.recv()
+            if key is None:
+                break
+            path.append(MOVES[code])
+        path.reverse()
+        return path
@@ -0,0 +1,79 @@
+from model import Cat, Room
+from constants import *
+from typing import Callable, Optional
+
+
+class CellRenderer:
+    """Retained-mode drawing of a room on a tkinter Canvas.
+
+    Every cell gets one tile item and one entity item, created once per
+    room; afterwards only the cells in a Model change set are reconfigured,
+    so the number of canvas items and the cost of a frame stay constant.
+    The canvas only needs create_image, itemconfigure and delete, so the
+    renderer can be driven without a display.
+    """
+
+    def __init__(self, canvas, image: Callable[[str], object]) -> None:
+        """image(symbol) returns the image of a tile or entity symbol at the current size."""
+        self._canvas = canvas
+        self._image = image
+        self._img_size = (0, 0)
+        self._room = None
+        self._entity_items = {}  # position -> canvas item of the cat or glass shown there
+        self._shown = {}  # position -> symbol of the entity shown there, None if hidden
+
+    def set_img_size(self, img_size: tuple[int, int]) -> None:
+        self._img_size = img_size
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Rebuild all canvas items on the next draw, e.g. after the images changed."""
+        self._room = None
+
+    def item_count(self) -> int:
+        return 2 * len(self._entity_items)
+
+    def draw(self, cat: Cat, room: Room, changes: Optional[set[tuple[int, int]]] = None) -> None:
+        """Show cat and room; changes lists the cells changed since the last draw, None for all."""
+        if changes is None or room is not self._room:
+            self._build(cat, room)
+            return
+        glasses = room.get_glasses()
+        cat_pos = cat.get_pos()
+        for pos in changes:
+            self._show_entity(pos, cat_pos, glasses)
+
+    def _build(self, cat: Cat, room: Room) -> None:
+        self._canvas.delete('all')
+        self._room = room
+        self._entity_items.clear()
+        self._shown.clear()
+        glasses = room.get_glasses()
+        cat_pos = cat.get_pos()
+        for i, row in enumerate(room.get_tiles()):
+            for j, tile in enumerate(row):
+                center = self.get_img_center((i, j))
+                self._canvas.create_image(*center, image=self._image(tile.get_text()))
+                self._entity_items[(i, j)] = self._canvas.create_image(*center, state='hidden')
+                self._shown[(i, j)] = None
+                self._show_entity((i, j), cat_pos, glasses)
+
+    def _show_entity(self, pos: tuple[int, int], cat_pos: tuple[int, int], glasses) -> None:
+        if pos == cat_pos:
+            symbol = CAT
+        elif pos in glasses:
+            symbol = glasses[pos].get_text()
+        else:
+            symbol = None
+        if symbol == self._shown[pos]:
+            return
+        self._shown[pos] = symbol
+        if symbol is None:
+            self._canvas.itemconfigure(self._entity_items[pos], state='hidden')
+        else:
+            self._canvas.itemconfigure(self._entity_items[pos], image=self._image(symbol), state='normal')
+
+    def get_img_center(self, position: tuple[int, int]) -> tuple[int, int]:
+        width, height = self._img_size
+        return int(position[1]*width + width/2), int(position[0]*height + height/2)
+
@@ -0,0 +1,108 @@
+"""Headless batch simulation of move strings, without a Model or any file I/O.
+
+Moves are strings of the keyboard characters of MOVE_DIRECTIONS ('w', 's',
+'a', 'd'), as written by ai_solver.moves_to_text, or lists of deltas.
+The rules are those of Model.move_cat: a move into a wall or out of the
+room is blocked and leaves the position unchanged, and a glass is pushed
+only onto a free passable cell.
+"""
+from model import Room, RoomIndex
+from constants import *
+from typing import NamedTuple, Optional, Union
+
+Moves = Union[str, list[tuple[int, int]]]
+
+_BLOCKED = 255
+# keyboard character -> index into RoomIndex.get_cell_steps(), _BLOCKED for anything else
+_CHAR_CODES = bytes(next((num for num, info in enumerate(MOVE_DIRECTIONS.values()) if ord(info['char']) == byte),
+                         _BLOCKED) for byte in range(256))
+_DELTA_CODES = {info['delta']: num for num, info in enumerate(MOVE_DIRECTIONS.values())}
+
+
+class SimResult(NamedTuple):
+    cat_pos: tuple[int, int]
+    glass_positions: frozenset[tuple[int, int]]
+    solved: bool
+    valid: bytes  # 1 for every move that was made, 0 for every blocked one
+
+    def num_valid(self) -> int:
+        return sum(self.valid)
+
+
+class Simulator:
+    """Plays move sequences on one room from its start, or from any given position."""
+
+    def __init__(self, room: Room) -> None:
+        index = room.get_index()
+        self._index = index
+        self._steps = index.get_cell_steps()
+        self._is_dest = bytearray(len(index.get_passable()))
+        for cell in index.get_dest_cells():
+            self._is_dest[cell] = 1
+        self._num_dests = len(index.get_dest_cells())
+        self._cat_start = index.to_cell(room.get_cat_start())
+        self._glass_start = [index.to_cell(pos) for pos in room.get_glasses()]
+
+    @classmethod
+    def from_tiles(cls, tiles: list[str]) -> 'Simulator':
+        """Simulator of a room given by its rows, e.g. one entry of a LevelSource."""
+        room = Room(len(tiles), max(len(row) for row in tiles))
+        room.set_playground(tiles)
+        return cls(room)
+
+    def get_index(self) -> RoomIndex:
+        return self._index
+
+    @staticmethod
+    def encode(moves: Moves) -> bytes:
+        """Moves as step table indexes, one byte per move; raises ValueError on an unknown move."""
+        if isinstance(moves, str):
+            codes = moves.encode().translate(_CHAR_CODES)
+        else:
+            codes = bytes(_DELTA_CODES.get(move, _BLOCKED) for move in moves)
+        if _BLOCKED in codes:
+            raise ValueError(f'unknown move in {moves!r}')
+        return codes
+
+    def run(self, moves: Moves, cat_pos: Optional[tuple[int, int]] = None, glass_positions=None) -> SimResult:
+        """Play moves from the start of the room, or from cat_pos and glass_positions."""
+        index = self._index
+        cat = self._cat_start if cat_pos is None else index.to_cell(cat_pos)
+        glasses = self._glass_start if glass_positions is None else [index.to_cell(pos) for pos in glass_positions]
+        occupied = bytearray(len(self._is_dest))
+        for cell in glasses:
+            occupied[cell] = 1
+        is_dest, steps = self._is_dest, self._steps
+        on_dest = sum(is_dest[cell] for cell in glasses)
+
+        valid = bytearray(len(moves))
+        for num, direction in enumerate(self.encode(moves)):
+            step = steps[direction]
+            target = step[cat]
+            if target < 0:
+                continue
+            if occupied[target]:
+                beyond = step[target]
+                if beyond < 0 or occupied[beyond]:
+                    continue
+                occupied[target] = 0
+                occupied[beyond] = 1
+                on_dest += is_dest[beyond] - is_dest[target]
+            cat = target
+            valid[num] = 1
+
+        glass_positions = frozenset(index.to_pos(cell) for cell, glass in enumerate(occupied) if glass)
+        return SimResult(index.to_pos(cat), glass_positions, on_dest == self._num_dests, bytes(valid))
+
+    def run_many(self, move_lists: list[Moves]) -> list[SimResult]:
+        """Play each move sequence from the start of the room."""
+        return [self.run(moves) for moves in move_lists]
+
+    def solves(self, moves: Moves) -> bool:
+        """Whether moves, played from the start, leave every dest filled."""
+        return self.run(moves).solved
+
+
+def run_rooms(rooms: list[list[str]], moves: Moves) -> list[SimResult]:
+    """Play one move sequence from the start of each room, given by its rows."""
+    return [Simulator.from_tiles(tiles).run(moves) for tiles in rooms]
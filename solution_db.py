@@ -0,0 +1,75 @@
+from ai_solver import moves_to_text, text_to_moves
+from canonical import canonicalize, restore_move, transform_move
+from constants import *
+from levels import cache_path
+import os
+import sqlite3
+from typing import NamedTuple, Optional
+
+# SokobanSolver methods whose solutions have the fewest moves; only these are worth storing
+MOVE_OPTIMAL_METHODS = frozenset({'solve_bfs', 'solve_bfs_compact', 'solve_bfs_seeded', 'solve_astar',
+                                  'solve_idastar', 'solve_bidirectional', 'solve_parallel'})
+
+
+def canonical_form(tiles: list[str]) -> tuple[str, tuple[bool, bool, bool]]:
+    """Fingerprint shared by all symmetric and padded variants of a room, and the symmetry to its canonical text."""
+    canonical = canonicalize(tiles)
+    return canonical.fingerprint, canonical.symmetry
+
+
+class SolutionRecord(NamedTuple):
+    moves: list[tuple[int, int]]
+    pushes: int
+    method: str
+    seconds: float
+    nodes_expanded: int
+
+
+class SolutionDB:
+    """Solutions of rooms stored in SQLite, keyed by the canonical hash of the room text.
+
+    Moves are kept in the canonical orientation, so one solve answers every
+    rotated, mirrored or padded copy of a room. A room keeps its shortest solution.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """Open or create the database at path, by default solutions.sqlite in the user cache."""
+        self.path = path or cache_path(SOLUTION_DB)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=30)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS solutions ('
+                'room_hash TEXT PRIMARY KEY, moves TEXT NOT NULL, pushes INTEGER NOT NULL, '
+                'method TEXT NOT NULL, seconds REAL NOT NULL, nodes_expanded INTEGER NOT NULL)')
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute('SELECT COUNT(*) FROM solutions').fetchone()[0]
+
+    def lookup(self, tiles: list[str]) -> Optional[SolutionRecord]:
+        """Stored solution of the room with these rows, in their orientation, or None."""
+        room_hash, symmetry = canonical_form(tiles)
+        row = self._connection.execute(
+            'SELECT moves, pushes, method, seconds, nodes_expanded FROM solutions WHERE room_hash = ?',
+            (room_hash,)).fetchone()
+        if row is None:
+            return None
+        moves = [restore_move(move, symmetry) for move in text_to_moves(row[0])]
+        return SolutionRecord(moves, *row[1:])
+
+    def record(self, tiles: list[str], moves: list[tuple[int, int]], pushes: int, method: str,
+               seconds: float = 0.0, nodes_expanded: int = 0) -> bool:
+        """Store a solution of the room; returns False if an equally short one is already stored."""
+        room_hash, symmetry = canonical_form(tiles)
+        text = moves_to_text([transform_move(move, symmetry) for move in moves])
+        with self._connection:
+            cursor = self._connection.execute(
+                'INSERT INTO solutions VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (room_hash) DO UPDATE SET moves = excluded.moves, pushes = excluded.pushes, '
+                'method = excluded.method, seconds = excluded.seconds, nodes_expanded = excluded.nodes_expanded '
+                'WHERE length(excluded.moves) < length(solutions.moves)',
+                (room_hash, text, pushes, method, seconds, nodes_expanded))
+        return cursor.rowcount > 0
@@ -0,0 +1,254 @@
+import os
+import tempfile
+import unittest
+import model
+import ai_solver
+import deadlock
+from levels import MemorySource
+
+
+def make_model(*rooms: list[str]) -> model.Model:
+    """Build a Model over the given rooms, held in memory as room1.txt, room2.txt, ..."""
+    return model.Model(MemorySource([(f'room{num + 1}.txt', tiles) for num, tiles in enumerate(rooms)]))
+
+
+def make_temp_dir(test: unittest.TestCase) -> str:
+    """A temporary directory that is removed once test finishes."""
+    temp_dir = tempfile.TemporaryDirectory()
+    test.addCleanup(temp_dir.cleanup)
+    return temp_dir.name
+
+
+def make_game_dir(test: unittest.TestCase, *rooms: list[str]) -> str:
+    """A temporary game directory holding the given rooms as room1.txt, room2.txt, ..., removed after test."""
+    game_dir = make_temp_dir(test)
+    for num, tiles in enumerate(rooms):
+        with open(os.path.join(game_dir, f'room{num + 1}.txt'), 'w') as room_file:
+            room_file.write('\n'.join(tiles))
+    return game_dir
+
+
+def replay(game: model.Model, moves: list[tuple[int, int]]) -> bool:
+    """Play moves on the model and report whether the room ends up messed."""
+    for move in moves:
+        game.move_cat(move)
+    return game.room_messed()
+
+
+BASIC_ROOM = ['+++',
+              'C +',
+              '+G+',
+              '+0+',
+              '+++']
+
+TWO_GLASS_ROOM = ['+++++',
+                  'C  0+',
+                  '+G G+',
+                  '+0  +',
+                  '+   +',
+                  '+   +',
+                  '+++++']
+
+THREE_GLASS_ROOM = ['+++++',
+                    'C  0+',
+                    '+G G+',
+                    '+0G0+',
+                    '+   +',
+                    '+   +',
+                    '+++++']
+
+LARGE_ROOM = ['++++++++++++',
+              '+C         +',
+              '+  G   G   +',
+              '+     0    +',
+              '+ 0  G   G +',
+              '+        0 +',
+              '+  G  0  G +',
+              '+ 0      0 +',
+              '+          +',
+              '++++++++++++']
+
+STUCK_ROOM = ['+++++',
+              '+C G+',
+              '+  0+',
+              '+++++']
+
+
+class TestSokobanSolver(unittest.TestCase):
+
+    def test_bfs_basic(self):
+        solver = ai_solver.SokobanSolver(make_model(BASIC_ROOM))
+        self.assertEqual([(0, 1), (1, 0)], solver.solve_bfs())
+
+    def test_bfs_no_solution(self):
+        self.assertIsNone(ai_solver.SokobanSolver(make_model(STUCK_ROOM)).solve_bfs())
+
+    def test_compact_matches_bfs(self):
+        for room in (BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM, STUCK_ROOM):
+            solver = ai_solver.SokobanSolver(make_model(room))
+            self.assertEqual(solver.solve_bfs(), solver.solve_bfs_compact())
+
+    def test_pushes_solves_room(self):
+        for room in (BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM):
+            game = make_model(room)
+            solution = ai_solver.SokobanSolver(game).solve_pushes()
+            self.assertTrue(replay(game, solution))
+
+    def test_pushes_no_solution(self):
+        self.assertIsNone(ai_solver.SokobanSolver(make_model(STUCK_ROOM)).solve_pushes())
+
+    def test_astar_optimal(self):
+        for room in (BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM):
+            game = make_model(room)
+            solver = ai_solver.SokobanSolver(game)
+            optimal = len(solver.solve_bfs())
+            for method in (solver.solve_astar, solver.solve_idastar):
+                solution = method()
+                self.assertEqual(optimal, len(solution))
+                self.assertTrue(replay(make_model(room), solution))
+
+    def test_astar_no_solution(self):
+        solver = ai_solver.SokobanSolver(make_model(STUCK_ROOM))
+        self.assertIsNone(solver.solve_astar())
+        self.assertIsNone(solver.solve_idastar())
+
+    def test_stats(self):
+        solver = ai_solver.SokobanSolver(make_model(THREE_GLASS_ROOM))
+        solver.solve_bfs()
+        bfs_expanded = solver.stats.nodes_expanded
+        solver.solve_astar()
+        self.assertEqual('astar', solver.stats.method)
+        self.assertLess(solver.stats.nodes_expanded, bfs_expanded)
+        self.assertGreater(solver.stats.peak_frontier, 0)
+
+    def test_pruning_keeps_bfs_solution(self):
+        for room in (BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM):
+            game = make_model(room)
+            pruned = ai_solver.SokobanSolver(game)
+            unpruned = ai_solver.SokobanSolver(game, prune_deadlocks=False)
+            self.assertEqual(unpruned.solve_bfs(), pruned.solve_bfs())
+        self.assertGreater(pruned.stats.pruned, 0)
+
+    def test_bidirectional_optimal(self):
+        for room in (BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM):
+            game = make_model(room)
+            solver = ai_solver.SokobanSolver(game)
+            optimal = len(solver.solve_bfs())
+            solution = solver.solve_bidirectional()
+            self.assertEqual(optimal, len(solution))
+            self.assertTrue(replay(game, solution))
+        self.assertIsNone(ai_solver.SokobanSolver(make_model(STUCK_ROOM)).solve_bidirectional())
+
+    def test_count_pushes(self):
+        game = make_model(THREE_GLASS_ROOM)
+        solution = ai_solver.SokobanSolver(game).solve_bfs()
+        self.assertEqual(5, ai_solver.count_pushes(ai_solver.GameState.from_model(game), solution))
+        self.assertEqual('dsdsdwsssaawdsdw', ai_solver.moves_to_text(solution))
+
+
+class TestDeadlockDetector(unittest.TestCase):
+
+    @staticmethod
+    def detector(room: list[str]) -> deadlock.DeadlockDetector:
+        return deadlock.DeadlockDetector(make_model(room).get_room().get_index())
+
+    def test_dead_cells(self):
+        # 7 columns: the whole top row is dead since nothing pushes a glass off
+        # the top wall; the dest (2, 5) and the bottom row leading to it are not
+        detector = self.detector(['+++++++',
+                                  '+C G  +',
+                                  '+    0+',
+                                  '+++++++'])
+        self.assertTrue(detector.is_dead_cell(8))
+        self.assertTrue(detector.is_dead_cell(12))
+        self.assertTrue(detector.is_dead_cell(10))
+        self.assertFalse(detector.is_dead_cell(19))
+        self.assertFalse(detector.is_dead_cell(17))
+
+    def test_freeze_block(self):
+        # two glasses side by side against the top wall cannot move
+        detector = self.detector(['++++++',
+                                  '+    +',
+                                  '+    +',
+                                  '+ 00 +',
+                                  '+C   +',
+                                  '++++++'])
+        self.assertTrue(detector.is_deadlock(8, {8, 9}))
+        self.assertFalse(detector.is_deadlock(14, {14, 15}))
+
+    def test_frozen_on_dests(self):
+        detector = self.detector(['++++++',
+                                  '+00  +',
+                                  '+C   +',
+                                  '++++++'])
+        self.assertFalse(detector.is_deadlock(7, {7, 8}))
+
+
+class TestBackgroundSearch(unittest.TestCase):
+
+    def test_result(self):
+        search = ai_solver.BackgroundSearch(make_model(THREE_GLASS_ROOM))
+        search.join(30)
+        self.assertTrue(search.done())
+        self.assertFalse(search.cancelled)
+        self.assertEqual(16, len(search.result))
+        explored, peak_frontier, elapsed = search.progress()
+        self.assertGreater(explored, 0)
+        self.assertEqual(search.solver.stats.peak_frontier, peak_frontier)
+
+    def test_cancel(self):
+        search = ai_solver.BackgroundSearch(make_model(LARGE_ROOM))
+        search.cancel()
+        search.join(30)
+        self.assertTrue(search.done())
+        self.assertTrue(search.cancelled)
+        self.assertIsNone(search.result)
+
+
+class TestMinCostMatching(unittest.TestCase):
+
+    def test_matching(self):
+        self.assertEqual(5, ai_solver.min_cost_matching([[4, 1, 3], [2, 0, 5], [3, 2, 2]]))
+
+    def test_forbidden(self):
+        inf = float('inf')
+        self.assertEqual(3, ai_solver.min_cost_matching([[inf, 1], [2, inf]]))
+        self.assertEqual(inf, ai_solver.min_cost_matching([[inf, 1], [inf, 2]]))
+
+
+class TestZobrist(unittest.TestCase):
+
+    def test_incremental_hash(self):
+        game = make_model(TWO_GLASS_ROOM)
+        state = ai_solver.GameState.from_model(game)
+        for move in [(0, 1), (0, 1), (0, 1), (1, 0), (1, 0)]:
+            state = state.try_move(move)
+            fresh = ai_solver.GameState(state.cat_pos, state.glass_positions, game.get_room())
+            self.assertEqual(fresh.zobrist, state.zobrist)
+            self.assertEqual(hash(fresh), hash(state))
+
+    def test_table_verifies_collisions(self):
+        table = ai_solver.TranspositionTable()
+        table.put(42, 'first', 1)
+        table.put(42, 'second', 2)
+        self.assertEqual(1, table.get(42, 'first'))
+        self.assertEqual(2, table.get(42, 'second'))
+        self.assertFalse(table.contains(42, 'third'))
+        self.assertEqual(1, table.collisions)
+        self.assertEqual(2, len(table))
+        table.discard(42, 'first')
+        self.assertFalse(table.contains(42, 'first'))
+        self.assertTrue(table.contains(42, 'second'))
+
+
+class TestStateCodec(unittest.TestCase):
+
+    def test_round_trip(self):
+        codec = ai_solver.StateCodec(make_model(TWO_GLASS_ROOM).get_room().get_index(), 2)
+        key = codec.pack(5, [13, 11])
+        self.assertEqual((5, [11, 13]), codec.unpack(key))
+        self.assertEqual(key, codec.pack(5, {11, 13}), 'Key must not depend on glass order')
+
+    def test_round_trip_cell_zero(self):
+        codec = ai_solver.StateCodec(make_model(TWO_GLASS_ROOM).get_room().get_index(), 1)
+        self.assertEqual((0, [0]), codec.unpack(codec.pack(0, [0])))
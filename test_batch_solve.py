@@ -0,0 +1,25 @@
+import os
+import unittest
+import batch_solve
+from test_ai_solver import make_game_dir, BASIC_ROOM, THREE_GLASS_ROOM, STUCK_ROOM
+
+
+class TestBatchSolve(unittest.TestCase):
+
+    def test_solve_directory(self):
+        game_dir = make_game_dir(self, BASIC_ROOM, THREE_GLASS_ROOM, STUCK_ROOM)
+        results = batch_solve.solve_directory(game_dir, 'solve_bfs', workers=2, time_limit=30)
+        self.assertEqual(sorted(os.listdir(game_dir)), [result['room'] for result in results])
+        basic, three_glass, stuck = results
+        self.assertEqual('solved', basic['status'])
+        self.assertEqual('ds', basic['solution'])
+        self.assertEqual(1, basic['pushes'])
+        self.assertEqual(16, three_glass['solution_length'])
+        self.assertEqual('unsolvable', stuck['status'])
+        self.assertIn('peak_rss_kb', basic)
+
+    def test_solve_parallel(self):
+        game_dir = make_game_dir(self, THREE_GLASS_ROOM)
+        result = batch_solve.solve_room(game_dir, os.listdir(game_dir)[0], 'solve_parallel', 0)
+        self.assertEqual('solved', result['status'])
+        self.assertEqual(16, result['solution_length'])
@@ -0,0 +1,47 @@
+import unittest
+import benchmark
+from constants import *
+
+
+def entry(room='room1.txt', method='solve_bfs', wall_time=0.01, peak_bytes=1000, solution_length=5):
+    return {'room': room, 'method': method, 'wall_time': wall_time, 'peak_bytes': peak_bytes,
+            'solution_length': solution_length}
+
+
+class TestSuite(unittest.TestCase):
+
+    def test_corpus_reproducible(self):
+        first = benchmark.build_corpus(DEFAULT_GAMES, seed=3)
+        self.assertEqual(first, benchmark.build_corpus(DEFAULT_GAMES, seed=3))
+        self.assertEqual(3 + len(benchmark.SUITE_ROOMS), len(first))
+
+    def test_run_suite(self):
+        corpus = benchmark.build_corpus(DEFAULT_GAMES, seed=1)[:2]
+        results = benchmark.run_suite(corpus, ['solve_bfs', 'solve_astar'], repeat=1)
+        self.assertEqual(4, len(results))
+        self.assertEqual([2, 2, 6, 6], [result['solution_length'] for result in results])
+        self.assertTrue(all(result['peak_bytes'] > 0 for result in results))
+
+    def test_run_suite_special_methods(self):
+        small = benchmark.build_corpus(DEFAULT_GAMES, seed=1)[0]
+        large = ('gen8x8g1', benchmark.generate_room(8, 8, 1, 4, seed=1))
+        results = benchmark.run_suite([small, large], ['solve_bfs_seeded', 'solve_dfs', 'solve_parallel'], repeat=1)
+        # depth-first search is left out on the large room
+        self.assertEqual([(small[0], 'solve_bfs_seeded'), (small[0], 'solve_dfs'), (small[0], 'solve_parallel'),
+                          (large[0], 'solve_bfs_seeded'), (large[0], 'solve_parallel')],
+                         [(result['room'], result['method']) for result in results])
+        self.assertEqual([2, 2, 2], [result['solution_length'] for result in results[:3]])
+
+    def test_compare(self):
+        baseline = [entry(), entry(method='solve_astar')]
+        self.assertEqual([], benchmark.compare([entry(wall_time=0.012)], baseline, 0.25))
+        self.assertEqual(1, len(benchmark.compare([entry(wall_time=0.02)], baseline, 0.25)))
+        self.assertEqual(1, len(benchmark.compare([entry(peak_bytes=2000)], baseline, 0.25)))
+        self.assertEqual(1, len(benchmark.compare([entry(solution_length=None)], baseline, 0.25)))
+        self.assertEqual([], benchmark.compare([entry(solution_length=4)], baseline, 0.25))
+        self.assertEqual([], benchmark.compare([entry(wall_time=0.02)], baseline, 0.25, min_time=0.1))
+        self.assertEqual([], benchmark.compare([entry(room='new')], baseline, 0.25))
+
+
+if __name__ == '__main__':
+    unittest.main()
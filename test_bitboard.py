@@ -0,0 +1,73 @@
+import random
+import unittest
+import ai_solver
+import bitboard
+from constants import *
+from test_ai_solver import make_model, BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM
+
+OPEN_ROOM = ['+++++++',
+             '+     +',
+             '+ G G +',
+             '+C G 0+',
+             '+ 0  0+',
+             '+++++++']
+
+ROOMS = (BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM, OPEN_ROOM)
+DELTAS = [info['delta'] for info in MOVE_DIRECTIONS.values()]
+
+
+class TestBitState(unittest.TestCase):
+
+    def test_from_model(self):
+        game = make_model(TWO_GLASS_ROOM)
+        state = game.get_bit_state()
+        self.assertEqual(game.get_cat().get_pos(), state.cat_pos)
+        self.assertEqual(frozenset(game.get_room().get_glasses()), state.glass_positions)
+        self.assertEqual(state, ai_solver.GameState.from_model(game).to_bit_state())
+
+    def test_random_moves_agree(self):
+        generator = random.Random(7)
+        for room in ROOMS:
+            for _ in range(20):
+                game = make_model(room)
+                object_state = ai_solver.GameState.from_model(game)
+                bit_state = game.get_bit_state()
+                for delta in generator.choices(DELTAS, k=40):
+                    next_object, next_bit = object_state.try_move(delta), bit_state.try_move(delta)
+                    self.assertEqual(next_object is None, next_bit is None)
+                    game.move_cat(delta)
+                    if next_object is not None:
+                        object_state, bit_state = next_object, next_bit
+                    self.assertEqual(object_state.cat_pos, bit_state.cat_pos)
+                    self.assertEqual(object_state.glass_positions, bit_state.glass_positions)
+                    self.assertEqual(object_state.is_solved(), bit_state.is_solved())
+                    self.assertEqual(game.get_bit_state(), bit_state, 'Bitboard must track the Model')
+
+    def test_reachable(self):
+        game = make_model(OPEN_ROOM)
+        state = game.get_bit_state()
+        index = game.get_room().get_index()
+        cells = ai_solver.reachable_cells(index.to_cell(state.cat_pos),
+                                          {index.to_cell(pos) for pos in state.glass_positions},
+                                          index.get_cell_steps())
+        self.assertEqual({index.to_pos(cell) for cell in cells},
+                         set(state.bitboard.positions(state.reachable())))
+
+    def test_legal_pushes(self):
+        game = make_model(OPEN_ROOM)
+        state = game.get_bit_state()
+        reachable = set(state.bitboard.positions(state.reachable()))
+        expected = set()
+        for glass in state.glass_positions:
+            for delta in DELTAS:
+                behind = (glass[0] - delta[0], glass[1] - delta[1])
+                if behind in reachable and bitboard.BitState(
+                        state.bitboard.to_bit(behind), state.glasses, state.room).try_move(delta):
+                    expected.add((glass, delta))
+        self.assertEqual(expected, set(state.legal_pushes()))
+
+    def test_solver_backend(self):
+        for room in ROOMS[:3]:
+            game = make_model(room)
+            self.assertEqual(ai_solver.SokobanSolver(game).solve_bfs(),
+                             ai_solver.SokobanSolver(game, state_class=bitboard.BitState).solve_bfs())
@@ -0,0 +1,71 @@
+import unittest
+import ai_solver
+import canonical
+from simulate import Simulator
+from test_ai_solver import make_model, BASIC_ROOM, TWO_GLASS_ROOM
+
+
+def variants(tiles: list[str]) -> list[list[str]]:
+    return [canonical.transform_tiles(tiles, symmetry) for symmetry in canonical.SYMMETRIES]
+
+
+def pad(tiles: list[str]) -> list[str]:
+    """The room inside extra walls, blank rows and unreachable floor, still rectangular."""
+    width = len(tiles[0]) + 4
+    return [' ' * width, '+' * width] + ['++' + row + '+ ' for row in tiles] + ['+ + +'.ljust(width)]
+
+
+class TestCanonical(unittest.TestCase):
+
+    def test_variants_share_fingerprint(self):
+        forms = {tuple(canonical.canonicalize(tiles).tiles) for tiles in variants(TWO_GLASS_ROOM) + [pad(TWO_GLASS_ROOM)]}
+        forms.add(tuple(canonical.canonicalize([''] + TWO_GLASS_ROOM + ['', '  ']).tiles))
+        self.assertEqual(1, len(forms))
+        self.assertNotEqual(canonical.canonicalize(TWO_GLASS_ROOM).fingerprint,
+                            canonical.canonicalize(BASIC_ROOM).fingerprint)
+
+    def test_trim(self):
+        rows, origin = canonical.trim_tiles(pad(BASIC_ROOM))
+        self.assertEqual(['++++', '+C +', '++G+', '++0+', '++++'], rows)
+        self.assertEqual((2, 1), origin)
+        # the cat stands on the edge of BASIC_ROOM, so its ring of walls lies outside the rows
+        self.assertEqual((0, -1), canonical.trim_tiles(BASIC_ROOM)[1])
+
+    def test_unreachable_glass_kept(self):
+        rows, _ = canonical.trim_tiles(['+++++', '+C0++', '+++G+', '+++++'])
+        self.assertEqual(['+++++', '+C0++', '+++G+', '+++++'], rows)
+
+    def test_restore_inverts_transform(self):
+        for symmetry in canonical.SYMMETRIES:
+            for move in ai_solver.MOVES:
+                moved = canonical.transform_move(move, symmetry)
+                self.assertEqual(move, canonical.restore_move(moved, symmetry))
+
+    def test_solution_maps_back(self):
+        moves = ai_solver.SokobanSolver(make_model(TWO_GLASS_ROOM)).solve_bfs()
+        canonical_moves = canonical.canonicalize(TWO_GLASS_ROOM).to_canonical_moves(moves)
+        self.assertTrue(Simulator.from_tiles(canonical.canonicalize(TWO_GLASS_ROOM).tiles).solves(canonical_moves))
+        for tiles in variants(TWO_GLASS_ROOM) + [pad(TWO_GLASS_ROOM)]:
+            form = canonical.canonicalize(tiles)
+            self.assertTrue(Simulator.from_tiles(tiles).solves(form.to_original_moves(canonical_moves)))
+
+    def test_positions_map_both_ways(self):
+        for tiles in variants(pad(TWO_GLASS_ROOM)):
+            form = canonical.canonicalize(tiles)
+            cat = next((i, j) for i, row in enumerate(tiles) for j, symbol in enumerate(row) if symbol == 'C')
+            canonical_cat = form.to_canonical_pos(cat)
+            self.assertEqual('C', form.tiles[canonical_cat[0]][canonical_cat[1]])
+            self.assertEqual(cat, form.to_original_pos(canonical_cat))
+
+    def test_model_canonical(self):
+        game = make_model(pad(BASIC_ROOM))
+        self.assertEqual(canonical.canonicalize(BASIC_ROOM), game.get_canonical()._replace(origin=(0, -1)))
+        self.assertIs(game.get_canonical(), game.get_canonical())
+
+    def test_no_cat(self):
+        with self.assertRaises(ValueError):
+            canonical.canonicalize(['+++', '+0+', '+++'])
+
+
+if __name__ == '__main__':
+    unittest.main()
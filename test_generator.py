@@ -0,0 +1,61 @@
+import os
+import random
+import unittest
+from unittest import mock
+import generator
+from levels import MemorySource, open_levels
+from model import Model
+from simulate import Simulator
+from test_ai_solver import make_temp_dir
+
+
+class TestGenerator(unittest.TestCase):
+
+    SPEC = generator.LevelSpec(rows=7, cols=7, glasses=2, min_pushes=3)
+
+    def test_carved_floor_connected(self):
+        floor = generator.carve_floor(random.Random(1), 9, 9, 0.3)
+        self.assertEqual(49 - int(49 * 0.3), len(floor))
+        self.assertEqual(floor, generator._reachable(next(iter(floor)), floor))
+
+    def test_levels_are_solved_and_scored(self):
+        levels = list(generator.generate_levels(self.SPEC, 10, workers=1))
+        self.assertGreater(len(levels), 5)
+        for level in levels:
+            self.assertGreaterEqual(level.pushes, 3)
+            self.assertGreater(level.branching, 1)
+            self.assertTrue(Simulator.from_tiles(level.tiles).solves(level.solution), level.name)
+
+    def test_deterministic(self):
+        self.assertEqual(generator.generate_level(self.SPEC, 7), generator.generate_level(self.SPEC, 7))
+
+    def test_parallel_matches_serial(self):
+        serial = list(generator.generate_levels(self.SPEC, 6, seed=3, workers=1))
+        self.assertEqual(serial, list(generator.generate_levels(self.SPEC, 6, seed=3, workers=2)))
+
+    def test_write_collection(self):
+        path = os.path.join(make_temp_dir(self), 'generated.txt')
+        levels = list(generator.write_collection(generator.generate_levels(self.SPEC, 4, workers=1), path))
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': make_temp_dir(self)}):
+            source = open_levels(path)
+        self.assertEqual([(level.name, level.tiles) for level in levels], list(source))
+
+    def test_write_directory(self):
+        game_dir = os.path.join(make_temp_dir(self), 'generated')
+        levels = list(generator.write_directory(generator.generate_levels(self.SPEC, 3, workers=1), game_dir))
+        self.assertEqual([level.tiles for level in levels], [rows for _, rows in open_levels(game_dir)])
+
+
+class TestMemorySource(unittest.TestCase):
+
+    def test_model_from_memory(self):
+        level = generator.generate_level(TestGenerator.SPEC, 0)
+        game = Model(MemorySource([(level.name, level.tiles)]))
+        self.assertEqual(level.name, game.get_room_name())
+        self.assertEqual(level.tiles, game.get_room_tiles())
+        with self.assertRaises(ValueError):
+            open_levels(MemorySource([]), ['room'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import os
+import unittest
+from unittest import mock
+import ai_solver
+import hint_cache
+from test_ai_solver import make_model, make_temp_dir, replay, BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM, STUCK_ROOM
+
+
+class TestSolutionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.game = make_model(TWO_GLASS_ROOM)
+        self.start = ai_solver.GameState.from_model(self.game)
+        self.plan = ai_solver.SokobanSolver(self.game).solve_bfs()
+
+    def test_follow_plan(self):
+        cache = hint_cache.SolutionCache()
+        cache.store(self.start, self.plan)
+        state = self.start
+        for num, move in enumerate(self.plan):
+            self.assertEqual(move, cache.hint(state))
+            self.assertEqual(self.plan[num:], cache.lookup(state))
+            state = state.try_move(move)
+        self.assertEqual([], cache.lookup(state))
+        self.assertEqual(2 * len(self.plan) + 1, cache.hits)
+
+    def test_miss(self):
+        cache = hint_cache.SolutionCache()
+        self.assertIsNone(cache.lookup(self.start))
+        self.assertIsNone(cache.hint(self.start))
+        self.assertEqual((0, 2), (cache.hits, cache.misses))
+
+    def test_illegal_plan_leaves_cache_unchanged(self):
+        cache = hint_cache.SolutionCache()
+        with self.assertRaises(ValueError):
+            cache.store(self.start, [(0, 1), (0, 1), (-1, 0)])
+        self.assertEqual((0, 0), (len(cache), cache.get_size()))
+        self.assertIsNone(cache.lookup(self.start))
+        cache.store(self.start, self.plan)
+        self.assertEqual(self.plan, cache.lookup(self.start))
+
+    def test_eviction(self):
+        other = make_model(BASIC_ROOM)
+        other_start = ai_solver.GameState.from_model(other)
+        cache = hint_cache.SolutionCache(budget_bytes=1)
+        cache.store(self.start, self.plan)
+        cache.store(other_start, ai_solver.SokobanSolver(other).solve_bfs())
+        # the least recently used plan goes, the newest always stays
+        self.assertIsNone(cache.lookup(self.start))
+        self.assertIsNotNone(cache.lookup(other_start))
+
+    def test_persist(self):
+        cache = hint_cache.SolutionCache()
+        cache.store(self.start, self.plan)
+        path = os.path.join(make_temp_dir(self), 'hints', 'room1.txt.json')
+        cache.save(path, self.game.get_room())
+        loaded = hint_cache.SolutionCache()
+        self.assertEqual(1, loaded.load(path, self.game.get_room()))
+        self.assertEqual(self.plan, loaded.lookup(self.start))
+        self.assertEqual(0, loaded.load(path, make_model(BASIC_ROOM).get_room()))
+
+    def test_persist_plans_sharing_start(self):
+        cache = hint_cache.SolutionCache()
+        detour = ai_solver.text_to_moves('ddasdsdw')
+        cache.store(self.start, self.plan)
+        cache.store(self.start, detour)
+        path = os.path.join(make_temp_dir(self), 'room1.txt.json')
+        cache.save(path, self.game.get_room())
+        loaded = hint_cache.SolutionCache()
+        self.assertEqual(2, loaded.load(path, self.game.get_room()))
+        self.assertEqual(self.plan, loaded.lookup(self.start))
+        self.assertEqual(detour[2:], loaded.lookup(self.start.try_move(detour[0]).try_move(detour[1])))
+
+    def test_load_skips_broken_plans(self):
+        path = os.path.join(make_temp_dir(self), 'room1.txt.json')
+        hint_cache.SolutionCache().save(path, self.game.get_room())
+        with open(path) as hint_file:
+            saved = json.load(hint_file)
+        cat, glasses = list(self.start.cat_pos), sorted(map(list, self.start.glass_positions))
+        saved['plans'] = [{'cat': cat, 'glasses': glasses, 'moves': moves}
+                          for moves in ('ddw', 'dsx', ai_solver.moves_to_text(self.plan))]
+        with open(path, 'w') as hint_file:
+            json.dump(saved, hint_file)
+        loaded = hint_cache.SolutionCache()
+        self.assertEqual(1, loaded.load(path, self.game.get_room()))
+        self.assertEqual(self.plan, loaded.lookup(self.start))
+
+    def test_hint_path_in_user_cache(self):
+        cache_dir = make_temp_dir(self)
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': cache_dir}):
+            path = hint_cache.hint_path('games/default', 'room1.txt')
+            self.assertNotEqual(path, hint_cache.hint_path('other/default', 'room1.txt'))
+        self.assertEqual(os.path.join(cache_dir, 'sokoban', 'hints'), os.path.dirname(os.path.dirname(path)))
+        self.assertTrue(os.path.basename(os.path.dirname(path)).startswith('default-'))
+        self.assertEqual('room1.txt.json', os.path.basename(path))
+
+
+class TestSeededSearch(unittest.TestCase):
+
+    def test_matches_bfs_without_seeds(self):
+        for room in (BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM, STUCK_ROOM):
+            solver = ai_solver.SokobanSolver(make_model(room))
+            expected = solver.solve_bfs()
+            seeded = solver.solve_bfs_seeded(lambda state: None)
+            self.assertEqual(expected is None, seeded is None)
+            if expected is not None:
+                self.assertEqual(len(expected), len(seeded))
+
+    def test_rejoins_cached_plan(self):
+        game = make_model(THREE_GLASS_ROOM)
+        plan = ai_solver.SokobanSolver(game).solve_bfs()
+        cache = hint_cache.SolutionCache()
+        cache.store(ai_solver.GameState.from_model(game), plan)
+
+        game.move_cat(plan[0])
+        detour = ai_solver.SokobanSolver(game)
+        expected = len(detour.solve_bfs())
+        solution = detour.solve_bfs_seeded(cache.known)
+        self.assertEqual(expected, len(solution))
+        self.assertLess(detour.stats.nodes_expanded, 5)
+        self.assertTrue(replay(game, solution))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from image_cache import ImageCache
+
+
+class TestImageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.loaded, self.scaled = [], []
+        self.cache = ImageCache(self.load, self.scale, capacity=3)
+
+    def load(self, name):
+        self.loaded.append(name)
+        return name.upper()
+
+    def scale(self, source, size):
+        self.scaled.append((source, size))
+        return f'{source}@{size[0]}x{size[1]}'
+
+    def test_scaled_once(self):
+        for _ in range(3):
+            self.assertEqual('CAT.PNG@40x40', self.cache.get('cat.png', (40, 40)))
+        self.assertEqual((2, 1), (self.cache.hits, self.cache.misses))
+        self.assertEqual(1, len(self.scaled))
+
+    def test_decoded_once_per_source(self):
+        for size in ((40, 40), (30, 30), (40, 40)):
+            self.cache.get('cat.png', size)
+        self.assertEqual(['cat.png'], self.loaded)
+        self.assertEqual(2, len(self.scaled))
+
+    def test_lru_eviction(self):
+        for name in ('a', 'b', 'c'):
+            self.cache.get(name, (10, 10))
+        self.cache.get('a', (10, 10))
+        self.cache.get('d', (10, 10))
+        self.assertEqual(3, len(self.cache))
+        self.cache.get('a', (10, 10))
+        self.cache.get('b', (10, 10))
+        self.assertEqual({'hits': 2, 'misses': 5, 'sources': 4, 'scaled': 3}, self.cache.stats())
+
+    def test_get_all(self):
+        images = self.cache.get_all({'+': 'wall.png', ' ': 'empty.png'}, (20, 20))
+        self.assertEqual({'+': 'WALL.PNG@20x20', ' ': 'EMPTY.PNG@20x20'}, images)
+
+
+if __name__ == '__main__':
+    unittest.main()
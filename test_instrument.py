@@ -0,0 +1,81 @@
+import json
+import os
+import unittest
+import ai_solver
+from instrument import SearchProfile, profile_solve
+from parallel_solver import ParallelSolver
+from test_ai_solver import make_model, make_temp_dir, BASIC_ROOM, TWO_GLASS_ROOM
+
+
+class TestSearchProfile(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        solver = ai_solver.SokobanSolver(make_model(TWO_GLASS_ROOM))
+        self.assertIsNone(solver.profile)
+        self.assertIsNotNone(solver.solve_bfs_compact())
+
+    def test_search_counters(self):
+        searches = {method: lambda solver, method=method: getattr(solver, method)()
+                    for method in ('solve_bfs', 'solve_bfs_compact', 'solve_pushes', 'solve_astar', 'solve_idastar',
+                                   'solve_bidirectional', 'solve_dfs')}
+        searches['solve_bfs_seeded'] = lambda solver: solver.solve_bfs_seeded(lambda state: None)
+        searches['solve_parallel'] = lambda solver: solver.solve_parallel()
+        for method, search in searches.items():
+            profile = SearchProfile()
+            solver_class = ParallelSolver if method == 'solve_parallel' else ai_solver.SokobanSolver
+            # depth-first search wanders for seconds in the larger room
+            room = BASIC_ROOM if method == 'solve_dfs' else TWO_GLASS_ROOM
+            solver = solver_class(make_model(room), profile=profile)
+            solution = search(solver)
+            self.assertIsNotNone(solution, method)
+            counters = profile.as_dict()['counters']
+            self.assertEqual(solver.stats.nodes_expanded, counters['expansions'], method)
+            self.assertGreater(counters['pushes'], 0, method)
+            self.assertGreater(counters['goal_checks'], 0, method)
+            self.assertGreater(profile.peak_visited, 0, method)
+            self.assertEqual(1, min(abs(depth) for depth in profile.frontier_by_depth), method)
+
+    def test_bfs_frontier_by_depth(self):
+        profiles = []
+        for method in ('solve_bfs', 'solve_bfs_compact'):
+            profile = SearchProfile()
+            solution = getattr(ai_solver.SokobanSolver(make_model(TWO_GLASS_ROOM), profile=profile), method)()
+            self.assertEqual(len(solution), max(profile.frontier_by_depth), method)
+            profiles.append(profile.frontier_by_depth)
+        self.assertEqual(*profiles)
+
+    def test_callback(self):
+        calls = []
+        profile = SearchProfile(callback=lambda found: calls.append(found.counters['expansions']), every=5)
+        ai_solver.SokobanSolver(make_model(TWO_GLASS_ROOM), profile=profile).solve_bfs()
+        self.assertEqual(list(range(5, profile.counters['expansions'] + 1, 5)), calls)
+
+    def test_callback_on_bulk_expansions(self):
+        calls = []
+        profile = SearchProfile(callback=lambda found: calls.append(found.counters['expansions']), every=5)
+        for amount in (3, 4, 1, 12):
+            profile.expanded(amount)
+        self.assertEqual([7, 20], calls)
+
+    def test_model_counters(self):
+        game = make_model(BASIC_ROOM)
+        profile = SearchProfile()
+        game.set_profile(profile)
+        for move in [(0, -1), (0, 1), (1, 0)]:
+            game.move_cat(move)
+        self.assertTrue(game.room_messed())
+        self.assertEqual({'blocked': 1, 'moves': 2, 'pushes': 1, 'goal_checks': 1}, dict(profile.counters))
+
+    def test_profile_solve_dumps(self):
+        prefix = os.path.join(make_temp_dir(self), 'bfs')
+        solver = ai_solver.SokobanSolver(make_model(TWO_GLASS_ROOM))
+        solution, profile = profile_solve(solver, 'solve_bfs', prefix)
+        self.assertIsNotNone(solution)
+        self.assertIn('solve_bfs', profile.timers)
+        self.assertTrue(os.path.exists(prefix + '.pstats'))
+        with open(prefix + '.json') as dump:
+            self.assertEqual(profile.counters['expansions'], json.load(dump)['counters']['expansions'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import unittest
+from unittest import mock
+import levels
+import model
+from test_ai_solver import make_temp_dir, BASIC_ROOM, TWO_GLASS_ROOM, STUCK_ROOM
+
+
+def write_collection(test: unittest.TestCase, *rooms: tuple[str, list[str]]) -> str:
+    """Collection file holding the given (title, rows) rooms, removed after test; an empty title is left out."""
+    path = os.path.join(make_temp_dir(test), 'collection.txt')
+    with open(path, 'w') as collection:
+        for title, rows in rooms:
+            if title:
+                collection.write(f'; {title}\n')
+            collection.write('\n'.join(rows) + '\n\n')
+    return path
+
+
+class TestDirectorySource(unittest.TestCase):
+
+    def test_sorted_without_hidden(self):
+        game_dir = make_temp_dir(self)
+        for name in ('room2.txt', 'room10.txt', 'room1.txt', '.hidden'):
+            with open(os.path.join(game_dir, name), 'w') as room_file:
+                room_file.write('\n'.join(BASIC_ROOM))
+        os.mkdir(os.path.join(game_dir, '.index'))
+        source = levels.open_levels(game_dir)
+        self.assertEqual(['room1.txt', 'room10.txt', 'room2.txt'], [name for name, _ in source])
+        self.assertEqual(BASIC_ROOM, source.load(2))
+
+
+class TestCollectionSource(unittest.TestCase):
+
+    def setUp(self):
+        cache = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': make_temp_dir(self)})
+        cache.start()
+        self.addCleanup(cache.stop)
+        self.path = write_collection(self, ('basic', BASIC_ROOM), ('', TWO_GLASS_ROOM), ('stuck', STUCK_ROOM))
+
+    def test_rooms(self):
+        source = levels.open_levels(self.path)
+        self.assertEqual([('basic', BASIC_ROOM), ('level2', TWO_GLASS_ROOM), ('stuck', STUCK_ROOM)], list(source))
+        self.assertEqual(STUCK_ROOM, source.load(2))
+
+    def test_index_persisted(self):
+        source = levels.open_levels(self.path)
+        with open(source.index_path()) as index_file:
+            offsets = [offset for _, offset in json.load(index_file)['rooms']]
+        self.assertEqual(3, len(offsets))
+        self.assertTrue(source.index_path().startswith(os.environ['XDG_CACHE_HOME']))
+        self.assertFalse(os.path.exists(os.path.join(os.path.dirname(self.path), '.index')))
+        # a second open trusts the index instead of scanning the file
+        with mock.patch.object(levels.CollectionSource, '_scan', side_effect=AssertionError):
+            reopened = levels.open_levels(self.path)
+        self.assertEqual(['basic', 'level2', 'stuck'], [reopened.name(num) for num in range(3)])
+
+    def test_index_rebuilt_after_change(self):
+        levels.open_levels(self.path)
+        with open(self.path, 'a') as collection:
+            collection.write('; added\n' + '\n'.join(BASIC_ROOM) + '\n')
+        source = levels.open_levels(self.path)
+        self.assertEqual(('added', BASIC_ROOM), (source.name(3), source.load(3)))
+
+    def test_subset_by_name(self):
+        source = levels.open_levels(self.path, ['stuck', 'basic'])
+        self.assertEqual([('stuck', STUCK_ROOM), ('basic', BASIC_ROOM)], list(source))
+
+    def test_model_plays_collection(self):
+        game = model.Model(self.path)
+        self.assertEqual((3, 'basic'), (game.get_num_rooms(), game.get_room_name()))
+        game.level_up()
+        self.assertEqual(('level2', (7, 5)), (game.get_room_name(), game.get_cur_dimension()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 import model
+from test_ai_solver import make_model, BASIC_ROOM, TWO_GLASS_ROOM
 
 class TestRoom(unittest.TestCase):
 
@@ -38,4 +39,172 @@ class TestRoom(unittest.TestCase):
         room = self.basic_room()
         room.move_glass(room.get_glass(2, 1), (1, 0))
         self.assertIn((3, 1), room.get_glasses())
-        self.assertNotIn((2, 1), room.get_glasses())
\ No newline at end of file
+        self.assertNotIn((2, 1), room.get_glasses())
+
+    def test_compact_storage(self):
+        room = self.basic_room()
+        self.assertIs(room.get_tile(0, 0), room.get_tile(2, 2), 'Tiles of a kind are shared')
+        self.assertFalse(hasattr(room.get_glass(2, 1), '__dict__'))
+        self.assertEqual({(2, 1)}, set(room.get_glasses().keys()))
+        self.assertNotIn((1, 4), room.get_glasses())
+        with self.assertRaises(IndexError):
+            room.get_tile(1, 3)
+
+    def test_short_rows_are_walls(self):
+        room = model.Room(2, 3)
+        room.set_playground(['C 0',
+                             'G'])
+        self.assertFalse(room.tile_passable(1, 2))
+
+    def test_all_filled(self):
+        room = self.basic_room()
+        self.assertFalse(room.all_filled())
+        room.move_glass(room.get_glass(2, 1), (1, 0))
+        self.assertTrue(room.all_filled())
+        self.assertEqual(model.BROKEN_GLASS, room.get_glass(3, 1).get_text())
+        room.move_glass(room.get_glass(3, 1), (-1, 0))
+        self.assertEqual(0, room.get_filled_count())
+        self.assertEqual(model.GLASS, room.get_glass(2, 1).get_text())
+
+    def test_filled_count_matches_rescan(self):
+        room = model.Room(4, 5)
+        room.set_playground(['+++++',
+                             'CG0G+',
+                             '+ 0 +',
+                             '+++++'])
+        for glass_pos, delta in (((1, 1), (0, 1)), ((1, 3), (1, 0)), ((1, 2), (1, 0)), ((2, 2), (0, -1))):
+            room.move_glass(room.get_glass(*glass_pos), delta)
+            incremental = room.get_filled_count(), room.all_filled()
+            room.update_dests()
+            self.assertEqual((room.get_filled_count(), room.all_filled()), incremental)
+
+class TestRoomIndex(unittest.TestCase):
+
+    def test_dests(self):
+        index = TestRoom.basic_room().get_index()
+        self.assertEqual(frozenset({(3, 1)}), index.get_dests())
+        self.assertEqual(frozenset({10}), index.get_dest_cells())
+
+    def test_step(self):
+        index = TestRoom.basic_room().get_index()
+        self.assertEqual((1, 1), index.step((1, 0), (0, 1)))
+        self.assertIsNone(index.step((1, 0), (0, -1)), 'Step out of the room should be blocked')
+        self.assertIsNone(index.step((1, 1), (0, 1)), 'Step into a wall should be blocked')
+
+    def test_index_cached(self):
+        room = TestRoom.basic_room()
+        self.assertIs(room.get_index(), room.get_index())
+
+    def test_push_distances(self):
+        distances = TestRoom.basic_room().get_index().get_push_distances()
+        self.assertEqual([10], list(distances))
+        self.assertEqual(1, distances[10][7], 'Glass above the dest is one push away')
+        self.assertIsNone(distances[10][4], 'Glass in the corridor can never be pushed down')
+
+
+class TestModelChanges(unittest.TestCase):
+
+    def test_changes_of_moves(self):
+        game = make_model(BASIC_ROOM)
+        self.assertIsNone(game.pop_changes(), 'a loaded room must be drawn in full')
+        self.assertEqual(set(), game.pop_changes())
+        game.move_cat((0, -1))
+        self.assertEqual(set(), game.pop_changes(), 'blocked move changes nothing')
+        game.move_cat((0, 1))
+        self.assertEqual({(1, 0), (1, 1)}, game.pop_changes())
+        game.move_cat((1, 0))
+        self.assertEqual({(1, 1), (2, 1), (3, 1)}, game.pop_changes())
+
+
+class TestMoveJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.game = make_model(TWO_GLASS_ROOM)
+        self.start = self.snapshot()
+
+    def snapshot(self):
+        room = self.game.get_room()
+        return self.game.get_cat().get_pos(), {pos: glass.get_text() for pos, glass in room.get_glasses().items()}
+
+    def play(self, moves):
+        for move in moves:
+            self.game.move_cat(move)
+
+    def test_undo_push(self):
+        self.play([(0, 1), (1, 0)])
+        self.assertNotEqual(self.start, self.snapshot())
+        self.assertTrue(self.game.undo())
+        self.assertTrue(self.game.undo())
+        self.assertFalse(self.game.undo())
+        self.assertEqual(self.start, self.snapshot())
+
+    def test_blocked_moves_not_logged(self):
+        self.play([(0, -1), (-1, 0), (0, 1)])
+        self.assertEqual([(0, 1)], self.game.get_history())
+
+    def test_redo_and_truncate(self):
+        self.play([(0, 1), (1, 0), (1, 0)])
+        after = self.snapshot()
+        self.game.go_to_move(1)
+        self.assertEqual(1, self.game.get_move_count())
+        self.game.go_to_move(3)
+        self.assertEqual(after, self.snapshot())
+        self.game.undo()
+        self.game.move_cat((0, 1))
+        self.assertFalse(self.game.redo(), 'a new move drops the undone ones')
+        self.assertEqual([(0, 1), (1, 0), (0, 1)], self.game.get_history())
+
+    def test_replay_is_deterministic(self):
+        moves = [(0, 1), (1, 0), (0, 1), (0, 1), (1, 0), (0, -1), (-1, 0)]
+        self.play(moves)
+        after, history = self.snapshot(), self.game.get_history()
+        self.game.go_to_move(0)
+        self.assertEqual(self.start, self.snapshot())
+        self.game.replay(history)
+        self.assertEqual(after, self.snapshot())
+
+    def test_changes_of_undo(self):
+        self.play([(0, 1), (1, 0)])
+        self.game.pop_changes()
+        self.game.undo()
+        self.assertEqual({(1, 1), (2, 1), (3, 1)}, self.game.pop_changes())
+
+
+class TestWalking(unittest.TestCase):
+
+    def setUp(self):
+        self.game = make_model(TWO_GLASS_ROOM)
+        self.room = self.game.get_room()
+
+    def test_walk_distance(self):
+        self.assertEqual(3, self.room.get_walk_distance((1, 0), (1, 3)))
+        self.assertEqual(0, self.room.get_walk_distance((1, 0), (1, 0)))
+        self.assertIsNone(self.room.get_walk_distance((1, 0), (2, 1)), 'a glass cannot be walked onto')
+        self.assertIsNone(self.room.get_walk_distance((1, 0), (0, 0)), 'a wall cannot be walked onto')
+
+    def test_walk_path_avoids_glasses(self):
+        path = self.room.walk_path((1, 0), (3, 1))
+        self.assertEqual(self.room.get_walk_distance((1, 0), (3, 1)), len(path))
+        pos = (1, 0)
+        for delta in path:
+            pos = (pos[0] + delta[0], pos[1] + delta[1])
+            self.assertNotIn(pos, self.room.get_glasses())
+            self.assertTrue(self.room.tile_passable(*pos))
+        self.assertEqual((3, 1), pos)
+
+    def test_push_drops_affected_maps(self):
+        before = self.room.get_walk_distance((1, 0), (3, 1))
+        self.game.replay([(0, 1), (1, 0)])  # pushes the glass at (2, 1) down onto (3, 1)
+        self.assertIsNone(self.room.get_walk_distance((1, 1), (3, 1)))
+        self.assertEqual(1, self.room.get_walk_distance((1, 1), (2, 1)))
+        self.game.undo()
+        self.assertEqual(before, self.room.get_walk_distance((1, 0), (3, 1)))
+
+    def test_walk_to(self):
+        self.assertTrue(self.game.walk_to((3, 2)))
+        self.assertEqual((3, 2), self.game.get_cat().get_pos())
+        self.assertEqual(self.game.get_room().get_walk_distance((1, 0), (3, 2)), self.game.get_move_count())
+        self.assertFalse(self.game.walk_to((2, 1)))
+        self.assertFalse(self.game.walk_to((9, 9)))
+        self.game.go_to_move(0)
+        self.assertEqual((1, 0), self.game.get_cat().get_pos())
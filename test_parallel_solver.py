@@ -0,0 +1,19 @@
+import unittest
+import ai_solver
+import parallel_solver
+from test_ai_solver import make_model, replay, BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM, STUCK_ROOM
+
+
+class TestParallelSolver(unittest.TestCase):
+
+    def test_optimal_length(self):
+        for room in (BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM):
+            serial = ai_solver.SokobanSolver(make_model(room)).solve_bfs()
+            for workers in (1, 3):
+                game = make_model(room)
+                solution = parallel_solver.ParallelSolver(game, workers).solve_parallel()
+                self.assertEqual(len(serial), len(solution))
+                self.assertTrue(replay(game, solution))
+
+    def test_no_solution(self):
+        self.assertIsNone(parallel_solver.ParallelSolver(make_model(STUCK_ROOM), 2).solve_parallel())
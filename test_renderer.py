@@ -0,0 +1,50 @@
+import unittest
+from benchmark import CanvasRecorder
+from constants import *
+from renderer import CellRenderer
+from test_ai_solver import make_model, BASIC_ROOM, TWO_GLASS_ROOM
+
+
+class TestCellRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.game = make_model(TWO_GLASS_ROOM)
+        self.canvas = CanvasRecorder()
+        self.renderer = CellRenderer(self.canvas, lambda symbol: symbol)
+        self.renderer.set_img_size((10, 10))
+        self.draw()
+
+    def draw(self):
+        self.renderer.draw(self.game.get_cat(), self.game.get_room(), self.game.pop_changes())
+
+    def shown(self):
+        """Visible entity symbols by canvas position, as a player would see them."""
+        return {item['coords']: item['image'] for item in self.canvas.items.values()
+                if item.get('state') == 'normal'}
+
+    def test_items_created_once(self):
+        num_rows, num_cols = self.game.get_cur_dimension()
+        self.assertEqual(2 * num_rows * num_cols, self.canvas.item_count())
+        for delta in [(0, 1), (0, 1), (1, 0), (0, -1), (1, 0)] * 20:
+            self.game.move_cat(delta)
+            self.draw()
+        self.assertEqual(2 * num_rows * num_cols, self.canvas.item_count())
+
+    def test_incremental_matches_full_redraw(self):
+        for delta in [(0, 1), (0, 1), (1, 0), (0, -1), (1, 0), (1, 0)]:
+            self.game.move_cat(delta)
+            self.draw()
+        incremental = self.shown()
+        self.renderer.draw(self.game.get_cat(), self.game.get_room())
+        self.assertEqual(self.shown(), incremental)
+        self.assertEqual(CAT, incremental[self.renderer.get_img_center(self.game.get_cat().get_pos())])
+
+    def test_new_room_rebuilds(self):
+        game = make_model(TWO_GLASS_ROOM, BASIC_ROOM)
+        game.level_up()
+        self.renderer.draw(game.get_cat(), game.get_room(), game.pop_changes())
+        self.assertEqual(2 * 5 * 3, self.canvas.item_count())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import random
+import unittest
+import ai_solver
+import simulate
+from test_ai_solver import make_model, BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM, STUCK_ROOM
+
+
+class TestSimulator(unittest.TestCase):
+
+    def test_matches_model(self):
+        generator = random.Random(7)
+        for room in (BASIC_ROOM, TWO_GLASS_ROOM, THREE_GLASS_ROOM):
+            simulator = simulate.Simulator.from_tiles(room)
+            for _ in range(20):
+                moves = ''.join(generator.choices('wasd', k=40))
+                result = simulator.run(moves)
+                game = make_model(room)
+                for move in ai_solver.text_to_moves(moves):
+                    game.move_cat(move)
+                played = [move for move, valid in zip(ai_solver.text_to_moves(moves), result.valid) if valid]
+                self.assertEqual(game.get_history(), played)
+                self.assertEqual(game.get_cat().get_pos(), result.cat_pos)
+                self.assertEqual(frozenset(game.get_room().get_glasses()), result.glass_positions)
+                self.assertEqual(game.room_messed(), result.solved)
+
+    def test_solution_validates(self):
+        solution = ai_solver.SokobanSolver(make_model(THREE_GLASS_ROOM)).solve_bfs()
+        simulator = simulate.Simulator.from_tiles(THREE_GLASS_ROOM)
+        self.assertTrue(simulator.solves(solution))
+        self.assertTrue(simulator.solves(ai_solver.moves_to_text(solution)))
+        self.assertFalse(simulator.solves(solution[:-1]))
+        self.assertEqual(len(solution), simulator.run(solution).num_valid())
+
+    def test_many_sequences_and_rooms(self):
+        simulator = simulate.Simulator.from_tiles(BASIC_ROOM)
+        results = simulator.run_many(['ds', 'a', ''])
+        self.assertEqual([True, False, False], [result.solved for result in results])
+        self.assertEqual(b'\x00', results[1].valid)
+        results = simulate.run_rooms([BASIC_ROOM, STUCK_ROOM], 'ds')
+        self.assertEqual([True, False], [result.solved for result in results])
+
+    def test_from_position(self):
+        simulator = simulate.Simulator.from_tiles(BASIC_ROOM)
+        self.assertTrue(simulator.run('s', cat_pos=(1, 1), glass_positions=[(2, 1)]).solved)
+
+    def test_unknown_move(self):
+        with self.assertRaises(ValueError):
+            simulate.Simulator.from_tiles(BASIC_ROOM).run('dx')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import unittest
+from unittest import mock
+import ai_solver
+import batch_solve
+import model
+import solution_db
+from canonical import transform_tiles
+from levels import MemorySource
+from test_ai_solver import make_game_dir, make_model, make_temp_dir, replay, BASIC_ROOM, TWO_GLASS_ROOM, STUCK_ROOM
+from test_canonical import variants
+
+
+class TestCanonicalForm(unittest.TestCase):
+
+    def test_symmetric_variants_share_hash(self):
+        hashes = {solution_db.canonical_form(tiles)[0] for tiles in variants(TWO_GLASS_ROOM)}
+        self.assertEqual(1, len(hashes))
+        self.assertNotEqual(hashes, {solution_db.canonical_form(BASIC_ROOM)[0]})
+
+    def test_trailing_whitespace_ignored(self):
+        padded = [row + '  ' for row in BASIC_ROOM] + ['', '   ']
+        self.assertEqual(solution_db.canonical_form(BASIC_ROOM), solution_db.canonical_form(padded))
+
+
+class TestSolutionDB(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(make_temp_dir(self), 'solutions.sqlite')
+        self.db = solution_db.SolutionDB(self.path)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_lookup_all_variants(self):
+        game = make_model(TWO_GLASS_ROOM)
+        moves = ai_solver.SokobanSolver(game).solve_bfs()
+        self.assertTrue(self.db.record(TWO_GLASS_ROOM, moves, 4, 'solve_bfs', 0.5, 100))
+        for tiles in variants(TWO_GLASS_ROOM):
+            record = self.db.lookup(tiles)
+            self.assertEqual(('solve_bfs', 4), (record.method, record.pushes))
+            self.assertTrue(replay(make_model(tiles), record.moves))
+        self.assertIsNone(self.db.lookup(BASIC_ROOM))
+
+    def test_lookup_padded_variant(self):
+        self.db.record(BASIC_ROOM, [(0, 1), (1, 0)], 1, 'solve_bfs')
+        padded = ['+++++', '+++++'] + ['+' + row + '+' for row in BASIC_ROOM[1:-1]] + ['+++++', '     ']
+        record = self.db.lookup(transform_tiles(padded, (True, False, True)))
+        self.assertTrue(replay(make_model(transform_tiles(padded, (True, False, True))), record.moves))
+
+    def test_keeps_shortest(self):
+        self.db.record(BASIC_ROOM, [(0, 1), (1, 0)], 1, 'solve_bfs')
+        self.assertFalse(self.db.record(BASIC_ROOM, [(0, 1), (0, -1), (0, 1), (1, 0)], 1, 'solve_dfs'))
+        self.assertEqual('solve_bfs', self.db.lookup(BASIC_ROOM).method)
+        self.assertEqual(1, len(self.db))
+
+    def test_default_path_in_user_cache(self):
+        cache_home = make_temp_dir(self)
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': cache_home}):
+            db = solution_db.SolutionDB()
+        self.addCleanup(db.close)
+        self.assertEqual(os.path.join(cache_home, 'sokoban', 'solutions.sqlite'), db.path)
+        db.record(BASIC_ROOM, [(0, 1), (1, 0)], 1, 'solve_bfs')
+        self.assertTrue(os.path.exists(db.path))
+
+    def test_model_consults_store(self):
+        source = MemorySource([('room1.txt', BASIC_ROOM)])
+        self.assertIsNone(model.Model(source, solutions=self.db).get_known_solution())
+        self.db.record(BASIC_ROOM, [(0, 1), (1, 0)], 1, 'solve_bfs')
+        self.assertEqual([(0, 1), (1, 0)], model.Model(source, solutions=self.db).get_known_solution().moves)
+
+    def test_batch_warm_start(self):
+        game_dir = make_game_dir(self, BASIC_ROOM, TWO_GLASS_ROOM, STUCK_ROOM)
+        cold = batch_solve.solve_directory(game_dir, 'solve_bfs', workers=1, db_path=self.path)
+        warm = batch_solve.solve_directory(game_dir, 'solve_bfs', workers=1, db_path=self.path)
+        self.assertEqual([result['status'] for result in cold], [result['status'] for result in warm])
+        self.assertEqual([True, True, False], [result.get('cached', False) for result in warm])
+        self.assertEqual([result.get('solution') for result in cold], [result.get('solution') for result in warm])
+        self.assertEqual([sorted(result) for result in cold], [sorted(result) for result in warm])
+
+
+if __name__ == '__main__':
+    unittest.main()
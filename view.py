@@ -1,7 +1,9 @@
 import tkinter as tk
 from model import *
 from constants import *
-from typing import Union, Callable
+from renderer import CellRenderer
+from image_cache import ImageCache
+from typing import Union, Callable, Optional
 from PIL import ImageTk, Image
 
 class TextView:
@@ -25,6 +27,16 @@ class TextView:
             print(row)
 
 
+def _open_sprite(name: str) -> Image.Image:
+    image = Image.open(IMAGE_FOLDER + name)
+    image.load()
+    return image
+
+
+# scaled sprites shared by every canvas, room and level-up of the process
+SPRITES = ImageCache(_open_sprite, lambda image, size: ImageTk.PhotoImage(image.resize(size)), SPRITE_CACHE_SIZE)
+
+
 class RoomCanvas(tk.Canvas):
     def __init__(
             self,
@@ -47,39 +59,36 @@ class RoomCanvas(tk.Canvas):
         self._img_size = int(width / dimension[1]), int(height / dimension[0])
         self._tile_imgs = None
         self._entity_imgs = None
+        self._renderer = CellRenderer(self, self._get_img)
         self.update_imgs()
 
-    def draw(self, cat: Cat, room: Room) -> None:
-        glasses = room.get_glasses()
-        for i, row in enumerate(room.get_tiles()):
-            for j, tile in enumerate(row):
-                img = self._tile_imgs[tile.get_text()]
-                self._draw_img((i, j), img)
-                if (i, j) in glasses:
-                    img = self._entity_imgs[glasses[(i, j)].get_text()]
-                    self._draw_img((i, j), img)
-        self._draw_img(cat.get_pos(), self._entity_imgs[CAT])
-
+    def draw(self, cat: Cat, room: Room, changes: Optional[set[tuple[int, int]]] = None) -> None:
+        """Redraw the cells in changes, or the whole room if changes is None."""
+        self._renderer.draw(cat, room, changes)
         self.update()
 
+    def _get_img(self, symbol: str) -> tk.Image:
+        if symbol in self._tile_imgs:
+            return self._tile_imgs[symbol]
+        return self._entity_imgs[symbol]
+
     def clear(self) -> None:
         for w in self.winfo_children():
             w.destroy()
 
     def get_img_center(self, position: tuple[int, int]) -> tuple[int, int]:
-        width, height = self.get_img_size()
-        x_center, y_center = int(position[1]*width + width/2), int(position[0]*height + height/2)
-        return x_center, y_center
+        return self._renderer.get_img_center(position)
+
+    def get_position_at(self, x: int, y: int) -> tuple[int, int]:
+        """Room position of the tile under canvas pixel (x, y)."""
+        width, height = self._img_size
+        return y // height, x // width
 
     def update_imgs(self) -> None:
         self.update_img_size()
-        self._tile_imgs = self._load_imgs(TILE_IMAGES)
-        self._entity_imgs = self._load_imgs(MOVEABLE_ENTITY_IMAGES)
-
-    def _load_imgs(self, img_paths: dict[str, str]) -> dict[str, tk.Image]:
-        return {name: ImageTk.PhotoImage(
-        Image.open(IMAGE_FOLDER + path).resize(self._img_size))
-                         for name, path in img_paths.items()}
+        self._tile_imgs = SPRITES.get_all(TILE_IMAGES, self._img_size)
+        self._entity_imgs = SPRITES.get_all(MOVEABLE_ENTITY_IMAGES, self._img_size)
+        self._renderer.set_img_size(self._img_size)
 
     def set_dimension(self, dimension: tuple[int, int]) -> None:
         self._dimension = dimension
@@ -91,10 +100,6 @@ class RoomCanvas(tk.Canvas):
         num_rows, num_cols = self._dimension
         self._img_size = int(self.width / num_cols), int(self.height / num_rows)
 
-    def _draw_img(self, pos: tuple[int, int], img: ImageTk) -> None:
-        x_center, y_center = self.get_img_center(pos)
-        self.create_image(x_center, y_center, image=img)
-
 
 class GraphicalView:
     def __init__(self, master: tk.Tk) -> None:
@@ -109,6 +114,7 @@ class GraphicalView:
         self._room_frame.pack()
         self._room_canvas = None
         self._room_dimension = None
+        self._status = None
 
     def clear_canvases(self) -> None:
         for frame in self._all_frames.winfo_children():
@@ -119,13 +125,22 @@ class GraphicalView:
         self._room_dimension = dimension
         self._room_canvas = RoomCanvas(self._room_frame, self._room_dimension, ROOM_CANVAS_WIDTH, ROOM_CANVAS_HEIGHT)
         self._room_canvas.pack()
+        self._status = tk.Label(self._all_frames, text='', anchor=tk.W)
+        self._status.pack(fill=tk.X)
 
     def bind_keyboard_callback(self, command: Callable[[tk.Event], None]) -> None:
         self._master.bind(KEY_EVENT, command)
 
-    def draw(self, cat: Cat, room: Room) -> None:
-        self.clear_canvases()
-        self._room_canvas.draw(cat, room)
+    def bind_click_callback(self, command: Callable[[tuple[int, int]], None]) -> None:
+        """Call command with the room position of every tile clicked."""
+        canvas = self._room_canvas
+        canvas.bind(CLICK_EVENT, lambda e: command(canvas.get_position_at(e.x, e.y)))
+
+    def draw(self, cat: Cat, room: Room, changes: Optional[set[tuple[int, int]]] = None) -> None:
+        self._room_canvas.draw(cat, room, changes)
+
+    def show_status(self, text: str) -> None:
+        self._status.config(text=text)
 
     def set_room_dimension(self, dimension: tuple[int, int]) -> None:
         self._room_canvas.set_dimension(dimension)